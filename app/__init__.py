@@ -2,10 +2,30 @@ from flask import Flask
 from app.api.task_routes import task_bp
 from app.api.ai_routes import ai_bp
 from app.api.user_story_routes import user_story_bp
+from app.api.event_routes import event_bp
+from app.api.json_provider import PydanticJSONProvider
+from app.api.compression import init_compression
+from app.api.templating import init_templating
+from app.api.metrics import init_metrics
+from app.api.tracing import init_tracing
+from app.api.profiling import init_profiling
+from app.api.async_views import init_async
+from app.api.ai_clients import init_ai_clients
+from app.commands import seed_data_command
 
 def create_app():
     app = Flask(__name__)
+    app.json = PydanticJSONProvider(app)
+    init_async(app)
+    init_ai_clients(app)
+    init_templating(app)
     app.register_blueprint(task_bp)
     app.register_blueprint(ai_bp, url_prefix='/ai')
     app.register_blueprint(user_story_bp)
+    app.register_blueprint(event_bp)
+    init_compression(app)
+    init_metrics(app)
+    init_tracing(app)
+    init_profiling(app)
+    app.cli.add_command(seed_data_command)
     return app 
\ No newline at end of file
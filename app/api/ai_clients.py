@@ -0,0 +1,29 @@
+from app.config import get_ai_http_settings
+from app.infrastructure.ai_clients import ai_clients
+
+def init_ai_clients(app):
+    """
+    Configure the OpenAI clients every blueprint's AIService shares (pool
+    limits, keep-alive, HTTP/2 from AI_* settings) and expose the registry
+    as app.extensions['ai_clients'].
+    """
+    ai_clients.configure(**get_ai_http_settings())
+    app.extensions['ai_clients'] = ai_clients
+
+def import_ai_sdk():
+    """
+    Import the OpenAI SDK and httpx, which prewarm_ai_clients needs. Called
+    in the gunicorn master before forking, so workers share the modules
+    instead of each importing them.
+    """
+    import openai  # noqa: F401
+
+def prewarm_ai_clients() -> int:
+    """
+    Build this process's shared AI client and open its first connection,
+    so the first AI request after a worker starts skips the TLS handshake.
+    """
+    from app.api import ai_routes, user_story_routes
+    for service in (ai_routes.ai_service, user_story_routes.ai_service):
+        service.clientOpenai  # created on first access
+    return ai_clients.prewarm()
\ No newline at end of file
@@ -0,0 +1,18 @@
+import functools
+from app.api.profiling import profile_coroutine
+from app.infrastructure.event_loop import event_loop
+
+def init_async(app):
+    """
+    Run `async def` views on the process-wide event loop. Flask's default
+    (asgiref) starts a new loop per request, which would strand the shared
+    AsyncOpenAI connection pool on a closed loop after every call. Profiled
+    requests profile the coroutine on the loop too.
+    """
+    def async_to_sync(func):
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            return event_loop.run(profile_coroutine(func(*args, **kwargs)))
+        return run
+
+    app.async_to_sync = async_to_sync
\ No newline at end of file
@@ -0,0 +1,110 @@
+import gzip
+import os
+import zlib
+from flask import request
+from app.api.lru_cache import LRUCache
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Content-Encoding values we can produce, in order of preference
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+COMPRESSIBLE_MIMETYPES = {
+    'text/html', 'text/plain', 'text/css', 'application/javascript',
+    'application/json', 'application/x-ndjson',
+}
+
+def _default_levels():
+    """
+    Pick compression levels from the number of CPUs: hosts with spare cores
+    can afford better ratios, single-core containers favour speed.
+    """
+    cpus = os.cpu_count() or 1
+    if cpus >= 4:
+        return 6, 5
+    if cpus >= 2:
+        return 5, 4
+    return 3, 1
+
+def _gzip_stream(chunks, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 writes a gzip container
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def init_compression(app):
+    """
+    Register response compression on the app.
+
+    Negotiates br or gzip from Accept-Encoding for compressible content types.
+    Bodies smaller than COMPRESS_MIN_SIZE bytes are sent as-is. Levels come from
+    COMPRESS_GZIP_LEVEL / COMPRESS_BROTLI_QUALITY or default to a CPU-aware
+    choice. Responses that carry an ETag get an encoding-specific ETag, and
+    their compressed bodies are cached, so unchanged pages are compressed once.
+    Streamed responses (NDJSON exports) are gzip-compressed on the fly.
+    """
+    gzip_default, brotli_default = _default_levels()
+    min_size = int(os.getenv('COMPRESS_MIN_SIZE', '500'))
+    gzip_level = int(os.getenv('COMPRESS_GZIP_LEVEL', gzip_default))
+    brotli_quality = int(os.getenv('COMPRESS_BROTLI_QUALITY', brotli_default))
+    # Compressed bodies keyed by (ETag, encoding)
+    cache = LRUCache(int(os.getenv('COMPRESS_CACHE_ENTRIES', '256')))
+    app.extensions['compression_cache'] = cache
+
+    def compress(body, encoding):
+        if encoding == 'br':
+            return brotli.compress(body, quality=brotli_quality)
+        return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+    def not_modified(response):
+        # A 304 must carry the ETag the 200 would have had. The compressed variant
+        # is known when the client revalidates it or its body is in the cache.
+        etag, weak = response.get_etag()
+        encoding = request.accept_encodings.best_match(ENCODINGS)
+        if etag and encoding:
+            encoded = f'{etag}-{encoding}'
+            if request.if_none_match.contains_weak(encoded) or cache.get((etag, encoding)) is not None:
+                response.set_etag(encoded, weak)
+                response.vary.add('Accept-Encoding')
+        return response
+
+    @app.after_request
+    def compress_response(response):
+        if response.status_code == 304:
+            return not_modified(response)
+        if (response.status_code < 200 or response.status_code >= 300 or response.status_code == 204
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or 'Content-Encoding' in response.headers or response.direct_passthrough):
+            return response
+        response.vary.add('Accept-Encoding')
+
+        if response.is_streamed:
+            if request.accept_encodings['gzip']:
+                response.response = _gzip_stream(response.response, gzip_level)
+                response.headers['Content-Encoding'] = 'gzip'
+                response.headers.pop('Content-Length', None)
+            return response
+
+        encoding = request.accept_encodings.best_match(ENCODINGS)
+        if encoding is None or (response.content_length or 0) < min_size:
+            return response
+
+        etag, weak = response.get_etag()
+        key = (etag, encoding) if etag else None
+        body = cache.get(key) if key else None
+        if body is None:
+            body = compress(response.get_data(), encoding)
+            if key:
+                cache.put(key, body)
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        if etag:
+            response.set_etag(f'{etag}-{encoding}', weak)
+        return response
\ No newline at end of file
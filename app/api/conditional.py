@@ -0,0 +1,99 @@
+import hashlib
+from datetime import timezone
+from functools import wraps
+from flask import request, jsonify, current_app, g
+from app.infrastructure.table_version import TableVersionManager, VersionConflict
+from app.api.compression import ENCODINGS
+
+version_manager = TableVersionManager()
+
+def _validators(table_names, variant, row_version=None):
+    """
+    Build a strong ETag and a Last-Modified date from the version counters of the
+    tables a view reads, or from row_version for a single-row resource. The
+    variant (path and query string) distinguishes different representations
+    built from the same data. Last-Modified always comes from the tables.
+    """
+    versions = version_manager.get_versions(table_names)
+    if row_version is not None:
+        key = f'row.{row_version}|{variant}'
+    else:
+        key = ','.join(f'{name}.{versions[name][0]}' for name in table_names) + '|' + variant
+    etag = hashlib.blake2s(key.encode(), digest_size=10).hexdigest()
+    timestamps = [updated_at for _, updated_at in versions.values() if updated_at is not None]
+    last_modified = max(timestamps).replace(tzinfo=timezone.utc) if timestamps else None
+    return etag, last_modified
+
+def _matches(header, etag, weak):
+    # Compressed responses carry '<etag>-<encoding>', which represents the same version
+    candidates = [etag] + [f'{etag}-{encoding}' for encoding in ENCODINGS]
+    if weak:
+        return any(header.contains_weak(candidate) for candidate in candidates)
+    return any(header.contains(candidate) for candidate in candidates)
+
+def _set_validators(response, etag, last_modified):
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
+
+def expected_version():
+    """The row version a PUT/DELETE view must write over (from If-Match), or None for an unconditional write"""
+    return g.get('if_match_version')
+
+def _precondition_failed():
+    return jsonify({'error': 'Precondition failed: the resource has changed'}), 412
+
+def conditional(*table_names, row=None):
+    """
+    Decorator adding HTTP conditional request handling to a view that depends on
+    the given tables. With row, the name of the view argument holding the id of
+    a row of the first table, ETags follow that row's version instead.
+
+    GET/HEAD: answers 304 Not Modified from If-None-Match / If-Modified-Since
+    using only the version counters, without running the view; otherwise adds
+    ETag and Last-Modified to successful responses.
+    PUT/DELETE (row views): honours If-Match for optimistic concurrency. The
+    expected ETag is the one returned by a GET on the same path without query
+    parameters. A stale ETag gets 412 Precondition Failed; a matching one
+    exposes the row version through expected_version(), and the view's write
+    must be conditional on it (UPDATE ... WHERE version = :expected), so a
+    write committed in between raises VersionConflict, also answered with 412.
+    """
+    def row_version(kwargs):
+        return version_manager.get_row_version(table_names[0], kwargs[row]) if row else None
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method in ('GET', 'HEAD'):
+                variant = request.full_path
+                etag, last_modified = _validators(table_names, variant, row_version(kwargs))
+                if request.if_none_match:
+                    fresh = _matches(request.if_none_match, etag, weak=True)
+                else:
+                    fresh = (request.if_modified_since is not None and last_modified is not None
+                             and last_modified <= request.if_modified_since)
+                if fresh:
+                    return _set_validators(current_app.response_class(status=304), etag, last_modified)
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code == 200:
+                    _set_validators(response, etag, last_modified)
+                return response
+
+            if request.if_match and row:
+                version = row_version(kwargs)
+                if version is not None:
+                    etag, _ = _validators(table_names, request.path + '?', version)
+                    if not _matches(request.if_match, etag, weak=False):
+                        return _precondition_failed()
+                    g.if_match_version = version
+            try:
+                response = current_app.make_response(view(*args, **kwargs))
+            except VersionConflict:
+                return _precondition_failed()
+            if response.status_code == 200:
+                _set_validators(response, *_validators(table_names, request.path + '?', row_version(kwargs)))
+            return response
+        return wrapper
+    return decorator
\ No newline at end of file
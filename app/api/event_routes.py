@@ -0,0 +1,25 @@
+from flask import Blueprint, request, Response
+from app.application.change_feed import ChangeFeed
+
+event_bp = Blueprint('events', __name__)
+change_feed = ChangeFeed()
+
+@event_bp.route('/events', methods=['GET'])
+def stream_events():
+    """
+    Server-Sent Events stream of task and user story changes.
+    Clients resume after a disconnect with the Last-Event-ID header (sent
+    automatically by EventSource) or the last_event_id query parameter.
+    The stream holds a gunicorn thread (a greenlet with gevent workers) for
+    as long as the client stays connected.
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    return Response(
+        change_feed.events(last_event_id),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
\ No newline at end of file
@@ -0,0 +1,19 @@
+from flask import request
+from pydantic import BaseModel
+from typing import List, Type
+
+def parse_fields(model_cls: Type[BaseModel]) -> List[str] | None:
+    """
+    Read the comma-separated `fields` query parameter (e.g. ?fields=id,title,status).
+    Returns None when absent so callers fall back to full objects.
+    Raises ValueError when a requested field does not exist on model_cls.
+    """
+    raw = request.args.get('fields')
+    if not raw:
+        return None
+    fields = list(dict.fromkeys(field.strip() for field in raw.split(',') if field.strip()))
+    unknown = [field for field in fields if field not in model_cls.model_fields]
+    if unknown or not fields:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. "
+                         f"Valid fields are: {', '.join(model_cls.model_fields)}")
+    return fields
\ No newline at end of file
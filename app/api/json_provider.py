@@ -0,0 +1,56 @@
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+from pydantic import BaseModel, TypeAdapter
+from typing import Any, Dict, List
+from app.infrastructure.request_timing import timed
+
+# One compiled list serializer per model class, built on first use
+_list_adapters: Dict[type, TypeAdapter] = {}
+
+def _list_adapter(model_cls: type) -> TypeAdapter:
+    adapter = _list_adapters.get(model_cls)
+    if adapter is None:
+        adapter = _list_adapters[model_cls] = TypeAdapter(List[model_cls])
+    return adapter
+
+def dump_json(obj: Any) -> bytes | None:
+    """
+    Serialize a Pydantic model, or a list of models of the same class, straight
+    to JSON bytes with pydantic-core. Returns None for anything else.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.__pydantic_serializer__.to_json(obj)
+    if isinstance(obj, list) and obj and isinstance(obj[0], BaseModel):
+        model_cls = type(obj[0])
+        if all(type(item) is model_cls for item in obj):
+            return _list_adapter(model_cls).dump_json(obj)
+    return None
+
+class PydanticJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that lets routes pass Pydantic models to jsonify() directly.
+    Models and lists of models skip the intermediate dicts and the stdlib encoder;
+    other values go through Flask's default provider.
+    """
+    @staticmethod
+    def default(o: Any) -> Any:
+        if isinstance(o, BaseModel):
+            return o.model_dump(mode='json')
+        if isinstance(o, date):
+            # Match pydantic's ISO 8601 output for plain dict payloads
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        data = dump_json(obj)
+        if data is not None:
+            return data.decode()
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        with timed('serialize'):
+            data = dump_json(obj)
+            if data is None:
+                return super().response(obj)
+        return self._app.response_class(data, mimetype=self.mimetype)
\ No newline at end of file
@@ -0,0 +1,82 @@
+import os
+import time
+from flask import Blueprint, Response, g, request, template_rendered, before_render_template
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Histogram, generate_latest, multiprocess, REGISTRY
+from app.infrastructure.db import engine
+from app.infrastructure.request_timing import (
+    start_request_timing, stop_request_timing, current_timings, add_timing, install_db_timing
+)
+
+metrics_bp = Blueprint('metrics', __name__)
+
+# Components reported in Server-Timing and the component histogram
+COMPONENTS = ('db', 'ai', 'serialize', 'render')
+
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'Total request handling time',
+    ['method', 'endpoint', 'status']
+)
+COMPONENT_DURATION = Histogram(
+    'http_request_component_duration_seconds', 'Time spent per component while handling a request',
+    ['component', 'endpoint'],
+    buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30)
+)
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus text exposition. Aggregates every gunicorn worker when PROMETHEUS_MULTIPROC_DIR is set."""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+def init_metrics(app):
+    """
+    Time every request and break it down into database, AI, serialization and
+    template rendering time. The breakdown is sent in a Server-Timing header and
+    recorded in Prometheus histograms exposed on /metrics.
+    """
+    install_db_timing(engine)
+    app.register_blueprint(metrics_bp)
+
+    @app.before_request
+    def start_timer():
+        g.request_start = time.perf_counter()
+        route = f'{request.method} {request.url_rule.rule}' if request.url_rule else None
+        g.timing_token = start_request_timing(route)
+
+    @app.after_request
+    def record_timings(response):
+        if 'request_start' not in g:
+            return response
+        total = time.perf_counter() - g.request_start
+        timings = current_timings()
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        if endpoint != '/metrics':
+            REQUEST_DURATION.labels(request.method, endpoint, str(response.status_code)).observe(total)
+            for component in COMPONENTS:
+                if component in timings:
+                    COMPONENT_DURATION.labels(component, endpoint).observe(timings[component])
+        entries = [f'{name};dur={timings[name] * 1000:.2f}' for name in COMPONENTS if name in timings]
+        entries.append(f'total;dur={total * 1000:.2f}')
+        response.headers['Server-Timing'] = ', '.join(entries)
+        return response
+
+    @app.teardown_request
+    def stop_timer(exc):
+        token = g.pop('timing_token', None)
+        if token is not None:
+            stop_request_timing(token)
+
+    def start_render(sender, template, context, **extra):
+        g.render_start = time.perf_counter()
+
+    def stop_render(sender, template, context, **extra):
+        start = g.pop('render_start', None)
+        if start is not None:
+            add_timing('render', time.perf_counter() - start)
+
+    before_render_template.connect(start_render, app, weak=False)
+    template_rendered.connect(stop_render, app, weak=False)
\ No newline at end of file
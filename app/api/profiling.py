@@ -0,0 +1,236 @@
+import cProfile
+import hashlib
+import hmac
+import io
+import json
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+import types
+from uuid import uuid4
+from flask import Blueprint, current_app, g, has_request_context, jsonify, request, send_file, Response
+
+profiling_bp = Blueprint('profiling', __name__, url_prefix='/admin')
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_ID = re.compile(r'[0-9a-f]{32}')
+
+def sign_profile_request(secret: str, path: str, expires: int) -> str:
+    """Value of the X-Profile header that profiles a request to path until the expires unix time"""
+    signature = hmac.new(secret.encode(), f'{expires}:{path}'.encode(), hashlib.sha256).hexdigest()
+    return f'{expires}.{signature}'
+
+def _valid_signature(secret: str, header: str, path: str) -> bool:
+    expires, _, signature = header.partition('.')
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(sign_profile_request(secret, path, int(expires)), f'{expires}.{signature}')
+
+def _is_admin() -> bool:
+    secret = current_app.extensions['profiling']['secret']
+    token = request.headers.get('Authorization', '').removeprefix('Bearer ')
+    return hmac.compare_digest(token.encode(), secret.encode())
+
+def _profile_path(profile_id: str, suffix: str) -> str:
+    return os.path.join(current_app.extensions['profiling']['dir'], f'{profile_id}.{suffix}')
+
+@profiling_bp.route('/profiling', methods=['POST'])
+def arm_profiling():
+    """Profile the next `count` requests to `path` (default 1), for endpoints that cannot send a signed header"""
+    if not _is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    data = request.get_json(silent=True) or {}
+    path = data.get('path')
+    count = data.get('count', 1)
+    if not isinstance(path, str) or not isinstance(count, int) or count < 1:
+        return jsonify({'error': "Expected {'path': str, 'count': positive int}"}), 400
+    state = current_app.extensions['profiling']
+    with state['lock']:
+        state['armed'][path] = count
+    return jsonify({'path': path, 'count': count}), 200
+
+@profiling_bp.route('/profiles', methods=['GET'])
+def list_profiles():
+    if not _is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    profiles = []
+    profile_dir = current_app.extensions['profiling']['dir']
+    for name in sorted(os.listdir(profile_dir)):
+        if name.endswith('.json'):
+            with open(os.path.join(profile_dir, name)) as f:
+                profiles.append(json.load(f))
+    profiles.sort(key=lambda profile: profile['started_at'], reverse=True)
+    return jsonify(profiles)
+
+@profiling_bp.route('/profiles/<profile_id>', methods=['GET'])
+def download_profile(profile_id):
+    """The pstats file of a profiled request, or a cumulative-time summary with ?format=text"""
+    if not _is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    if not PROFILE_ID.fullmatch(profile_id) or not os.path.exists(_profile_path(profile_id, 'pstats')):
+        return jsonify({'error': 'Profile not found'}), 404
+    if request.args.get('format') == 'text':
+        out = io.StringIO()
+        pstats.Stats(_profile_path(profile_id, 'pstats'), stream=out).sort_stats('cumulative').print_stats(50)
+        return Response(out.getvalue(), mimetype='text/plain')
+    return send_file(os.path.abspath(_profile_path(profile_id, 'pstats')), mimetype='application/octet-stream',
+                     as_attachment=True, download_name=f'{profile_id}.pstats')
+
+def _should_profile(state) -> bool:
+    """Whether the request asks to be profiled; an armed count is only taken by _take_armed"""
+    header = request.headers.get(PROFILE_HEADER)
+    if header:
+        return _valid_signature(state['secret'], header, request.path)
+    return request.path in state['armed']
+
+def _take_armed(state) -> bool:
+    with state['lock']:
+        remaining = state['armed'].get(request.path)
+        if not remaining:
+            return False
+        if remaining == 1:
+            del state['armed'][request.path]
+        else:
+            state['armed'][request.path] = remaining - 1
+    return True
+
+def _remove_old_profiles(profile_dir: str, keep: int):
+    """Delete all but the newest keep profiles; other workers may be deleting the same files"""
+    profiles = []
+    for name in os.listdir(profile_dir):
+        if name.endswith('.json'):
+            try:
+                profiles.append((os.stat(os.path.join(profile_dir, name)).st_mtime_ns, name[:-len('.json')]))
+            except FileNotFoundError:
+                pass
+    profiles.sort(reverse=True)
+    for _, profile_id in profiles[keep:]:
+        for suffix in ('json', 'pstats'):
+            try:
+                os.remove(os.path.join(profile_dir, f'{profile_id}.{suffix}'))
+            except FileNotFoundError:
+                pass
+
+def profile_coroutine(coroutine):
+    """
+    Profile coroutine too when the current request is profiled. cProfile only
+    sees the thread that enabled it, and async views run on the background
+    event loop while the request thread waits, so the coroutine gets its own
+    profiler, enabled only while one of its steps runs (not while other tasks
+    on the loop do). Its stats are merged into the request's profile.
+    """
+    profile = g.get('profile') if has_request_context() else None
+    if profile is None:
+        return coroutine
+    profile['coroutine_profiler'] = cProfile.Profile()
+    return _profiled(coroutine, profile['coroutine_profiler'])
+
+@types.coroutine
+def _profiled(coroutine, profiler):
+    value, error = None, None
+    while True:
+        profiler.enable()
+        try:
+            yielded = coroutine.send(value) if error is None else coroutine.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            profiler.disable()
+        try:
+            value, error = (yield yielded), None
+        except BaseException as e:
+            value, error = None, e
+
+def init_profiling(app):
+    """
+    Opt-in per-request profiling, enabled by setting PROFILING_SECRET. A request
+    is profiled when it carries a valid X-Profile header (see
+    sign_profile_request) or when an admin armed its path via POST
+    /admin/profiling. The cProfile stats are written to PROFILE_DIR with the
+    tracemalloc peak and top allocation sites, and downloaded from
+    /admin/profiles/<id>. One request is profiled at a time per process,
+    since tracemalloc is process-wide. Async views are profiled on the event
+    loop as well (see profile_coroutine). Only the newest PROFILE_MAX_FILES
+    profiles (default 100) are kept.
+    """
+    secret = os.getenv('PROFILING_SECRET')
+    if not secret:
+        return
+    profile_dir = os.getenv('PROFILE_DIR', 'profiles')
+    os.makedirs(profile_dir, exist_ok=True)
+    state = app.extensions['profiling'] = {
+        'secret': secret, 'dir': profile_dir, 'armed': {},
+        'max_files': int(os.getenv('PROFILE_MAX_FILES', '100')),
+        'lock': threading.Lock(), 'running': threading.Lock(),
+    }
+    app.register_blueprint(profiling_bp)
+
+    @app.before_request
+    def start_profile():
+        if request.blueprint == 'profiling' or not _should_profile(state):
+            return
+        if not state['running'].acquire(blocking=False):
+            return
+        if not request.headers.get(PROFILE_HEADER) and not _take_armed(state):
+            # Another request used up the armed count meanwhile
+            state['running'].release()
+            return
+        started_tracemalloc = not tracemalloc.is_tracing()
+        if started_tracemalloc:
+            tracemalloc.start(10)
+        tracemalloc.reset_peak()
+        g.profile = {
+            'id': uuid4().hex,
+            'profiler': cProfile.Profile(),
+            'started_at': time.time(),
+            'started_tracemalloc': started_tracemalloc,
+        }
+        g.profile['profiler'].enable()
+
+    @app.after_request
+    def stop_profile(response):
+        profile = g.pop('profile', None)
+        if profile is None:
+            return response
+        try:
+            profile['profiler'].disable()
+            _, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics('lineno')[:10]
+            if profile['started_tracemalloc']:
+                tracemalloc.stop()
+            stats = pstats.Stats(profile['profiler'])
+            if 'coroutine_profiler' in profile:
+                stats.add(profile['coroutine_profiler'])
+            stats.dump_stats(_profile_path(profile['id'], 'pstats'))
+            with open(_profile_path(profile['id'], 'json'), 'w') as f:
+                json.dump({
+                    'id': profile['id'],
+                    'method': request.method,
+                    'path': request.full_path.rstrip('?'),
+                    'status': response.status_code,
+                    'started_at': profile['started_at'],
+                    'duration_ms': round((time.time() - profile['started_at']) * 1000, 2),
+                    'tracemalloc_peak_bytes': peak,
+                    'top_allocations': [
+                        {'location': str(stat.traceback[0]), 'size_bytes': stat.size, 'count': stat.count}
+                        for stat in top
+                    ],
+                }, f)
+            _remove_old_profiles(state['dir'], state['max_files'])
+        finally:
+            state['running'].release()
+        response.headers['X-Profile-Id'] = profile['id']
+        return response
+
+    @app.teardown_request
+    def abandon_profile(exc):
+        # after_request is skipped when the view raised; don't keep the profiler slot
+        profile = g.pop('profile', None)
+        if profile is not None:
+            profile['profiler'].disable()
+            if profile['started_tracemalloc']:
+                tracemalloc.stop()
+            state['running'].release()
\ No newline at end of file
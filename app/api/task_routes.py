@@ -1,8 +1,11 @@
-from flask import Blueprint, request, jsonify
-from app.application.task_service import TaskService
+from flask import Blueprint, request, jsonify, Response, current_app
+from app.application.task_service import TaskService, MAX_BATCH_SIZE
+from app.infrastructure.task_index import SIMILARITY_THRESHOLD
 from uuid import uuid4
 from app.domain.task import Task
 from pydantic import ValidationError
+from app.api.fields import parse_fields
+from app.api.conditional import conditional, expected_version
 
 task_bp = Blueprint('tasks', __name__)
 task_service = TaskService()
@@ -16,8 +19,12 @@ def create_task():
             **data,
         }
         task = Task.parse_obj(task_data)
+        if request.args.get('dedupe') == 'true':
+            duplicates = task_service.find_duplicates(task.model_dump())
+            if duplicates:
+                return jsonify({'error': 'Task duplicates existing tasks', 'duplicates': duplicates}), 409
         task = task_service.create_task(task.model_dump())
-        return jsonify(task.model_dump()), 201
+        return jsonify(task), 201
     except ValidationError as e:
         # Convert validation errors to serializable format
         error_messages = []
@@ -31,19 +38,70 @@ def create_task():
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
 
+@task_bp.route('/tasks/batch', methods=['POST'])
+def batch_tasks():
+    """Apply many create/update/delete operations in one request, with per-item results"""
+    operations = request.get_json()
+    if not isinstance(operations, list):
+        return jsonify({'error': 'Request body must be a list of operations'}), 400
+    if len(operations) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'A batch cannot contain more than {MAX_BATCH_SIZE} operations'}), 400
+    results = task_service.batch_tasks(operations)
+    return jsonify(results), 200
+
+@task_bp.route('/tasks/export', methods=['GET'])
+def export_tasks():
+    """Stream every task as newline-delimited JSON, optionally restricted with ?fields="""
+    try:
+        fields = parse_fields(Task)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    dumps = current_app.json.dumps
+    lines = (dumps(task) + '\n' for task in task_service.iter_tasks(fields))
+    return Response(lines, mimetype='application/x-ndjson')
+
+@task_bp.route('/tasks/import', methods=['POST'])
+def import_tasks():
+    """Import tasks from a newline-delimited JSON request body"""
+    imported, errors = task_service.import_tasks(request.stream)
+    return jsonify({'imported': imported, 'errors': errors}), 200
+
 @task_bp.route('/tasks', methods=['GET'])
+@conditional('tasks')
 def get_all_tasks():
-    tasks = task_service.list_tasks()
-    return jsonify([task.model_dump() for task in tasks])
+    try:
+        fields = parse_fields(Task)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    tasks = task_service.list_tasks(fields)
+    return jsonify(tasks)
 
 @task_bp.route('/tasks/<task_id>', methods=['GET'])
+@conditional('tasks', row='task_id')
 def get_task(task_id):
-    task = task_service.get_task(task_id)
+    try:
+        fields = parse_fields(Task)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    task = task_service.get_task(task_id, fields)
     if task:
-        return jsonify(task.model_dump())
+        return jsonify(task)
     return jsonify({'error': 'Task not found'}), 404
 
+@task_bp.route('/tasks/<task_id>/similar', methods=['GET'])
+def get_similar_tasks(task_id):
+    """Tasks with a similar title and description, from the MinHash index, most similar first"""
+    limit = request.args.get('limit', 10, type=int)
+    threshold = request.args.get('threshold', SIMILARITY_THRESHOLD, type=float)
+    if limit < 1 or not 0 <= threshold <= 1:
+        return jsonify({'error': 'limit must be positive and threshold between 0 and 1'}), 400
+    similar = task_service.similar_tasks(task_id, limit=limit, threshold=threshold)
+    if similar is None:
+        return jsonify({'error': 'Task not found'}), 404
+    return jsonify(similar)
+
 @task_bp.route('/tasks/<task_id>', methods=['PUT'])
+@conditional('tasks', row='task_id')
 def update_task(task_id):
     data = request.get_json()
     try:
@@ -53,10 +111,10 @@ def update_task(task_id):
         updated_data = existing_task.model_dump()
         updated_data.update(data)
         updated_task = Task.parse_obj(updated_data)
-        task = task_service.update_task(task_id, updated_task.model_dump())
+        task = task_service.update_task(task_id, updated_task.model_dump(), expected_version())
         if not task:
             return jsonify({'error': 'Task not found'}), 404
-        return jsonify(task.model_dump())
+        return jsonify(task)
     except ValidationError as e:
         # Convert validation errors to serializable format
         error_messages = []
@@ -71,7 +129,8 @@ def update_task(task_id):
         return jsonify({'error': str(e)}), 400
 
 @task_bp.route('/tasks/<task_id>', methods=['DELETE'])
+@conditional('tasks', row='task_id')
 def delete_task(task_id):
-    if task_service.delete_task(task_id):
+    if task_service.delete_task(task_id, expected_version()):
         return '', 204
     return jsonify({'error': 'Task not found'}), 404 
\ No newline at end of file
@@ -0,0 +1,39 @@
+import os
+import tempfile
+from jinja2 import FileSystemBytecodeCache
+from markupsafe import Markup
+from app.api.lru_cache import LRUCache
+
+def init_templating(app):
+    """
+    Configure Jinja for the app:
+    - a bytecode cache on disk (JINJA_CACHE_DIR), so new workers load compiled
+      templates instead of compiling them again;
+    - the cache_fragment() global, used with {% call %} to cache rendered blocks.
+    """
+    cache_dir = os.getenv('JINJA_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'jinja-bytecode-cache'))
+    os.makedirs(cache_dir, exist_ok=True)
+    app.jinja_options = {**app.jinja_options, 'bytecode_cache': FileSystemBytecodeCache(cache_dir)}
+
+    fragments = LRUCache(int(os.getenv('FRAGMENT_CACHE_ENTRIES', '2048')))
+    app.extensions['fragment_cache'] = fragments
+
+    def cache_fragment(name, entity, *depends_on, caller):
+        """
+        Render the wrapped block once per (name, entity id, version, content),
+        plus anything else the block shows (e.g. a story's task stats); a write
+        to one row leaves the other rows' fragments valid. The content hash keeps
+        a row that was deleted and imported again under the same id, which
+        starts again at version 1, from matching the old fragment. Blocks render
+        uncached when the version is None.
+        """
+        if entity.version is None:
+            return caller()
+        key = (name, entity.id, entity.version, hash(entity.model_dump_json()), depends_on)
+        html = fragments.get(key)
+        if html is None:
+            html = Markup(caller())
+            fragments.put(key, html)
+        return html
+
+    app.jinja_env.globals['cache_fragment'] = cache_fragment
\ No newline at end of file
@@ -0,0 +1,46 @@
+from flask import g, request
+from opentelemetry import context, propagate, trace
+from app.infrastructure.db import engine
+from app.infrastructure.tracing import tracer, configure_tracing, tracing_enabled, install_db_tracing
+
+def init_tracing(app):
+    """
+    Open a server span per request, continuing the caller's trace when a W3C
+    traceparent header is sent. Service, manager, DB and OpenAI spans nest
+    under it. Configured with TRACING_EXPORTER and TRACING_SAMPLE_RATE.
+    """
+    configure_tracing()
+    if tracing_enabled():
+        install_db_tracing(engine)
+
+    @app.before_request
+    def start_span():
+        route = request.url_rule.rule if request.url_rule else request.path
+        span = tracer.start_span(
+            f'{request.method} {route}',
+            context=propagate.extract(request.headers),
+            kind=trace.SpanKind.SERVER,
+            attributes={'app.layer': 'api', 'http.method': request.method, 'http.route': route},
+        )
+        g.trace_span = span
+        g.trace_token = context.attach(trace.set_span_in_context(span))
+
+    @app.after_request
+    def record_status(response):
+        span = g.get('trace_span')
+        if span is not None:
+            span.set_attribute('http.status_code', response.status_code)
+            if response.status_code >= 500:
+                span.set_status(trace.StatusCode.ERROR)
+        return response
+
+    @app.teardown_request
+    def end_span(exc):
+        span = g.pop('trace_span', None)
+        if span is None:
+            return
+        if exc is not None:
+            span.record_exception(exc)
+            span.set_status(trace.StatusCode.ERROR)
+        span.end()
+        context.detach(g.pop('trace_token'))
\ No newline at end of file
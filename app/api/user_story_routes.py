@@ -1,49 +1,66 @@
-from flask import Blueprint, request, jsonify, render_template
-from app.application.user_story_service import UserStoryService
+import asyncio
+from flask import Blueprint, request, jsonify, render_template, Response, current_app
+from app.application.user_story_service import UserStoryService, DEFAULT_PAGE_SIZE
 from app.application.task_service import TaskService
-from app.application.ai_service import AIService
+from app.application.ai_service import AsyncAIService
+from app.infrastructure.ai_clients import ai_clients
+from app.config import get_azure_openai_settings
 from uuid import uuid4
 from app.domain.user_story import UserStory
 from app.domain.task import Task
 from pydantic import ValidationError
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
+from app.api.fields import parse_fields
+from app.api.conditional import conditional
 
 user_story_bp = Blueprint('user_stories', __name__)
 user_story_service = UserStoryService()
 task_service = TaskService()
 
-# Get required environment variables
-azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-azure_api_key = os.getenv("AZURE_OPENAI_API_KEY")
-
-# Validate required environment variables
-if not azure_endpoint or not azure_api_key:
-    raise ValueError("Missing required environment variables: AZURE_OPENAI_ENDPOINT and/or AZURE_OPENAI_API_KEY")
+azure_endpoint, azure_api_key = get_azure_openai_settings()
 
-ai_service = AIService(azure_endpoint=azure_endpoint, azure_api_key=azure_api_key)
+# The /ai/ views are async: the AI call is awaited on the shared event loop, DB work runs in its thread pool
+ai_service = AsyncAIService(azure_endpoint=azure_endpoint, azure_api_key=azure_api_key, clients=ai_clients)
 
 @user_story_bp.route('/user-stories', methods=['GET'])
+@conditional('user_stories', 'tasks')
 def get_user_stories():
-    """Return the user-stories.html template with all user stories"""
-    user_stories = user_story_service.list_user_stories()
-    return render_template('user-stories.html', user_stories=user_stories)
+    """Return the user-stories.html template with one page of user stories and their task aggregates"""
+    dashboard = user_story_service.get_dashboard_page(
+        page=request.args.get('page', 1, type=int),
+        per_page=request.args.get('per_page', DEFAULT_PAGE_SIZE, type=int)
+    )
+    return render_template('user-stories.html', **dashboard)
+
+@user_story_bp.route('/user-stories/export', methods=['GET'])
+def export_user_stories():
+    """Stream every user story as newline-delimited JSON, optionally restricted with ?fields="""
+    try:
+        fields = parse_fields(UserStory)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    dumps = current_app.json.dumps
+    lines = (dumps(user_story) + '\n' for user_story in user_story_service.iter_user_stories(fields))
+    return Response(lines, mimetype='application/x-ndjson')
+
+@user_story_bp.route('/user-stories/import', methods=['POST'])
+def import_user_stories():
+    """Import user stories from a newline-delimited JSON request body"""
+    imported, errors = user_story_service.import_user_stories(request.stream)
+    return jsonify({'imported': imported, 'errors': errors}), 200
 
 @user_story_bp.route('/user-stories/<user_story_id>/tasks', methods=['GET'])
+@conditional('user_stories', 'tasks')
 def get_user_story_tasks(user_story_id):
     """Return the tasks.html template with tasks for a specific user story"""
-    user_story = user_story_service.get_user_story(user_story_id)
-    if not user_story:
+    result = user_story_service.get_user_story_with_tasks(user_story_id)
+    if not result:
         return jsonify({'error': 'User story not found'}), 404
     
-    # Get tasks for this user story
-    tasks = task_service.get_tasks_by_user_story(user_story_id)
+    user_story, tasks = result
     return render_template('tasks.html', tasks=tasks, user_story=user_story)
 
 @user_story_bp.route('/ai/user-stories', methods=['POST'])
-def generate_user_story():
+async def generate_user_story():
     """Generate a new UserStory using AI"""
     data = request.get_json()
     if not data or 'prompt' not in data:
@@ -51,7 +68,7 @@ def generate_user_story():
     
     try:
         # Generate user story using AI
-        user_story = ai_service.generate_user_story(data['prompt'])
+        user_story = await ai_service.generate_user_story(data['prompt'])
         
         if user_story is None:
             return jsonify({'error': 'Failed to generate user story. Please try again.'}), 500
@@ -61,35 +78,39 @@ def generate_user_story():
         user_story_data['id'] = str(uuid4())
         
         # Create the user story in the database
-        created_user_story = user_story_service.create_user_story(user_story_data)
-        return jsonify(created_user_story.model_dump()), 201
+        created_user_story = await asyncio.to_thread(user_story_service.create_user_story, user_story_data)
+        return jsonify(created_user_story), 201
     except ValidationError as e:
         return jsonify({'error': e.errors()}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @user_story_bp.route('/ai/user-stories/<user_story_id>/generate_tasks', methods=['POST'])
-def generate_tasks_from_user_story(user_story_id):
+async def generate_tasks_from_user_story(user_story_id):
     """Generate Tasks from a UserStory using AI"""
     try:
         # Get the user story
-        user_story = user_story_service.get_user_story(user_story_id)
+        user_story = await asyncio.to_thread(user_story_service.get_user_story, user_story_id)
         if not user_story:
             return jsonify({'error': 'User story not found'}), 404
         
         # Generate tasks using AI
-        tasks = ai_service.generate_tasks_from_user_story(user_story)
+        tasks = await ai_service.generate_tasks_from_user_story(user_story)
         
+        # ?dedupe=true skips generated tasks that near-duplicate existing ones (or each other)
+        dedupe = request.args.get('dedupe') == 'true'
         created_tasks = []
         for task in tasks:
             # Add ID and user_story_id to each task
             task_data = task.model_dump()
             task_data['id'] = str(uuid4())
             task_data['user_story_id'] = user_story_id
+            if dedupe and await asyncio.to_thread(task_service.find_duplicates, task_data):
+                continue
             
             # Create the task in the database
-            created_task = task_service.create_task(task_data)
-            created_tasks.append(created_task.model_dump())
+            created_task = await asyncio.to_thread(task_service.create_task, task_data)
+            created_tasks.append(created_task)
         
         return jsonify(created_tasks), 201
     except ValidationError as e:
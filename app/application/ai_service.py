@@ -1,7 +1,12 @@
-from openai import OpenAI
 from typing import Dict, Any, Optional, List
+import asyncio
 import os
 from app.application.log_service import LogService
+from app.application.category_classifier import CategoryClassifier
+from app.application.effort_estimator import EffortEstimator
+from app.infrastructure.ai_clients import AIClientRegistry
+from app.infrastructure.request_timing import timed
+from app.infrastructure.tracing import traced_methods
 from app.domain.task import Category
 from app.domain.user_story import UserStory, UserStoryPriority
 from app.domain.task import Task
@@ -9,21 +14,133 @@ from app.domain.tasks import Tasks
 
 model = "gpt-4o-mini"
 
+def _openai_client(**kwargs):
+    """
+    Build an openai.OpenAI client. The SDK (and httpx under it) takes
+    longer to import than the rest of the app together, so it is only
+    imported when the first AI call needs a client, not at worker boot.
+    """
+    from openai import OpenAI
+    return OpenAI(**kwargs)
+
+def _async_openai_client(**kwargs):
+    """Build an openai.AsyncOpenAI client, importing the SDK on first use like _openai_client"""
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(**kwargs)
+
+@traced_methods('application')
 class AIService:
-    def __init__(self, azure_endpoint: str, azure_api_key: str, log_service: Optional[LogService] = None):
-        self.clientOpenai = OpenAI(
+    def __init__(self, azure_endpoint: str, azure_api_key: str, log_service: Optional[LogService] = None,
+                 clients: Optional[AIClientRegistry] = None, category_classifier: Optional[CategoryClassifier] = None,
+                 effort_estimator: Optional[EffortEstimator] = None):
+        # Resolved now so a patched _openai_client still applies, called on first use.
+        # With a registry, the client is the process-wide one it shares between services.
+        self._clients = clients
+        self._client_factory = _openai_client if clients is None else clients.openai
+        self._client_kwargs = dict(
             base_url=azure_endpoint,
             api_key=azure_api_key,
-            default_query={"api-version": "preview"}, 
+            default_query={"api-version": "preview"},
         )
+        self._client = None
         self.log_service = log_service if log_service is not None else LogService()
+        # Answer confident category and effort requests without the LLM
+        self.category_classifier = category_classifier
+        self.effort_estimator = effort_estimator
+
+    @property
+    def clientOpenai(self):
+        if self._client is not None:
+            return self._client
+        client = self._client_factory(**self._client_kwargs)
+        if self._clients is None:
+            self._client = client
+        return client
+
+    @clientOpenai.setter
+    def clientOpenai(self, client):
+        self._client = client
 
     def generate_task_description(self, task_data: Dict[str, Any]) -> str:
+        with timed('ai'):
+            response = self.clientOpenai.responses.create(**self._task_description_request(task_data))
+        self._log_usage(response, "/ai/tasks/describe")
+        return response.output_text
+
+    def generate_task_category(self, task_data: Dict[str, Any]) -> str:
+        prediction = self.category_classifier.predict(task_data) if self.category_classifier else None
+        if prediction is not None and prediction.local:
+            return prediction.category.value
+        with timed('ai'):
+            response = self.clientOpenai.responses.create(**self._task_category_request(task_data))
+        self._log_usage(response, "/ai/tasks/categorize")
+        category = self._parse_category(response.output_text)
+        if prediction is not None:
+            self.category_classifier.record_fallback(prediction, category)
+        return category
+
+    def estimate_effort_hours(self, task_data: Dict[str, Any]) -> float:
+        estimate = self.effort_estimator.predict(task_data) if self.effort_estimator else None
+        if estimate is not None and estimate.local:
+            return estimate.hours
+        with timed('ai'):
+            response = self.clientOpenai.responses.create(**self._effort_hours_request(task_data))
+        self._log_usage(response, "/ai/tasks/estimate")
+        return self._record_effort_fallback(estimate, response.output_text)
+
+    def generate_risk_analysis(self, task_data: Dict[str, Any]) -> str:
+        with timed('ai'):
+            response = self.clientOpenai.responses.create(**self._risk_analysis_request(task_data))
+        self._log_usage(response, "/ai/tasks/audit/risk_analysis")
+        return response.output_text
+
+    def generate_risk_mitigation(self, task_data: Dict[str, Any], risk_analysis: str) -> str:
+        with timed('ai'):
+            response = self.clientOpenai.responses.create(**self._risk_mitigation_request(task_data, risk_analysis))
+        self._log_usage(response, "/ai/tasks/audit/risk_mitigation")
+        return response.output_text
+
+    def generate_user_story(self, prompt: str) -> UserStory | None:
+        """Generate a UserStory using the parse method"""
+        try:
+            with timed('ai'):
+                response = self.clientOpenai.responses.parse(**self._user_story_request(prompt))
+            self._log_usage(response, "/ai/user-stories")
+            return response.output_parsed if response.output_parsed else None
+        except Exception as e:
+            print(f"Error generating user story: {e}")
+            return None
+
+    def generate_tasks_from_user_story(self, user_story: UserStory) -> List[Task]:
+        """Generate Tasks from a UserStory using the parse method"""
+        try:
+            with timed('ai'):
+                response = self.clientOpenai.responses.parse(**self._tasks_request(user_story))
+            self._log_usage(response, "/ai/user-stories/generate_tasks")
+            if response.output_parsed:
+                return response.output_parsed.tasks
+            else:
+                return []
+        except Exception as e:
+            print(f"Error generating tasks from user story: {e}")
+            return []
+
+    # Request building and response parsing, shared with AsyncAIService
+
+    def _log_usage(self, response, endpoint: str):
+        usage = getattr(response, 'usage', {})
+        self.log_service.log_token_usage(
+            endpoint=endpoint,
+            input_tokens_used=getattr(usage, 'input_tokens', 0),
+            output_tokens_used=getattr(usage, 'output_tokens', 0),
+            model=model
+        )
+
+    def _task_description_request(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         prompt = f"Generate a concise task description (max 20 words) for a task with title: {task_data['title']}, " \
                 f"priority: {task_data['priority']}, effort hours: {task_data['effort_hours']}, " \
                 f"status: {task_data['status']}, assigned to: {task_data['assigned_to']} and category{task_data['category']}"
-
-        response = self.clientOpenai.responses.create(
+        return dict(
             model=model,
             input=[
                 {"role": "system", "content": "You are a task description generator. These tasks are for a task management system of a software company's development team. Keep the descriptions concise and professional. The fields received are: title, priority, effort_hours, status, assigned_to. From there, generate a good description that can make sense for the task that matches the title and category that comes in the request. The result should not exceed 100 words."},
@@ -34,19 +151,7 @@ class AIService:
             top_p=0.5
         )
 
-        usage = getattr(response, 'usage', {})
-        input_tokens_used = getattr(usage, 'input_tokens', 0)
-        output_tokens_used = getattr(usage, 'output_tokens', 0)
-        self.log_service.log_token_usage(
-            endpoint="/ai/tasks/describe",
-            input_tokens_used=input_tokens_used,
-            output_tokens_used=output_tokens_used,
-            model=model
-        )
-
-        return response.output_text
-
-    def generate_task_category(self, task_data: Dict[str, Any]) -> str:
+    def _task_category_request(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         prompt = f"Based on the following task details, determine the most appropriate category (Frontend, Backend, Testing, Infra, or Mobile):\n" \
                 f"Title: {task_data['title']}\n" \
                 f"Description: {task_data['description']}\n" \
@@ -54,8 +159,7 @@ class AIService:
                 f"Effort Hours: {task_data['effort_hours']}\n" \
                 f"Status: {task_data['status']}\n" \
                 f"Assigned To: {task_data['assigned_to']}"
-
-        response = self.clientOpenai.responses.create(
+        return dict(
             model=model,
             input=[
                 {"role": "system", "content": "You are a task categorizer. Your task is to determine the most appropriate category for a development task. The categories are: Frontend, Backend, Testing, Infra, and Mobile. You must respond with exactly one of these categories, nothing else."},
@@ -66,31 +170,20 @@ class AIService:
             top_p=0.5
         )
 
-        usage = getattr(response, 'usage', {})
-        input_tokens_used = getattr(usage, 'input_tokens', 0)
-        output_tokens_used = getattr(usage, 'output_tokens', 0)
-        self.log_service.log_token_usage(
-            endpoint="/ai/tasks/categorize",
-            input_tokens_used=input_tokens_used,
-            output_tokens_used=output_tokens_used,
-            model=model
-        )
-
-        # Validate and return the category
-        category = response.output_text.strip()
+    def _parse_category(self, text: str) -> str:
+        category = text.strip()
         try:
             return Category(category).value
         except ValueError:
             # If AI returns an invalid category, default to Backend
             return Category.BACKEND.value
 
-    def estimate_effort_hours(self, task_data: Dict[str, Any]) -> float:
+    def _effort_hours_request(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         prompt = f"Based on the following task details, estimate the effort hours needed (respond with a single number with one decimal place):\n" \
                 f"Title: {task_data['title']}\n" \
                 f"Description: {task_data['description']}\n" \
                 f"Category: {task_data['category']}"
-
-        response = self.clientOpenai.responses.create(
+        return dict(
             model=model,
             input=[
                 {"role": "system", "content": "You are a task effort estimator. Your task is to estimate the number of hours needed to complete a development task. Consider the task's title, description and category. Respond with a single number with one decimal place (e.g., 2.5, 4.0, 8.5). The estimate should be realistic and consider the task's scope."},
@@ -101,25 +194,23 @@ class AIService:
             top_p=0.5
         )
 
-        usage = getattr(response, 'usage', {})
-        input_tokens_used = getattr(usage, 'input_tokens', 0)
-        output_tokens_used = getattr(usage, 'output_tokens', 0)
-        self.log_service.log_token_usage(
-            endpoint="/ai/tasks/estimate",
-            input_tokens_used=input_tokens_used,
-            output_tokens_used=output_tokens_used,
-            model=model
-        )
-
-        # Parse and validate the effort hours
+    def _parse_effort_hours(self, text: str, default: float = 4.0) -> float:
         try:
-            effort_hours = float(response.output_text.strip())
+            effort_hours = float(text.strip())
             return round(effort_hours, 1)  # Ensure one decimal place
         except ValueError:
             # If AI returns an invalid number, return a default value
-            return 4.0
+            return default
 
-    def generate_risk_analysis(self, task_data: Dict[str, Any]) -> str:
+    def _record_effort_fallback(self, estimate, text: str) -> float:
+        """Parse the LLM's estimate, falling back to the local one, and report it to the estimator"""
+        if estimate is None:
+            return self._parse_effort_hours(text)
+        effort_hours = self._parse_effort_hours(text, default=estimate.hours or 4.0)
+        self.effort_estimator.record_fallback(estimate, effort_hours)
+        return effort_hours
+
+    def _risk_analysis_request(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         prompt = f"Analyze the potential risks for the following task:\n" \
                 f"Title: {task_data['title']}\n" \
                 f"Description: {task_data['description']}\n" \
@@ -128,8 +219,7 @@ class AIService:
                 f"Status: {task_data['status']}\n" \
                 f"Assigned To: {task_data['assigned_to']}\n" \
                 f"Category: {task_data['category']}"
-
-        response = self.clientOpenai.responses.create(
+        return dict(
             model=model,
             input=[
                 {"role": "system", "content": "You are a risk analyst for software development tasks. Analyze the potential risks associated with the given task, considering factors like technical complexity, dependencies, resource availability, and project impact. Provide a concise but comprehensive risk analysis that identifies key areas of concern. Generated text should be shorter than 1024 characters"},
@@ -140,19 +230,7 @@ class AIService:
             top_p=0.5
         )
 
-        usage = getattr(response, 'usage', {})
-        input_tokens_used = getattr(usage, 'input_tokens', 0)
-        output_tokens_used = getattr(usage, 'output_tokens', 0)
-        self.log_service.log_token_usage(
-            endpoint="/ai/tasks/audit/risk_analysis",
-            input_tokens_used=input_tokens_used,
-            output_tokens_used=output_tokens_used,
-            model=model
-        )
-
-        return response.output_text
-
-    def generate_risk_mitigation(self, task_data: Dict[str, Any], risk_analysis: str) -> str:
+    def _risk_mitigation_request(self, task_data: Dict[str, Any], risk_analysis: str) -> Dict[str, Any]:
         prompt = f"Based on the following task details and risk analysis, provide risk mitigation strategies:\n" \
                 f"Task Details:\n" \
                 f"Title: {task_data['title']}\n" \
@@ -163,8 +241,7 @@ class AIService:
                 f"Assigned To: {task_data['assigned_to']}\n" \
                 f"Category: {task_data['category']}\n\n" \
                 f"Risk Analysis:\n{risk_analysis}"
-
-        response = self.clientOpenai.responses.create(
+        return dict(
             model=model,
             input=[
                 {"role": "system", "content": "You are a risk mitigation strategist for software development tasks. Based on the provided risk analysis, suggest practical and actionable strategies to mitigate each identified risk. Focus on concrete steps that can be taken to reduce or eliminate the risks while maintaining project quality and timeline. Generated text should be shorter than 1024 characters"},
@@ -175,55 +252,21 @@ class AIService:
             top_p=0.5
         )
 
-        # Log token usage
-        usage = getattr(response, 'usage', {})
-        input_tokens_used = getattr(usage, 'input_tokens', 0)
-        output_tokens_used = getattr(usage, 'output_tokens', 0)
-        self.log_service.log_token_usage(
-            endpoint="/ai/tasks/audit/risk_mitigation",
-            input_tokens_used=input_tokens_used,
-            output_tokens_used=output_tokens_used,
-            model=model
+    def _user_story_request(self, prompt: str) -> Dict[str, Any]:
+        return dict(
+            model=model,
+            input=[
+                {"role": "system", "content": "You are a user story generator for software development projects. Based on the user's prompt, generate a complete user story with all required fields. The user story should follow the format: 'As a [role], I want [goal] so that [reason]'. Make sure all fields are realistic and appropriate for a software development context."},
+                {"role": "user", "content": prompt}
+            ],
+            text_format=UserStory,
+            max_output_tokens=500,
+            temperature=0.7,
+            top_p=0.8
         )
 
-        return response.output_text
-
-    def generate_user_story(self, prompt: str) -> UserStory | None:
-        """Generate a UserStory using the parse method"""
-        try:
-            response = self.clientOpenai.responses.parse(
-                model=model,
-                input=[
-                    {"role": "system", "content": "You are a user story generator for software development projects. Based on the user's prompt, generate a complete user story with all required fields. The user story should follow the format: 'As a [role], I want [goal] so that [reason]'. Make sure all fields are realistic and appropriate for a software development context."},
-                    {"role": "user", "content": prompt}
-                ],
-                text_format=UserStory,
-                max_output_tokens=500,
-                temperature=0.7,
-                top_p=0.8
-            )
-
-            usage = getattr(response, 'usage', {})
-            input_tokens_used = getattr(usage, 'input_tokens', 0)
-            output_tokens_used = getattr(usage, 'output_tokens', 0)
-            self.log_service.log_token_usage(
-                endpoint="/ai/user-stories",
-                input_tokens_used=input_tokens_used,
-                output_tokens_used=output_tokens_used,
-                model=model
-            )
-
-            return response.output_parsed if response.output_parsed else None
-            
-        except Exception as e:
-            print(f"Error generating user story: {e}")
-            return None
-    
-
-    def generate_tasks_from_user_story(self, user_story: UserStory) -> List[Task]:
-        """Generate Tasks from a UserStory using the parse method"""
-        try:
-            prompt = f"""Based on the following user story, generate 3-5 development tasks that would be needed to implement this feature:
+    def _tasks_request(self, user_story: UserStory) -> Dict[str, Any]:
+        prompt = f"""Based on the following user story, generate 3-5 development tasks that would be needed to implement this feature:
 
 User Story:
 - Project: {user_story.project}
@@ -236,28 +279,91 @@ User Story:
 - Effort Hours: {user_story.effort_hours}
 
 Generate tasks that cover different aspects of the implementation (frontend, backend, testing, etc.) and ensure they are properly sized and categorized."""
+        return dict(
+            model=model,
+            input=[
+                {"role": "system", "content": "You are a task generator for software development projects. Based on a user story, generate multiple development tasks that would be needed to implement the feature. Each task should be specific, actionable, and properly categorized. Tasks should cover different aspects like frontend, backend, testing, etc."},
+                {"role": "user", "content": prompt}
+            ],
+            text_format=Tasks,
+            max_output_tokens=800,
+            temperature=0.7,
+            top_p=0.8
+        )
+
+@traced_methods('application')
+class AsyncAIService(AIService):
+    """
+    AIService on AsyncOpenAI: the same prompts and parsing, but every call is
+    awaited, so one event loop keeps many of them in flight over a single
+    connection pool. Token usage logging (file I/O) runs in a worker thread.
+    """
+    def __init__(self, azure_endpoint: str, azure_api_key: str, log_service: Optional[LogService] = None,
+                 clients: Optional[AIClientRegistry] = None, category_classifier: Optional[CategoryClassifier] = None,
+                 effort_estimator: Optional[EffortEstimator] = None):
+        super().__init__(azure_endpoint, azure_api_key, log_service, clients, category_classifier, effort_estimator)
+        self._client_factory = _async_openai_client if clients is None else clients.async_openai
+
+    async def generate_task_description(self, task_data: Dict[str, Any]) -> str:
+        with timed('ai'):
+            response = await self.clientOpenai.responses.create(**self._task_description_request(task_data))
+        await asyncio.to_thread(self._log_usage, response, "/ai/tasks/describe")
+        return response.output_text
+
+    async def generate_task_category(self, task_data: Dict[str, Any]) -> str:
+        # The classifier may read the change log, so it runs in a worker thread
+        prediction = (await asyncio.to_thread(self.category_classifier.predict, task_data)
+                      if self.category_classifier else None)
+        if prediction is not None and prediction.local:
+            return prediction.category.value
+        with timed('ai'):
+            response = await self.clientOpenai.responses.create(**self._task_category_request(task_data))
+        await asyncio.to_thread(self._log_usage, response, "/ai/tasks/categorize")
+        category = self._parse_category(response.output_text)
+        if prediction is not None:
+            self.category_classifier.record_fallback(prediction, category)
+        return category
 
-            response = self.clientOpenai.responses.parse(
-                model=model,
-                input=[
-                    {"role": "system", "content": "You are a task generator for software development projects. Based on a user story, generate multiple development tasks that would be needed to implement the feature. Each task should be specific, actionable, and properly categorized. Tasks should cover different aspects like frontend, backend, testing, etc."},
-                    {"role": "user", "content": prompt}
-                ],
-                text_format=Tasks,
-                max_output_tokens=800,
-                temperature=0.7,
-                top_p=0.8
-            )
-
-            usage = getattr(response, 'usage', {})
-            input_tokens_used = getattr(usage, 'input_tokens', 0)
-            output_tokens_used = getattr(usage, 'output_tokens', 0)
-            self.log_service.log_token_usage(
-                endpoint="/ai/user-stories/generate_tasks",
-                input_tokens_used=input_tokens_used,
-                output_tokens_used=output_tokens_used,
-                model=model
-            )
+    async def estimate_effort_hours(self, task_data: Dict[str, Any]) -> float:
+        # The estimator trains from the tasks table on first use, so it runs in a worker thread
+        estimate = (await asyncio.to_thread(self.effort_estimator.predict, task_data)
+                    if self.effort_estimator else None)
+        if estimate is not None and estimate.local:
+            return estimate.hours
+        with timed('ai'):
+            response = await self.clientOpenai.responses.create(**self._effort_hours_request(task_data))
+        await asyncio.to_thread(self._log_usage, response, "/ai/tasks/estimate")
+        return self._record_effort_fallback(estimate, response.output_text)
+
+    async def generate_risk_analysis(self, task_data: Dict[str, Any]) -> str:
+        with timed('ai'):
+            response = await self.clientOpenai.responses.create(**self._risk_analysis_request(task_data))
+        await asyncio.to_thread(self._log_usage, response, "/ai/tasks/audit/risk_analysis")
+        return response.output_text
+
+    async def generate_risk_mitigation(self, task_data: Dict[str, Any], risk_analysis: str) -> str:
+        with timed('ai'):
+            response = await self.clientOpenai.responses.create(**self._risk_mitigation_request(task_data, risk_analysis))
+        await asyncio.to_thread(self._log_usage, response, "/ai/tasks/audit/risk_mitigation")
+        return response.output_text
+
+    async def generate_user_story(self, prompt: str) -> UserStory | None:
+        """Generate a UserStory using the parse method"""
+        try:
+            with timed('ai'):
+                response = await self.clientOpenai.responses.parse(**self._user_story_request(prompt))
+            await asyncio.to_thread(self._log_usage, response, "/ai/user-stories")
+            return response.output_parsed if response.output_parsed else None
+        except Exception as e:
+            print(f"Error generating user story: {e}")
+            return None
+
+    async def generate_tasks_from_user_story(self, user_story: UserStory) -> List[Task]:
+        """Generate Tasks from a UserStory using the parse method"""
+        try:
+            with timed('ai'):
+                response = await self.clientOpenai.responses.parse(**self._tasks_request(user_story))
+            await asyncio.to_thread(self._log_usage, response, "/ai/user-stories/generate_tasks")
             if response.output_parsed:
                 return response.output_parsed.tasks
             else:
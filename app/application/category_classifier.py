@@ -0,0 +1,276 @@
+import json
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Dict, NamedTuple, Optional
+import numpy as np
+from app.domain.task import Category
+from app.infrastructure.change_log import ChangeLogManager, ChangeLogCursor, RESET
+from app.infrastructure.task_manager import TaskManager
+
+# Lowest posterior probability ever answered without the LLM
+CATEGORY_CONFIDENCE = float(os.getenv('CATEGORY_CONFIDENCE', '0.9'))
+# Accuracy local answers must reach on held-out tasks; the threshold is raised until they do
+CATEGORY_MIN_ACCURACY = float(os.getenv('CATEGORY_MIN_ACCURACY', '0.9'))
+# Fewer labelled tasks than this and every request goes to the LLM
+CATEGORY_MIN_TRAINING_TASKS = int(os.getenv('CATEGORY_MIN_TRAINING_TASKS', '200'))
+# Seconds between change-log refreshes of a trained model
+CATEGORY_REFRESH_INTERVAL = float(os.getenv('CATEGORY_REFRESH_INTERVAL', '30'))
+# Fewest held-out tasks a calibrated threshold may rest on
+MIN_CALIBRATION_TASKS = 10
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+class Prediction(NamedTuple):
+    category: Optional[Category]
+    confidence: float
+    local: bool
+
+def hashed_ngrams(text: str, n_features: int) -> Counter:
+    """Counts of word unigrams and bigrams, hashed into n_features buckets"""
+    words = _WORD.findall(text.lower())
+    grams = words + [f'{first} {second}' for first, second in zip(words, words[1:])]
+    return Counter(zlib.crc32(gram.encode()) % n_features for gram in grams)
+
+def compact_features(features: Counter) -> np.ndarray:
+    """
+    A (2, n) uint32 array of bucket ids and their counts. A model keeps one per
+    task to unlearn it on update or delete; a Counter per task took ~6x the memory.
+    """
+    return np.array([list(features), list(features.values())], dtype=np.uint32)
+
+def is_holdout(task_id: str) -> bool:
+    """True for a stable ~10% of tasks, scored before they are learned"""
+    return zlib.crc32(task_id.encode()) % 10 == 0
+
+class CategoryClassifier:
+    """
+    Multinomial naive Bayes over hashed n-grams of a task's title and
+    description, trained from the tasks table and kept current from the
+    change log. predict() answers locally when the posterior of the best
+    category reaches the threshold and the model has seen enough tasks;
+    otherwise the caller asks the LLM and reports its answer with
+    record_fallback(), which feeds the accuracy and LLM-avoidance stats.
+
+    Naive Bayes posteriors are overconfident, so the threshold is calibrated
+    on held-out tasks at every train(): the lowest posterior, not below
+    confidence, at which local answers are still min_accuracy accurate. When
+    no threshold qualifies (task text says little about the category) every
+    request goes to the LLM.
+    """
+    def __init__(self, task_manager: TaskManager | None = None, change_log: ChangeLogManager | None = None,
+                 confidence: float = CATEGORY_CONFIDENCE, min_accuracy: float = CATEGORY_MIN_ACCURACY,
+                 min_training_tasks: int = CATEGORY_MIN_TRAINING_TASKS,
+                 refresh_interval: float = CATEGORY_REFRESH_INTERVAL, n_features: int = 1 << 18, alpha: float = 0.1):
+        self.task_manager = task_manager if task_manager is not None else TaskManager()
+        self.change_log = change_log if change_log is not None else ChangeLogManager()
+        self.confidence = confidence
+        self.min_accuracy = min_accuracy
+        self.threshold = math.inf
+        self.min_training_tasks = min_training_tasks
+        self.refresh_interval = refresh_interval
+        self.n_features = n_features
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        # Held by the one caller training or refreshing; the model itself is only locked to apply changes
+        self._refresh_lock = threading.RLock()
+        self._trained = False
+        self._cursor = ChangeLogCursor(self.change_log)
+        self._last_refresh = 0.0
+        self._reset()
+        self._counters = Counter()
+
+    def _reset(self):
+        self._documents = {}
+        self._document_counts = Counter()
+        self._feature_counts = {category: Counter() for category in Category}
+        self._totals = Counter()
+        self._vocabulary = Counter()
+        self._holdout = Counter()
+
+    def features(self, task_data: Dict) -> Counter:
+        return hashed_ngrams(f"{task_data.get('title', '')} {task_data.get('description', '')}", self.n_features)
+
+    def _learn(self, task_id: str, category: Category, document: np.ndarray):
+        """Add a task, given its compact_features(), replacing any earlier version of it"""
+        self._forget(task_id)
+        self._documents[task_id] = (category, document)
+        features = dict(zip(*document.tolist()))
+        self._document_counts[category] += 1
+        self._feature_counts[category].update(features)
+        self._totals[category] += int(document[1].sum())
+        self._vocabulary.update(features)
+
+    def _forget(self, task_id: str):
+        if task_id not in self._documents:
+            return
+        category, document = self._documents.pop(task_id)
+        features = dict(zip(*document.tolist()))
+        self._document_counts[category] -= 1
+        self._feature_counts[category].subtract(features)
+        self._totals[category] -= int(document[1].sum())
+        self._vocabulary.subtract(features)
+        # Drop emptied buckets so the vocabulary size used for smoothing stays exact
+        for feature in features:
+            if self._feature_counts[category][feature] <= 0:
+                del self._feature_counts[category][feature]
+            if self._vocabulary[feature] <= 0:
+                del self._vocabulary[feature]
+
+    def _posterior(self, features: Counter) -> Dict[Category, float]:
+        documents = sum(self._document_counts.values())
+        vocabulary = len(self._vocabulary) + 1
+        scores = {}
+        # Categories without examples have no word statistics to score against
+        for category in (category for category in Category if self._document_counts[category] > 0):
+            counts = self._feature_counts[category]
+            denominator = math.log(self._totals[category] + self.alpha * vocabulary)
+            score = math.log((self._document_counts[category] + 1) / (documents + len(Category)))
+            for feature, count in features.items():
+                score += count * (math.log(counts.get(feature, 0) + self.alpha) - denominator)
+            scores[category] = score
+        best = max(scores.values())
+        weights = {category: math.exp(score - best) for category, score in scores.items()}
+        total = sum(weights.values())
+        return {category: weight / total for category, weight in weights.items()}
+
+    def train(self):
+        """
+        Rebuild the model from every task. Held-out tasks are scored before
+        they are learned, giving the offline accuracy reported by stats().
+        The table is read before the model is locked, so a trained model
+        keeps answering meanwhile.
+        """
+        with self._refresh_lock:
+            # Changes committed while the table is read are replayed by the next refresh
+            position = self.change_log.id_range()[1]
+            learned, holdout = [], []
+            for row in self.task_manager.iter_tasks(fields=['id', 'title', 'description', 'category']):
+                features = self.features(row)
+                if is_holdout(row['id']):
+                    holdout.append((row['id'], Category(row['category']), features))
+                else:
+                    learned.append((row['id'], Category(row['category']), compact_features(features)))
+            with self._lock:
+                self._reset()
+                self._cursor.reset(position)
+                for entry in learned:
+                    self._learn(*entry)
+                scored = []
+                for task_id, category, features in (holdout if self._documents else []):
+                    posterior = self._posterior(features)
+                    best = max(posterior, key=posterior.get)
+                    scored.append((posterior[best], best == category))
+                self._calibrate(scored)
+                for task_id, category, features in holdout:
+                    self._learn(task_id, category, compact_features(features))
+                self._trained = True
+                self._last_refresh = time.monotonic()
+
+    def _calibrate(self, scored):
+        """Pick the threshold from held-out (confidence, correct) pairs and record the held-out stats"""
+        scored.sort(reverse=True)
+        self.threshold = math.inf
+        correct = 0
+        for answered, (confidence, is_correct) in enumerate(scored, 1):
+            correct += is_correct
+            if confidence < self.confidence:
+                break
+            if answered >= MIN_CALIBRATION_TASKS and correct / answered >= self.min_accuracy:
+                self.threshold = confidence
+        confident = [is_correct for confidence, is_correct in scored if confidence >= self.threshold]
+        self._holdout.update(scored=len(scored), correct=sum(is_correct for _, is_correct in scored),
+                             confident=len(confident), confident_correct=sum(confident))
+
+    def refresh(self):
+        """
+        Apply task changes recorded since the last train or refresh. Each page
+        of the change log is read and featurized unlocked, then applied under
+        the model lock.
+        """
+        with self._refresh_lock:
+            oldest, _ = self.change_log.id_range()
+            if oldest > self._cursor.position + 1:
+                # The log was pruned past what this model has seen: start over
+                return self.train()
+            while changes := self._cursor.read():
+                if any(change['action'] == RESET for change in changes):
+                    # Rows changed in bulk without their own entries
+                    return self.train()
+                updates = []
+                for change in changes:
+                    if change['entity'] != 'task':
+                        continue
+                    if change['action'] == 'deleted':
+                        updates.append((change['entity_id'], None, None))
+                    else:
+                        task = json.loads(change['payload'])
+                        updates.append((change['entity_id'], Category(task['category']),
+                                        compact_features(self.features(task))))
+                with self._lock:
+                    for task_id, category, document in updates:
+                        if category is None:
+                            self._forget(task_id)
+                        else:
+                            self._learn(task_id, category, document)
+            self._last_refresh = time.monotonic()
+
+    def _ensure_current(self):
+        if not self._trained:
+            # Nothing to answer with yet: wait for whichever caller is training
+            with self._refresh_lock:
+                if not self._trained:
+                    self.train()
+        elif (time.monotonic() - self._last_refresh >= self.refresh_interval
+              and self._refresh_lock.acquire(blocking=False)):
+            # One caller refreshes, the others keep using the current model
+            try:
+                self.refresh()
+            finally:
+                self._refresh_lock.release()
+
+    def predict(self, task_data: Dict) -> Prediction:
+        """
+        Classify a task. Trains on first use and refreshes from the change log
+        every refresh_interval seconds, so call it off the event loop.
+        """
+        self._ensure_current()
+        features = self.features(task_data)
+        with self._lock:
+            if not self._documents or len(self._documents) < self.min_training_tasks or not features:
+                return Prediction(None, 0.0, False)
+            posterior = self._posterior(features)
+            category = max(posterior, key=posterior.get)
+            local = posterior[category] >= self.threshold
+            self._counters['local'] += local
+        return Prediction(category, posterior[category], local)
+
+    def record_fallback(self, prediction: Prediction, category: str):
+        """Count a request the LLM answered, and whether the local guess agreed with it"""
+        with self._lock:
+            self._counters['llm'] += 1
+            if prediction.category is not None:
+                self._counters['compared'] += 1
+                self._counters['agreed'] += prediction.category.value == category
+
+    def stats(self) -> Dict:
+        """Training size, held-out accuracy and how many requests skipped the LLM"""
+        holdout, counters = self._holdout, self._counters
+        answered = counters['local'] + counters['llm']
+        return {
+            'trained_tasks': len(self._documents),
+            'confidence_threshold': self.threshold if self.threshold != math.inf else None,
+            'holdout_tasks': holdout['scored'],
+            'holdout_accuracy': holdout['correct'] / holdout['scored'] if holdout['scored'] else None,
+            'holdout_coverage': holdout['confident'] / holdout['scored'] if holdout['scored'] else None,
+            'holdout_confident_accuracy': (holdout['confident_correct'] / holdout['confident']
+                                           if holdout['confident'] else None),
+            'local_answers': counters['local'],
+            'llm_answers': counters['llm'],
+            'llm_avoidance_rate': counters['local'] / answered if answered else None,
+            'llm_agreement_rate': counters['agreed'] / counters['compared'] if counters['compared'] else None,
+        }
\ No newline at end of file
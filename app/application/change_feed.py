@@ -0,0 +1,141 @@
+import json
+import logging
+import queue
+import threading
+import time
+from app.infrastructure.change_log import ChangeLogManager, ChangeLogCursor, CHANGE_LOG_REREAD_WINDOW, RESET
+
+logger = logging.getLogger(__name__)
+
+class Subscription:
+    def __init__(self, max_queue: int):
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+    def push(self, change):
+        try:
+            self.queue.put_nowait(change)
+        except queue.Full:
+            self.overflowed = True
+
+def format_event(change) -> str:
+    """Format a change-log row as a Server-Sent Event"""
+    if change['action'] == RESET:
+        return f"id: {change['id']}\nevent: reset\ndata: {{}}\n\n"
+    data = {
+        'entity': change['entity'],
+        'id': change['entity_id'],
+        'action': change['action'],
+        'data': json.loads(change['payload']) if change['payload'] else None
+    }
+    return f"id: {change['id']}\nevent: {change['entity']}.{change['action']}\ndata: {json.dumps(data)}\n\n"
+
+class ChangeFeed:
+    """
+    Fans out change-log entries to Server-Sent Event subscribers.
+
+    A single background thread per process polls the change_log table and pushes
+    new rows to every subscriber's queue, so the database cost does not grow
+    with the number of connected clients. The thread starts with the first
+    subscriber and stops when the last one leaves.
+    """
+    def __init__(self, manager: ChangeLogManager | None = None, poll_interval: float = 1.0,
+                 heartbeat_interval: float = 15.0, max_queue: int = 1000):
+        self.manager = manager if manager is not None else ChangeLogManager()
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.max_queue = max_queue
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._cursor = None
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.max_queue)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if self._thread is None:
+                # Changes written while no one was subscribed are not sent: the next poll starts from the latest id
+                self._cursor = None
+                self._thread = threading.Thread(target=self._run, name='change-feed', daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def poll(self):
+        """Read changes not seen before (including late commits of older ids) and push them to every subscriber"""
+        if self._cursor is None:
+            self._cursor = ChangeLogCursor(self.manager, position=self.manager.id_range()[1])
+        changes = self._cursor.read()
+        if changes:
+            with self._lock:
+                subscribers = list(self._subscribers)
+            for subscription in subscribers:
+                for change in changes:
+                    subscription.push(change)
+        return changes
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            try:
+                changes = self.poll()
+            except Exception:
+                logger.exception("Change feed poll failed")
+                changes = None
+            if not changes:
+                time.sleep(self.poll_interval)
+
+    def events(self, last_event_id: int | None = None):
+        """
+        Generate SSE messages for one client. With last_event_id, changes after
+        that id are replayed from the database first; if they were already
+        pruned, a 'reset' event tells the client to reload its full state.
+        """
+        subscription = self.subscribe()
+        try:
+            yield f"retry: {int(self.poll_interval * 1000)}\n\n"
+            oldest_id, latest_id = self.manager.id_range()
+            if last_event_id is None:
+                sent_id = latest_id
+            else:
+                sent_id = last_event_id
+                if oldest_id and last_event_id < oldest_id - 1:
+                    yield "event: reset\ndata: {}\n\n"
+            # Ids up to sent_id that are already visible predate this client. The poller may still
+            # deliver them, and it delivers late commits of ids in the window, which are new to the client.
+            start_id = sent_id
+            window_floor = start_id - CHANGE_LOG_REREAD_WINDOW
+            visible = {change_id for change_id in self.manager.ids_since(window_floor, CHANGE_LOG_REREAD_WINDOW)
+                       if change_id <= start_id}
+            # Replay from the database; anything the poller also queued is skipped by id
+            replayed = set()
+            while True:
+                backlog = self.manager.changes_since(sent_id)
+                if not backlog:
+                    break
+                for change in backlog:
+                    yield format_event(change)
+                replayed.update(change['id'] for change in backlog)
+                sent_id = backlog[-1]['id']
+            while True:
+                if subscription.overflowed:
+                    # Too slow to keep up: ask the client to reload and reconnect
+                    yield "event: reset\ndata: {}\n\n"
+                    return
+                try:
+                    change = subscription.queue.get(timeout=self.heartbeat_interval)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                if change['id'] in replayed or change['id'] <= window_floor or change['id'] in visible:
+                    continue
+                yield format_event(change)
+        finally:
+            self.unsubscribe(subscription)
\ No newline at end of file
@@ -0,0 +1,231 @@
+import itertools
+import logging
+import math
+import os
+import statistics
+import threading
+import time
+import zlib
+from typing import Dict, List, NamedTuple, Optional
+import numpy as np
+from app.application.category_classifier import hashed_ngrams, is_holdout
+from app.domain.task import Category, Priority
+from app.infrastructure.task_manager import TaskManager
+
+logger = logging.getLogger(__name__)
+
+# Coverage of the interval returned with each estimate
+EFFORT_INTERVAL = float(os.getenv('EFFORT_INTERVAL', '0.8'))
+# Widest interval, relative to the estimate, still answered without the LLM
+EFFORT_MAX_RELATIVE_WIDTH = float(os.getenv('EFFORT_MAX_RELATIVE_WIDTH', '1.0'))
+# Fewer historical tasks than this and every estimate goes to the LLM
+EFFORT_MIN_TRAINING_TASKS = int(os.getenv('EFFORT_MIN_TRAINING_TASKS', '200'))
+# Seconds after which the model is retrained from the tasks table in the background
+EFFORT_RETRAIN_INTERVAL = float(os.getenv('EFFORT_RETRAIN_INTERVAL', '600'))
+
+TEXT_FEATURES = 512
+ASSIGNEE_FEATURES = 64
+CATEGORIES = list(Category)
+PRIORITIES = list(Priority)
+# Column layout: bias, category, priority, hashed assignee, hashed title and description n-grams
+_CATEGORY = 1
+_PRIORITY = _CATEGORY + len(CATEGORIES)
+_ASSIGNEE = _PRIORITY + len(PRIORITIES)
+_TEXT = _ASSIGNEE + ASSIGNEE_FEATURES
+N_FEATURES = _TEXT + TEXT_FEATURES
+
+TRAINING_FIELDS = ['id', 'title', 'description', 'category', 'priority', 'assigned_to', 'effort_hours']
+# Rows turned into a dense matrix at a time while training
+TRAINING_BATCH = 4096
+
+class Estimate(NamedTuple):
+    hours: Optional[float]
+    low: Optional[float]
+    high: Optional[float]
+    local: bool
+
+def _enum_value(value) -> str:
+    return getattr(value, 'value', value)
+
+def _active_features(task_data: Dict) -> Dict[int, float]:
+    """The task's non-zero feature columns and values"""
+    features = {0: 1.0}
+    category, priority = _enum_value(task_data.get('category')), _enum_value(task_data.get('priority'))
+    for offset, values, value in ((_CATEGORY, CATEGORIES, category), (_PRIORITY, PRIORITIES, priority)):
+        for position, member in enumerate(values):
+            if member.value == value:
+                features[offset + position] = 1.0
+    assignee = (task_data.get('assigned_to') or '').strip().lower()
+    if assignee:
+        features[_ASSIGNEE + zlib.crc32(assignee.encode()) % ASSIGNEE_FEATURES] = 1.0
+    grams = hashed_ngrams(f"{task_data.get('title', '')} {task_data.get('description', '')}", TEXT_FEATURES)
+    if grams:
+        # Log counts scaled by text length, so long descriptions do not dominate
+        scale = 1 / math.sqrt(grams.total())
+        for bucket, count in grams.items():
+            features[_TEXT + bucket] = math.log1p(count) * scale
+    return features
+
+def feature_matrix(rows: List[Dict]) -> np.ndarray:
+    """Dense float64 matrix of the rows' features"""
+    matrix = np.zeros((len(rows), N_FEATURES))
+    for position, row in enumerate(rows):
+        features = _active_features(row)
+        matrix[position, list(features)] = list(features.values())
+    return matrix
+
+class EffortEstimator:
+    """
+    Ridge regression of log(effort_hours) on category, priority, hashed
+    assignee and hashed title/description n-grams, trained with NumPy from
+    the tasks table and retrained in the background every retrain_interval
+    seconds. Each estimate comes with a prediction interval; the caller asks
+    the LLM when the estimator is untrained or the interval is wider than
+    max_relative_width times the estimate, and reports it with
+    record_fallback(). Residual spread is measured on a stable 10% holdout,
+    so the interval reflects how well history predicts new tasks.
+    """
+    def __init__(self, task_manager: TaskManager | None = None, interval: float = EFFORT_INTERVAL,
+                 max_relative_width: float = EFFORT_MAX_RELATIVE_WIDTH,
+                 min_training_tasks: int = EFFORT_MIN_TRAINING_TASKS,
+                 retrain_interval: float = EFFORT_RETRAIN_INTERVAL, ridge: float = 1.0):
+        self.task_manager = task_manager if task_manager is not None else TaskManager()
+        self.z = statistics.NormalDist().inv_cdf(0.5 + interval / 2)
+        self.interval = interval
+        self.max_relative_width = max_relative_width
+        self.min_training_tasks = min_training_tasks
+        self.retrain_interval = retrain_interval
+        self.ridge = ridge
+        self._lock = threading.Lock()
+        self._train_lock = threading.Lock()
+        self._model = None
+        self._trained_at = None
+        self._training = False
+        self._holdout = {}
+        self._counters = {'local': 0, 'llm': 0, 'abs_error': 0.0, 'compared': 0}
+
+    def _solve(self, gram: np.ndarray, moment: np.ndarray):
+        """Ridge regression weights and the inverse used for prediction intervals"""
+        penalty = np.full(N_FEATURES, self.ridge)
+        penalty[0] = 0.0  # the intercept is not shrunk
+        inverse = np.linalg.pinv(gram + np.diag(penalty))
+        return inverse @ moment, inverse
+
+    def train(self):
+        """
+        Fit on every task with positive effort_hours: first without the
+        holdout to measure residuals and interval coverage, then on all rows.
+        """
+        with self._train_lock:
+            self._train()
+
+    def _train(self):
+        # X'X and X'y accumulate batch by batch, separately for training and
+        # holdout rows, so each row is featurized once and memory stays bounded
+        gram = {False: np.zeros((N_FEATURES, N_FEATURES)), True: np.zeros((N_FEATURES, N_FEATURES))}
+        moment = {False: np.zeros(N_FEATURES), True: np.zeros(N_FEATURES)}
+        holdout_features, holdout_targets, count = [], [], 0
+        rows = (row for row in self.task_manager.iter_tasks(fields=TRAINING_FIELDS)
+                if row['effort_hours'] and row['effort_hours'] > 0)
+        while batch := list(itertools.islice(rows, TRAINING_BATCH)):
+            features = feature_matrix(batch)
+            target = np.log([row['effort_hours'] for row in batch])
+            in_holdout = np.array([is_holdout(row['id']) for row in batch])
+            for part in (False, True):
+                selected = features[in_holdout == part]
+                gram[part] += selected.T @ selected
+                moment[part] += selected.T @ target[in_holdout == part]
+            holdout_features.append(features[in_holdout])
+            holdout_targets.append(target[in_holdout])
+            count += len(batch)
+
+        model, holdout_stats = None, {}
+        features = np.concatenate(holdout_features) if holdout_features else np.zeros((0, N_FEATURES))
+        target = np.concatenate(holdout_targets) if holdout_targets else np.zeros(0)
+        if len(target) and count > len(target):
+            weights, inverse = self._solve(gram[False], moment[False])
+            residuals = target - features @ weights
+            sigma = float(np.sqrt(np.mean(residuals ** 2)))
+            spread = self.z * sigma * np.sqrt(1 + np.sum((features @ inverse) * features, axis=1))
+            errors = np.abs(np.exp(features @ weights) - np.exp(target))
+            local = np.exp(spread) - np.exp(-spread) <= self.max_relative_width
+            holdout_stats = {
+                'tasks': len(target),
+                'mae_hours': float(np.mean(errors)),
+                'interval_coverage': float(np.mean(np.abs(residuals) <= spread)),
+                'local_share': float(np.mean(local)),
+                'local_mae_hours': float(np.mean(errors[local])) if local.any() else None,
+            }
+            weights, inverse = self._solve(gram[False] + gram[True], moment[False] + moment[True])
+            model = (weights, inverse, sigma, count)
+        with self._lock:
+            self._model, self._holdout = model, holdout_stats
+            self._trained_at = time.monotonic()
+
+    def _ensure_current(self):
+        if self._trained_at is None:
+            with self._train_lock:
+                # Concurrent first requests wait for one training run
+                if self._trained_at is None:
+                    self._train()
+            return
+        with self._lock:
+            stale = time.monotonic() - self._trained_at >= self.retrain_interval and not self._training
+            if stale:
+                self._training = True
+        if stale:
+            # Keep answering with the current model while the next one trains
+            threading.Thread(target=self._retrain, name='effort-estimator-training', daemon=True).start()
+
+    def _retrain(self):
+        try:
+            self.train()
+        except Exception:
+            logger.exception("Effort estimator retraining failed; the previous model stays in use")
+        finally:
+            self._training = False
+
+    def predict(self, task_data: Dict) -> Estimate:
+        """
+        Estimate effort hours with a prediction interval. Trains on first use
+        (reading the tasks table), so call it off the event loop.
+        """
+        self._ensure_current()
+        model = self._model
+        if model is None or model[3] < self.min_training_tasks:
+            return Estimate(None, None, None, False)
+        weights, inverse, sigma, _ = model
+        features = _active_features(task_data)
+        columns = np.fromiter(features, dtype=np.intp, count=len(features))
+        values = np.fromiter(features.values(), dtype=np.float64, count=len(features))
+        mean = float(values @ weights[columns])
+        leverage = float(values @ inverse[np.ix_(columns, columns)] @ values)
+        spread = self.z * sigma * math.sqrt(1 + leverage)
+        hours, low, high = math.exp(mean), math.exp(mean - spread), math.exp(mean + spread)
+        local = (high - low) / hours <= self.max_relative_width
+        with self._lock:
+            self._counters['local'] += local
+        return Estimate(round(hours, 1), round(low, 1), round(high, 1), local)
+
+    def record_fallback(self, estimate: Estimate, hours: float):
+        """Count an estimate the LLM answered, and how far the local estimate was from it"""
+        with self._lock:
+            self._counters['llm'] += 1
+            if estimate.hours is not None:
+                self._counters['compared'] += 1
+                self._counters['abs_error'] += abs(estimate.hours - hours)
+
+    def stats(self) -> Dict:
+        """Training size, held-out error and interval coverage, and how many estimates skipped the LLM"""
+        counters = self._counters
+        answered = counters['local'] + counters['llm']
+        return {
+            'trained_tasks': self._model[3] if self._model else 0,
+            'interval': self.interval,
+            'max_relative_width': self.max_relative_width,
+            'holdout': self._holdout,
+            'local_answers': counters['local'],
+            'llm_answers': counters['llm'],
+            'llm_avoidance_rate': counters['local'] / answered if answered else None,
+            'mean_abs_difference_from_llm': counters['abs_error'] / counters['compared'] if counters['compared'] else None,
+        }
\ No newline at end of file
@@ -1,6 +1,7 @@
 import os
 from datetime import datetime
 import json
+from app.infrastructure.tracing import set_span_attributes
 
 class LogService:
     """
@@ -36,6 +37,12 @@ class LogService:
             output_tokens_used: Number of tokens used in the output
             model: The AI model used
         """
+        set_span_attributes(**{
+            'ai.endpoint': endpoint,
+            'ai.model': model,
+            'ai.input_tokens': input_tokens_used,
+            'ai.output_tokens': output_tokens_used,
+        })
         log_file = self._get_daily_log_file()
         timestamp = datetime.now().isoformat()
         
@@ -0,0 +1,89 @@
+import json
+from typing import Any, Callable, Dict, IO, Iterator, List, Tuple
+from uuid import uuid4
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+# Number of NDJSON rows validated and inserted together during imports
+IMPORT_BATCH_SIZE = 1000
+
+def read_ndjson(stream: IO[bytes]) -> Iterator[Tuple[int, Any, str | None]]:
+    """
+    Parse a newline-delimited JSON stream one line at a time.
+    Yields (line_number, value, error) tuples; blank lines are skipped and
+    lines that are not valid JSON are yielded with value None and an error message.
+    """
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line), None
+        except ValueError as e:
+            yield line_number, None, f'Invalid JSON: {e}'
+
+def iter_batches(rows: Iterator, batch_size: int) -> Iterator[list]:
+    """Group an iterator into lists of at most batch_size items"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def format_errors(errors) -> List[Dict]:
+    """Pydantic validation errors as serializable {field, message, type} dicts"""
+    return [{
+        'field': error['loc'][0] if error['loc'] else 'unknown',
+        'message': error['msg'],
+        'type': error['type']
+    } for error in errors]
+
+def validate_items(adapter: TypeAdapter, items: List) -> Tuple[Dict[int, Any], Dict[int, List[Dict]]]:
+    """
+    Validate a list of dicts with a single call to a cached list adapter.
+    Returns (models, errors): models maps list position to the validated
+    model, errors maps list position to a list of serializable error dicts.
+    """
+    errors = {}
+    try:
+        return dict(enumerate(adapter.validate_python(items))), errors
+    except ValidationError as e:
+        for error in e.errors():
+            position = error['loc'][0]
+            error['loc'] = error['loc'][1:]
+            errors.setdefault(position, []).append(error)
+    positions = [position for position in range(len(items)) if position not in errors]
+    models = adapter.validate_python([items[position] for position in positions])
+    return dict(zip(positions, models)), {position: format_errors(e) for position, e in errors.items()}
+
+def import_ndjson(stream: IO[bytes], adapter: TypeAdapter, add_many: Callable[[List], Any],
+                  batch_size: int = IMPORT_BATCH_SIZE) -> Tuple[int, List[Dict]]:
+    """
+    Import models from an NDJSON stream, validating them with adapter and
+    inserting them with add_many in batches. Rows without an id get a new one.
+    Returns the number of imported rows and the per-line errors, in line order.
+    """
+    imported = 0
+    errors = []
+    for batch in iter_batches(read_ndjson(stream), batch_size):
+        rows = []
+        for line_number, value, error in batch:
+            if error:
+                errors.append({'line': line_number, 'error': error})
+            elif not isinstance(value, dict):
+                errors.append({'line': line_number, 'error': 'Each line must be a JSON object'})
+            else:
+                rows.append((line_number, {'id': str(uuid4()), **value}))
+        models, validation_errors = validate_items(adapter, [data for _, data in rows])
+        for position, error in validation_errors.items():
+            errors.append({'line': rows[position][0], 'error': error})
+        try:
+            add_many(list(models.values()))
+            imported += len(models)
+        except SQLAlchemyError as e:
+            errors.append({'lines': [rows[position][0] for position in models], 'error': str(getattr(e, 'orig', None) or e)})
+    errors.sort(key=lambda error: error.get('line') or error['lines'][0])
+    return imported, errors
\ No newline at end of file
@@ -1,7 +1,16 @@
 # app/application/task_service.py
 from app.infrastructure.task_manager import TaskManager
+from app.infrastructure.task_index import task_index, SIMILARITY_THRESHOLD, SIMILARITY_DUPLICATE_THRESHOLD
 from app.domain.task import Task
+from app.domain.tasks import task_list_adapter
+from app.application.ndjson import import_ndjson, validate_items
+from app.infrastructure.tracing import traced_methods
+from uuid import uuid4
 
+# Largest number of operations accepted by a single batch request
+MAX_BATCH_SIZE = 10000
+
+@traced_methods('application')
 class TaskService:
     def __init__(self):
         self.manager = TaskManager()
@@ -10,24 +19,120 @@ class TaskService:
         task = Task(**task_data)
         return self.manager.add_task(task)
 
-    def get_task(self, task_id):
-        return self.manager.get_task(task_id)
+    def get_task(self, task_id, fields=None):
+        return self.manager.get_task(task_id, fields)
 
-    def update_task(self, task_id, update_data):
-        # Fetch, update fields, and persist
+    def update_task(self, task_id, update_data, expected_version=None):
+        # Fetch, update fields, and persist (only over expected_version, when given)
         task = self.manager.get_task(task_id)
         if not task:
             return None
         for key, value in update_data.items():
             setattr(task, key, value)
-        self.manager.update_task(task)
-        return task
+        return self.manager.update_task(task, expected_version)
 
-    def delete_task(self, task_id):
-        return self.manager.delete_task(task_id)
+    def delete_task(self, task_id, expected_version=None):
+        return self.manager.delete_task(task_id, expected_version)
 
-    def list_tasks(self):
-        return self.manager.list_tasks()
+    def list_tasks(self, fields=None):
+        return self.manager.list_tasks(fields)
 
     def get_tasks_by_user_story(self, user_story_id):
-        return self.manager.get_tasks_by_user_story(user_story_id)
\ No newline at end of file
+        return self.manager.get_tasks_by_user_story(user_story_id)
+
+    def _with_tasks(self, matches):
+        # One query for all matched tasks; ids deleted since they were indexed are dropped
+        if not matches:
+            return []
+        tasks = self.manager.get_tasks(task_id for task_id, _ in matches)
+        return [{'similarity': similarity, 'task': tasks[task_id]} for task_id, similarity in matches if task_id in tasks]
+
+    def similar_tasks(self, task_id, limit=10, threshold=SIMILARITY_THRESHOLD):
+        """Tasks whose title and description resemble the task's, most similar first; None if it does not exist"""
+        task = self.manager.get_task(task_id, ['id', 'title', 'description'])
+        if not task:
+            return None
+        return self._with_tasks(task_index.similar(task, limit=limit, threshold=threshold, exclude=task_id))
+
+    def find_duplicates(self, task_data, threshold=SIMILARITY_DUPLICATE_THRESHOLD, limit=5):
+        """Existing tasks that are near-duplicates of task_data (title and description)"""
+        return self._with_tasks(task_index.similar(task_data, limit=limit, threshold=threshold, exclude=task_data.get('id')))
+
+    def batch_tasks(self, operations):
+        """
+        Apply a list of create, update and delete operations.
+
+        Each operation is a dict with an 'op' key ('create', 'update' or 'delete'),
+        an 'id' for updates and deletes, and a 'data' dict for creates and updates
+        (updates are partial, like PUT /tasks/<id>). Returns one result per
+        operation, in the same order, with an HTTP-like status code.
+        """
+        results = [None] * len(operations)
+        pending = []  # (index, op, task data) waiting for validation
+        updates = []
+        deletes = []
+
+        for index, operation in enumerate(operations):
+            op = operation.get('op') if isinstance(operation, dict) else None
+            data = operation.get('data', {}) if isinstance(operation, dict) else None
+            task_id = operation.get('id') if isinstance(operation, dict) else None
+            if task_id is not None and not isinstance(task_id, str):
+                results[index] = {'index': index, 'op': op, 'status': 400, 'error': "'id' must be a string"}
+            elif op == 'create' and isinstance(data, dict):
+                pending.append((index, op, {**data, 'id': str(uuid4())}))
+            elif op == 'update' and task_id and isinstance(data, dict):
+                updates.append((index, task_id, data))
+            elif op == 'delete' and task_id:
+                deletes.append((index, task_id))
+            else:
+                results[index] = {'index': index, 'op': op, 'status': 400,
+                                  'error': "Each operation needs a valid 'op' ('create', 'update' or 'delete'), "
+                                           "an 'id' for updates and deletes, and a 'data' object for creates and updates"}
+
+        existing = self.manager.get_tasks(task_id for _, task_id, _ in updates)
+        for index, task_id, data in updates:
+            if task_id not in existing:
+                results[index] = {'index': index, 'op': 'update', 'status': 404, 'error': 'Task not found'}
+                continue
+            merged = existing[task_id].model_dump()
+            merged.update(data)
+            merged['id'] = task_id
+            pending.append((index, 'update', merged))
+
+        tasks, errors = validate_items(task_list_adapter, [data for _, _, data in pending])
+        for position, error in errors.items():
+            index, op, _ = pending[position]
+            results[index] = {'index': index, 'op': op, 'status': 400, 'error': error}
+
+        created = [(pending[position][0], task) for position, task in tasks.items() if pending[position][1] == 'create']
+        updated = [(pending[position][0], task) for position, task in tasks.items() if pending[position][1] == 'update']
+        # Results carry the tasks as stored, with the versions the database gave them
+        stored = self.manager.add_tasks([task for _, task in created])
+        for (index, _), task in zip(created, stored):
+            results[index] = {'index': index, 'op': 'create', 'status': 201, 'task': task.model_dump()}
+        stored = {task.id: task for task in self.manager.update_tasks([task for _, task in updated])}
+        for index, task in updated:
+            if task.id in stored:
+                results[index] = {'index': index, 'op': 'update', 'status': 200, 'task': stored[task.id].model_dump()}
+            else:  # deleted since it was read
+                results[index] = {'index': index, 'op': 'update', 'status': 404, 'error': 'Task not found'}
+
+        deleted = self.manager.delete_tasks(task_id for _, task_id in deletes)
+        for index, task_id in deletes:
+            if task_id in deleted:
+                results[index] = {'index': index, 'op': 'delete', 'status': 204}
+            else:
+                results[index] = {'index': index, 'op': 'delete', 'status': 404, 'error': 'Task not found'}
+
+        return results
+
+    def iter_tasks(self, fields=None):
+        return self.manager.iter_tasks(fields=fields)
+
+    def import_tasks(self, stream):
+        """
+        Import tasks from an NDJSON stream, validating and inserting them in batches.
+        Rows without an id get a new one. Returns the number of imported tasks
+        and a list of per-line errors.
+        """
+        return import_ndjson(stream, task_list_adapter, self.manager.add_tasks)
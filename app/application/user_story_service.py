@@ -1,9 +1,18 @@
 from app.infrastructure.user_story_manager import UserStoryManager
-from app.domain.user_story import UserStory
+from app.infrastructure.task_manager import TaskManager
+from app.domain.user_story import UserStory, user_story_list_adapter
+from app.application.ndjson import import_ndjson
+from app.infrastructure.tracing import traced_methods
 
+# Default and maximum number of user stories per dashboard page
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+@traced_methods('application')
 class UserStoryService:
     def __init__(self):
         self.manager = UserStoryManager()
+        self.task_manager = TaskManager()
 
     def create_user_story(self, user_story_data):
         user_story = UserStory(**user_story_data)
@@ -27,4 +36,39 @@ class UserStoryService:
         return result is not None
 
     def list_user_stories(self):
-        return self.manager.list_user_stories() 
\ No newline at end of file
+        return self.manager.list_user_stories()
+
+    def get_dashboard_page(self, page=1, per_page=DEFAULT_PAGE_SIZE):
+        """
+        Return one page of user stories with per-story task aggregates.
+        Uses a fixed number of queries per page: count, page of stories, and one
+        GROUP BY over the page's tasks.
+        """
+        per_page = max(1, min(per_page, MAX_PAGE_SIZE))
+        total = self.manager.count_user_stories()
+        pages = max(1, -(-total // per_page))
+        page = max(1, min(page, pages))
+        user_stories = self.manager.list_user_stories(limit=per_page, offset=(page - 1) * per_page)
+        stats = self.task_manager.get_task_stats_by_user_story(user_story.id for user_story in user_stories)
+        return {
+            'user_stories': user_stories,
+            'stats': stats,
+            'page': page,
+            'per_page': per_page,
+            'pages': pages,
+            'total': total
+        }
+
+    def get_user_story_with_tasks(self, user_story_id):
+        return self.manager.get_user_story_with_tasks(user_story_id)
+
+    def iter_user_stories(self, fields=None):
+        return self.manager.iter_user_stories(fields=fields)
+
+    def import_user_stories(self, stream):
+        """
+        Import user stories from an NDJSON stream, validating and inserting them in batches.
+        Rows without an id get a new one. Returns the number of imported user stories
+        and a list of per-line errors.
+        """
+        return import_ndjson(stream, user_story_list_adapter, self.manager.add_user_stories)
@@ -0,0 +1,22 @@
+# app/commands.py
+import time
+import click
+from app.infrastructure.db import engine
+from app.infrastructure.synthetic_data import load_synthetic_data
+
+@click.command('seed-data')
+@click.option('--user-stories', type=int, default=1000, show_default=True, help='Number of user stories to generate.')
+@click.option('--seed', type=int, default=0, show_default=True, help='Random seed; the same seed generates the same rows.')
+@click.option('--batch-size', type=int, default=1000, show_default=True, help='User stories per transaction.')
+def seed_data_command(user_stories, seed, batch_size):
+    """Bulk-load realistic synthetic user stories and tasks into DATABASE_URL"""
+    started = time.perf_counter()
+
+    def progress(counts):
+        click.echo(f"{counts['user_stories']} user stories, {counts['tasks']} tasks "
+                   f"({time.perf_counter() - started:.1f}s)")
+
+    counts = load_synthetic_data(engine, user_stories, seed=seed, batch_size=batch_size, progress=progress)
+    elapsed = time.perf_counter() - started
+    click.echo(f"Loaded {counts['user_stories']} user stories and {counts['tasks']} tasks in {elapsed:.1f}s "
+               f"({(counts['user_stories'] + counts['tasks']) / elapsed:.0f} rows/s)")
\ No newline at end of file
@@ -0,0 +1,26 @@
+# app/config.py
+import os
+from dotenv import load_dotenv
+
+# The one place .env is read; every module takes its settings from here
+load_dotenv()
+
+def get_database_url() -> str:
+    return os.getenv("DATABASE_URL")
+
+def get_azure_openai_settings() -> tuple:
+    """Return (endpoint, api_key), raising ValueError when either is missing"""
+    azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
+    azure_api_key = os.getenv("AZURE_OPENAI_API_KEY")
+    if not azure_endpoint or not azure_api_key:
+        raise ValueError("Missing required environment variables: AZURE_OPENAI_ENDPOINT and/or AZURE_OPENAI_API_KEY")
+    return azure_endpoint, azure_api_key
+
+def get_ai_http_settings() -> dict:
+    """Connection pool settings for the shared OpenAI clients (app.infrastructure.ai_clients)"""
+    return dict(
+        max_connections=int(os.getenv("AI_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("AI_MAX_KEEPALIVE_CONNECTIONS", "20")),
+        keepalive_expiry=float(os.getenv("AI_KEEPALIVE_EXPIRY", "90")),
+        http2=os.getenv("AI_HTTP2", "false").lower() in ("1", "true", "yes"),
+    )
\ No newline at end of file
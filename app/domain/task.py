@@ -35,6 +35,8 @@ class Task(BaseModel):
     risk_analysis: Optional[str] = None
     risk_mitigation: Optional[str] = None
     created_at: Optional[datetime] = None
+    # Row version, set by the database; ignored on writes
+    version: Optional[int] = None
 
     @field_validator('description')
     @classmethod
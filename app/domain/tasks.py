@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from typing import List
 
 from app.domain.task import Task
@@ -7,4 +7,7 @@ from app.domain.task import Task
 class Tasks(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
-    tasks: List[Task]
\ No newline at end of file
+    tasks: List[Task]
+
+# Built once and reused: constructing a TypeAdapter compiles a validator
+task_list_adapter = TypeAdapter(List[Task])
\ No newline at end of file
@@ -1,6 +1,6 @@
 from enum import Enum
-from typing import Optional
-from pydantic import BaseModel, field_validator
+from typing import List, Optional
+from pydantic import BaseModel, TypeAdapter, field_validator
 from datetime import datetime
 
 class UserStoryPriority(str, Enum):
@@ -20,6 +20,8 @@ class UserStory(BaseModel):
     story_points: int
     effort_hours: float
     created_at: Optional[datetime] = None
+    # Row version, set by the database; ignored on writes
+    version: Optional[int] = None
 
     @field_validator('project')
     @classmethod
@@ -70,4 +72,7 @@ class UserStory(BaseModel):
         return round(v, 1)
 
     class Config:
-        use_enum_values = True 
\ No newline at end of file
+        use_enum_values = True 
+
+# Built once and reused: constructing a TypeAdapter compiles a validator
+user_story_list_adapter = TypeAdapter(List[UserStory])
\ No newline at end of file
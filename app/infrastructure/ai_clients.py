@@ -0,0 +1,94 @@
+# app/infrastructure/ai_clients.py
+import importlib.util
+import logging
+import os
+import threading
+from app.infrastructure.event_loop import event_loop
+
+logger = logging.getLogger(__name__)
+
+class AIClientRegistry:
+    """
+    The process's OpenAI clients, one per endpoint, API key and kind (sync or
+    async), shared by every AIService that asks for the same endpoint. Each
+    client gets its own tuned HTTP connection pool, so the AI calls of all
+    blueprints reuse the same kept-alive TLS connections to Azure instead of
+    every service paying for its own handshakes.
+    """
+    def __init__(self):
+        self._clients = {}
+        self._http_clients = {}
+        self._pid = None
+        self._lock = threading.Lock()
+        self.configure()
+
+    def configure(self, max_connections: int = 100, max_keepalive_connections: int = 20,
+                  keepalive_expiry: float = 90.0, http2: bool = False):
+        """
+        Connection pool settings for the clients created after this call.
+        keepalive_expiry is how long an idle connection stays open for reuse
+        (httpx closes them after 5 s by default); http2 needs the h2 package.
+        """
+        if http2 and importlib.util.find_spec('h2') is None:
+            raise ValueError("AI_HTTP2 is enabled but the h2 package is not installed")
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+
+    def openai(self, **client_kwargs):
+        """The shared openai.OpenAI client for client_kwargs' base_url and api_key"""
+        return self._get('sync', client_kwargs)
+
+    def async_openai(self, **client_kwargs):
+        """The shared openai.AsyncOpenAI client, for use on app.infrastructure.event_loop's loop"""
+        return self._get('async', client_kwargs)
+
+    def _get(self, kind: str, client_kwargs: dict):
+        key = (kind, client_kwargs['base_url'], client_kwargs['api_key'])
+        with self._lock:
+            # A forked worker builds its own: open sockets must not be shared with the parent
+            if self._pid != os.getpid():
+                self._clients, self._http_clients, self._pid = {}, {}, os.getpid()
+            if key not in self._clients:
+                self._clients[key] = self._create(key, client_kwargs)
+            return self._clients[key]
+
+    def _create(self, key, client_kwargs: dict):
+        import openai
+        # The SDK's own httpx Limits class, whichever httpx build it runs on
+        limits = type(openai.DEFAULT_CONNECTION_LIMITS)(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+        if key[0] == 'sync':
+            http_client = openai.DefaultHttpxClient(limits=limits, http2=self.http2)
+            client = openai.OpenAI(http_client=http_client, **client_kwargs)
+        else:
+            http_client = openai.DefaultAsyncHttpxClient(limits=limits, http2=self.http2)
+            client = openai.AsyncOpenAI(http_client=http_client, **client_kwargs)
+        self._http_clients[key] = http_client
+        return client
+
+    def prewarm(self, timeout: float = 5.0) -> int:
+        """
+        Open one pooled connection per client created in this process (TCP and
+        TLS handshake plus one HEAD request), so the first AI call reuses it.
+        Returns the number of clients warmed; failures are logged, not raised.
+        """
+        with self._lock:
+            http_clients = dict(self._http_clients) if self._pid == os.getpid() else {}
+        warmed = 0
+        for (kind, base_url, _), http_client in http_clients.items():
+            try:
+                if kind == 'sync':
+                    http_client.head(base_url, timeout=timeout)
+                else:
+                    event_loop.run(http_client.head(base_url, timeout=timeout))
+                warmed += 1
+            except Exception:
+                logger.warning("Could not prewarm the AI connection to %s", base_url, exc_info=True)
+        return warmed
+
+ai_clients = AIClientRegistry()
\ No newline at end of file
@@ -0,0 +1,64 @@
+# app/infrastructure/async_db.py
+import ssl
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import StaticPool
+from app.infrastructure.db import DATABASE_URL
+from app.infrastructure.request_timing import install_db_timing
+from app.infrastructure.slow_query_log import install_slow_query_log
+from app.infrastructure.tracing import install_db_tracing, tracing_enabled
+
+# Async drivers for the sync DATABASE_URL dialects
+ASYNC_DRIVERS = {'sqlite': 'aiosqlite', 'mysql': 'aiomysql'}
+
+_engine = None
+_session_factory = None
+
+def async_database_url(url: str):
+    """
+    Return (async url, connect_args) for a sync DATABASE_URL: the same
+    database through aiosqlite or aiomysql. aiomysql takes an SSLContext
+    rather than pymysql's ssl_ca query parameters.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r} databases")
+    connect_args = {}
+    query = dict(url.query)
+    if 'ssl_ca' in query:
+        connect_args['ssl'] = ssl.create_default_context(cafile=query.pop('ssl_ca'))
+        query.pop('ssl_verify_cert', None)
+    return url.set(drivername=f'{backend}+{ASYNC_DRIVERS[backend]}', query=query), connect_args
+
+def get_async_engine():
+    """
+    The process-wide AsyncEngine for DATABASE_URL, created on first use so
+    the async drivers are only imported by code that needs them. Its
+    connections belong to the event loop that opened them: use it from
+    app.infrastructure.event_loop's loop.
+    """
+    global _engine
+    if _engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        url, connect_args = async_database_url(DATABASE_URL)
+        options = {}
+        if url.database in (None, '', ':memory:'):
+            # Like the sync engine: one shared in-memory database. It is a different
+            # database from the sync engine's, so the schema is created separately.
+            options['poolclass'] = StaticPool
+        _engine = create_async_engine(url, connect_args=connect_args, **options)
+        # Same per-statement timing, slow query log and spans as the sync engine
+        install_db_timing(_engine.sync_engine)
+        install_slow_query_log(_engine.sync_engine)
+        if tracing_enabled():
+            install_db_tracing(_engine.sync_engine)
+    return _engine
+
+def AsyncSessionLocal():
+    """An AsyncSession on the async engine, the counterpart of db.SessionLocal()"""
+    global _session_factory
+    if _session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        # Objects stay readable after commit: lazy refreshes cannot happen implicitly under asyncio
+        _session_factory = async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+    return _session_factory()
\ No newline at end of file
@@ -0,0 +1,190 @@
+# app/infrastructure/async_task_manager.py
+from app.infrastructure.async_db import AsyncSessionLocal
+from app.infrastructure.models import TaskORM
+from app.infrastructure.table_version import bump_table_version, VersionConflict
+from app.infrastructure.change_log import record_changes
+from app.infrastructure.task_index import task_index
+from app.infrastructure.bulk import chunks, sparse_row, insert_row, inserted, update_values, versioned_update
+from app.infrastructure.tracing import traced_methods
+from app.domain.task import Task, Status
+from sqlalchemy import insert, update, delete, select, func
+from typing import AsyncIterator, Dict, Iterable, List, Set
+
+def task_from_orm(db_task: TaskORM, keep_created_at: bool = False) -> Task:
+    task_dict = db_task.__dict__.copy()
+    task_dict.pop('_sa_instance_state', None)
+    task_dict.pop('user_story', None)
+    if not keep_created_at:
+        task_dict.pop('created_at', None)
+    return Task.model_validate(task_dict)
+
+@traced_methods('infrastructure')
+class AsyncTaskManager:
+    """
+    TaskManager on an AsyncSession: the same operations and results, awaited.
+    Table versions and change-log rows are written through the sync helpers
+    with run_sync, in the same transaction as the change.
+    """
+    async def add_task(self, task: Task):
+        async with AsyncSessionLocal() as db:
+            db_task = TaskORM(**task.model_dump(exclude={'created_at', 'version'}))
+            db.add(db_task)
+            await db.run_sync(bump_table_version, TaskORM.__tablename__)
+            await db.run_sync(record_changes, 'task', 'created', [(task.id, inserted([task])[0])])
+            await db.commit()
+            task_index.index_tasks([task])
+            await db.refresh(db_task)
+            return task_from_orm(db_task)
+
+    async def update_task(self, task: Task, expected_version: int | None = None):
+        async with AsyncSessionLocal() as db:
+            statement = update(TaskORM).where(TaskORM.id == task.id)
+            if expected_version is not None:
+                statement = statement.where(TaskORM.version == expected_version)
+            statement = statement.values(**update_values(task), version=TaskORM.version + 1)
+            if (await db.execute(statement.execution_options(synchronize_session=False))).rowcount == 0:
+                if expected_version is not None and await db.get(TaskORM, task.id) is not None:
+                    raise VersionConflict(task.id)
+                return None
+            updated = task_from_orm(await db.get(TaskORM, task.id))
+            await db.run_sync(bump_table_version, TaskORM.__tablename__)
+            await db.run_sync(record_changes, 'task', 'updated', [(task.id, updated)])
+            await db.commit()
+            task_index.index_tasks([updated])
+            return updated
+
+    async def delete_task(self, task_id: str, expected_version: int | None = None):
+        async with AsyncSessionLocal() as db:
+            statement = delete(TaskORM).where(TaskORM.id == task_id)
+            if expected_version is not None:
+                statement = statement.where(TaskORM.version == expected_version)
+            if (await db.execute(statement.execution_options(synchronize_session=False))).rowcount == 0:
+                if expected_version is not None and await db.get(TaskORM, task_id) is not None:
+                    raise VersionConflict(task_id)
+                return None
+            await db.run_sync(bump_table_version, TaskORM.__tablename__)
+            await db.run_sync(record_changes, 'task', 'deleted', [(task_id, None)])
+            await db.commit()
+            task_index.remove_tasks([task_id])
+            return True
+
+    async def list_tasks(self, fields: List[str] | None = None):
+        """List all tasks; when fields is given, select only those columns and return dicts"""
+        async with AsyncSessionLocal() as db:
+            if fields:
+                rows = await db.execute(select(*[TaskORM.__table__.c[field] for field in fields]))
+                return [sparse_row(row) for row in rows.mappings()]
+            db_tasks = await db.scalars(select(TaskORM))
+            return [task_from_orm(db_task) for db_task in db_tasks]
+
+    async def get_task(self, task_id: str, fields: List[str] | None = None) -> Task | Dict | None:
+        """Get a task by id; when fields is given, select only those columns and return a dict"""
+        async with AsyncSessionLocal() as db:
+            if fields:
+                rows = await db.execute(select(*[TaskORM.__table__.c[field] for field in fields])
+                                        .where(TaskORM.id == task_id))
+                row = rows.mappings().first()
+                return sparse_row(row) if row else None
+            db_task = await db.get(TaskORM, task_id)
+            return task_from_orm(db_task) if db_task else None
+
+    async def get_tasks_by_user_story(self, user_story_id: str) -> List[Task]:
+        async with AsyncSessionLocal() as db:
+            db_tasks = await db.scalars(select(TaskORM).where(TaskORM.user_story_id == user_story_id))
+            return [task_from_orm(db_task, keep_created_at=True) for db_task in db_tasks]
+
+    async def get_tasks(self, task_ids: Iterable[str]) -> Dict[str, Task]:
+        """Fetch several tasks by id, returning a mapping of id to Task"""
+        task_ids = list(dict.fromkeys(task_ids))
+        result = {}
+        async with AsyncSessionLocal() as db:
+            for chunk in chunks(task_ids):
+                for db_task in await db.scalars(select(TaskORM).where(TaskORM.id.in_(chunk))):
+                    result[db_task.id] = task_from_orm(db_task)
+        return result
+
+    async def add_tasks(self, tasks: List[Task]) -> List[Task]:
+        """Insert tasks with multi-row INSERT statements in bounded-size chunks; returns them as stored"""
+        rows = [insert_row(task) for task in tasks]
+        if not rows:
+            return tasks
+        tasks = inserted(tasks)
+        async with AsyncSessionLocal() as db:
+            for chunk in chunks(rows):
+                await db.execute(insert(TaskORM), chunk)
+            await db.run_sync(bump_table_version, TaskORM.__tablename__)
+            await db.run_sync(record_changes, 'task', 'created', [(task.id, task) for task in tasks])
+            await db.commit()
+            task_index.index_tasks(tasks)
+        return tasks
+
+    async def update_tasks(self, tasks: List[Task]) -> List[Task]:
+        """
+        Update existing tasks with bulk UPDATE-by-primary-key statements,
+        incrementing their versions. Returns the tasks the UPDATE matched, with
+        their new versions; tasks that no longer exist are left out.
+        """
+        rows = [{**update_values(task), 'row_id': task.id} for task in tasks]
+        if not rows:
+            return []
+        async with AsyncSessionLocal() as db:
+            versions = {}
+            for chunk in chunks(rows):
+                await db.execute(versioned_update(TaskORM.__table__), chunk)
+                # The UPDATE locked the rows it matched, so these are its versions
+                versions.update((await db.execute(select(TaskORM.id, TaskORM.version)
+                                                  .where(TaskORM.id.in_([row['row_id'] for row in chunk])))).all())
+            updated = [task.model_copy(update={'version': versions[task.id]}) for task in tasks if task.id in versions]
+            if updated:
+                await db.run_sync(bump_table_version, TaskORM.__tablename__)
+                await db.run_sync(record_changes, 'task', 'updated', [(task.id, task) for task in updated])
+            await db.commit()
+            task_index.index_tasks(updated)
+        return updated
+
+    async def delete_tasks(self, task_ids: Iterable[str]) -> Set[str]:
+        """Delete tasks by id and return the ids that actually existed"""
+        task_ids = list(dict.fromkeys(task_ids))
+        deleted = set()
+        async with AsyncSessionLocal() as db:
+            for chunk in chunks(task_ids):
+                found = (await db.scalars(select(TaskORM.id).where(TaskORM.id.in_(chunk)))).all()
+                if found:
+                    await db.execute(delete(TaskORM).where(TaskORM.id.in_(found)))
+                    deleted.update(found)
+            if deleted:
+                await db.run_sync(bump_table_version, TaskORM.__tablename__)
+                await db.run_sync(record_changes, 'task', 'deleted', [(task_id, None) for task_id in deleted])
+            await db.commit()
+            task_index.remove_tasks(deleted)
+        return deleted
+
+    async def iter_tasks(self, batch_size: int = 1000, fields: List[str] | None = None) -> AsyncIterator[Task | Dict]:
+        """
+        Stream all tasks with a server-side cursor, batch_size rows at a time.
+        When fields is given, only those columns are selected and dicts are yielded.
+        """
+        columns = [TaskORM.__table__.c[field] for field in fields] if fields else TaskORM.__table__.columns
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(select(*columns).execution_options(yield_per=batch_size))
+            async for row in result.mappings():
+                yield sparse_row(row) if fields else Task.model_validate(dict(row))
+
+    async def get_task_stats_by_user_story(self, user_story_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Per user story task counts by status and total effort, with a single GROUP BY query"""
+        user_story_ids = list(user_story_ids)
+        stats = {user_story_id: {'total': 0, 'effort_hours': 0.0, 'by_status': {}} for user_story_id in user_story_ids}
+        if not user_story_ids:
+            return stats
+        async with AsyncSessionLocal() as db:
+            rows = await db.execute(
+                select(TaskORM.user_story_id, TaskORM.status, func.count(TaskORM.id), func.sum(TaskORM.effort_hours))
+                .where(TaskORM.user_story_id.in_(user_story_ids))
+                .group_by(TaskORM.user_story_id, TaskORM.status)
+            )
+            for user_story_id, status, count, effort_hours in rows:
+                story_stats = stats[user_story_id]
+                story_stats['by_status'][Status(status).value] = count
+                story_stats['total'] += count
+                story_stats['effort_hours'] = round(story_stats['effort_hours'] + (effort_hours or 0.0), 1)
+        return stats
\ No newline at end of file
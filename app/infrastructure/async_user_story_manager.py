@@ -0,0 +1,113 @@
+# app/infrastructure/async_user_story_manager.py
+from app.infrastructure.async_db import AsyncSessionLocal
+from app.infrastructure.async_task_manager import task_from_orm
+from app.infrastructure.models import UserStoryORM
+from app.infrastructure.table_version import bump_table_version
+from app.infrastructure.change_log import record_changes
+from app.infrastructure.bulk import chunks, sparse_row, insert_row, inserted
+from app.infrastructure.tracing import traced_methods
+from app.domain.user_story import UserStory
+from app.domain.task import Task
+from sqlalchemy import insert, select, func
+from sqlalchemy.orm import selectinload
+from typing import AsyncIterator, Dict, List, Tuple
+
+def _user_story(db_user_story: UserStoryORM) -> UserStory:
+    user_story_dict = db_user_story.__dict__.copy()
+    user_story_dict.pop('tasks', None)
+    return UserStory.model_validate(user_story_dict)
+
+@traced_methods('infrastructure')
+class AsyncUserStoryManager:
+    """UserStoryManager on an AsyncSession: the same operations and results, awaited"""
+    async def add_user_story(self, user_story: UserStory):
+        async with AsyncSessionLocal() as db:
+            db_user_story = UserStoryORM(**user_story.model_dump(exclude={'created_at', 'version'}))
+            db.add(db_user_story)
+            await db.run_sync(bump_table_version, UserStoryORM.__tablename__)
+            await db.run_sync(record_changes, 'user_story', 'created', [(user_story.id, inserted([user_story])[0])])
+            await db.commit()
+            await db.refresh(db_user_story)
+            return _user_story(db_user_story)
+
+    async def update_user_story(self, user_story: UserStory):
+        async with AsyncSessionLocal() as db:
+            db_user_story = await db.get(UserStoryORM, user_story.id)
+            if db_user_story:
+                for field, value in user_story.model_dump(exclude={'id', 'created_at', 'version'}).items():
+                    setattr(db_user_story, field, value)
+                db_user_story.version = UserStoryORM.version + 1
+                await db.run_sync(bump_table_version, UserStoryORM.__tablename__)
+                await db.run_sync(record_changes, 'user_story', 'updated', [(user_story.id, user_story)])
+                await db.commit()
+                await db.refresh(db_user_story)
+                return _user_story(db_user_story)
+            return None
+
+    async def delete_user_story(self, user_story_id: str):
+        async with AsyncSessionLocal() as db:
+            db_user_story = await db.get(UserStoryORM, user_story_id)
+            if db_user_story:
+                await db.delete(db_user_story)
+                await db.run_sync(bump_table_version, UserStoryORM.__tablename__)
+                await db.run_sync(record_changes, 'user_story', 'deleted', [(user_story_id, None)])
+                await db.commit()
+                return True
+            return None
+
+    async def list_user_stories(self, limit: int | None = None, offset: int = 0):
+        """List user stories; with a limit, return one page ordered newest first"""
+        query = select(UserStoryORM)
+        if limit is not None:
+            query = query.order_by(UserStoryORM.created_at.desc(), UserStoryORM.id).offset(offset).limit(limit)
+        async with AsyncSessionLocal() as db:
+            return [_user_story(db_user_story) for db_user_story in await db.scalars(query)]
+
+    async def get_user_story(self, user_story_id: str) -> UserStory | None:
+        async with AsyncSessionLocal() as db:
+            db_user_story = await db.get(UserStoryORM, user_story_id)
+            return _user_story(db_user_story) if db_user_story else None
+
+    async def add_user_stories(self, user_stories: List[UserStory]) -> List[UserStory]:
+        """Insert user stories with multi-row INSERT statements in bounded-size chunks; returns them as stored"""
+        rows = [insert_row(user_story) for user_story in user_stories]
+        if not rows:
+            return user_stories
+        user_stories = inserted(user_stories)
+        async with AsyncSessionLocal() as db:
+            for chunk in chunks(rows):
+                await db.execute(insert(UserStoryORM), chunk)
+            await db.run_sync(bump_table_version, UserStoryORM.__tablename__)
+            await db.run_sync(record_changes, 'user_story', 'created',
+                              [(user_story.id, user_story) for user_story in user_stories])
+            await db.commit()
+        return user_stories
+
+    async def iter_user_stories(self, batch_size: int = 1000,
+                                fields: List[str] | None = None) -> AsyncIterator[UserStory | Dict]:
+        """
+        Stream all user stories with a server-side cursor, batch_size rows at a time.
+        When fields is given, only those columns are selected and dicts are yielded.
+        """
+        columns = [UserStoryORM.__table__.c[field] for field in fields] if fields else UserStoryORM.__table__.columns
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(select(*columns).execution_options(yield_per=batch_size))
+            async for row in result.mappings():
+                yield sparse_row(row) if fields else UserStory.model_validate(dict(row))
+
+    async def count_user_stories(self) -> int:
+        async with AsyncSessionLocal() as db:
+            return (await db.execute(select(func.count(UserStoryORM.id)))).scalar_one()
+
+    async def get_user_story_with_tasks(self, user_story_id: str) -> Tuple[UserStory, List[Task]] | None:
+        """Load a user story and its tasks in one session, eager-loading tasks with selectinload"""
+        async with AsyncSessionLocal() as db:
+            db_user_story = (await db.execute(
+                select(UserStoryORM)
+                .options(selectinload(UserStoryORM.tasks))
+                .where(UserStoryORM.id == user_story_id)
+            )).scalar_one_or_none()
+            if db_user_story is None:
+                return None
+            tasks = [task_from_orm(db_task, keep_created_at=True) for db_task in db_user_story.tasks]
+            return _user_story(db_user_story), tasks
\ No newline at end of file
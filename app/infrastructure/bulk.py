@@ -0,0 +1,42 @@
+# app/infrastructure/bulk.py
+from enum import Enum
+from typing import Dict, Iterator, List
+from pydantic import BaseModel
+from sqlalchemy import Table, bindparam, update
+
+# Maximum number of rows sent to the database in a single bulk statement
+BULK_CHUNK_SIZE = 500
+
+def chunks(items: List, size: int = BULK_CHUNK_SIZE) -> Iterator[List]:
+    """Consecutive slices of items with at most size elements"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def sparse_row(row) -> Dict:
+    """A column-subset row as a plain dict, with enum members replaced by their values"""
+    return {key: value.value if isinstance(value, Enum) else value for key, value in row.items()}
+
+def insert_row(model: BaseModel) -> Dict:
+    """
+    Column values for a bulk INSERT. created_at is kept only when known (e.g.
+    imports), otherwise the server default applies; rows always start at version 1.
+    """
+    exclude = {'version', 'created_at'} if model.created_at is None else {'version'}
+    return model.model_dump(exclude=exclude & set(type(model).model_fields))
+
+def inserted(models: List[BaseModel]) -> List[BaseModel]:
+    """The models as a bulk INSERT stored them: insert_row() drops any version, so rows start at 1"""
+    return [model.model_copy(update={'version': 1}) for model in models]
+
+def update_values(model: BaseModel) -> Dict:
+    """Column values written by an UPDATE: everything but the key, creation time and row version"""
+    return model.model_dump(exclude={'id', 'created_at', 'version'} & set(type(model).model_fields))
+
+def versioned_update(table: Table):
+    """
+    UPDATE ... WHERE id = :row_id for executemany with update_values() rows
+    plus a row_id key: sets every other column and increments the row version.
+    """
+    values = {column.name: bindparam(column.name) for column in table.columns
+              if column.name not in ('id', 'created_at', 'version')}
+    return update(table).where(table.c.id == bindparam('row_id')).values({**values, 'version': table.c.version + 1})
\ No newline at end of file
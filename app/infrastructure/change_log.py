@@ -0,0 +1,152 @@
+# app/infrastructure/change_log.py
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Tuple
+from pydantic import BaseModel
+from sqlalchemy import insert, select, delete, func
+from app.infrastructure.db import SessionLocal
+from app.infrastructure.models import ChangeLogORM
+
+logger = logging.getLogger(__name__)
+
+# How many ids behind its position a ChangeLogCursor looks again for rows committed late
+CHANGE_LOG_REREAD_WINDOW = int(os.getenv('CHANGE_LOG_REREAD_WINDOW', '1000'))
+# Oldest entries beyond this count are pruned from the change_log table
+CHANGE_LOG_MAX_ROWS = int(os.getenv('CHANGE_LOG_MAX_ROWS', '10000'))
+# Seconds between prunes started by writes in one process; 0 disables pruning
+CHANGE_LOG_PRUNE_INTERVAL = float(os.getenv('CHANGE_LOG_PRUNE_INTERVAL', '60'))
+
+# Action of an entry that stands for changes to any number of rows; consumers reload the tables
+RESET = 'reset'
+
+_prune_lock = threading.Lock()
+_last_prune = 0.0
+
+def record_changes(db, entity: str, action: str, items: Iterable[Tuple[str, BaseModel | None]]):
+    """
+    Append change-log rows inside the caller's session, so they commit
+    atomically with the data change. items are (entity_id, model) pairs; the
+    model is stored as the JSON payload (None for deletes).
+    """
+    rows = [{
+        'entity': entity,
+        'entity_id': entity_id,
+        'action': action,
+        'payload': model.model_dump_json() if model is not None else None
+    } for entity_id, model in items]
+    if rows:
+        db.execute(insert(ChangeLogORM), rows)
+        _prune_if_due()
+
+def record_reset(db):
+    """
+    Append one entry, inside the caller's session, telling consumers that rows
+    changed in bulk without their own entries and must be read from the tables
+    """
+    db.execute(insert(ChangeLogORM), {'entity': 'all', 'entity_id': '', 'action': RESET, 'payload': None})
+    _prune_if_due()
+
+def _prune_if_due():
+    """Prune in a background thread, at most every CHANGE_LOG_PRUNE_INTERVAL seconds per process"""
+    global _last_prune
+    if CHANGE_LOG_PRUNE_INTERVAL <= 0:
+        return
+    with _prune_lock:
+        now = time.monotonic()
+        if now - _last_prune < CHANGE_LOG_PRUNE_INTERVAL:
+            return
+        _last_prune = now
+    # Not in the writer's transaction: it would hold the deleted rows' locks until its commit
+    threading.Thread(target=_prune, name='change-log-prune', daemon=True).start()
+
+def _prune():
+    try:
+        ChangeLogManager().prune(CHANGE_LOG_MAX_ROWS)
+    except Exception:
+        logger.exception("Pruning the change log failed")
+
+_COLUMNS = (ChangeLogORM.id, ChangeLogORM.entity, ChangeLogORM.entity_id, ChangeLogORM.action, ChangeLogORM.payload)
+
+class ChangeLogManager:
+    def changes_since(self, last_id: int, limit: int = 500) -> List[Dict]:
+        """Return up to limit changes with an id greater than last_id, oldest first"""
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(*_COLUMNS).where(ChangeLogORM.id > last_id).order_by(ChangeLogORM.id).limit(limit)
+            ).mappings().all()
+            return [dict(row) for row in rows]
+
+    def ids_since(self, last_id: int, limit: int) -> List[int]:
+        """Return up to limit ids greater than last_id, oldest first, without reading payloads"""
+        with SessionLocal() as db:
+            return list(db.execute(
+                select(ChangeLogORM.id).where(ChangeLogORM.id > last_id).order_by(ChangeLogORM.id).limit(limit)
+            ).scalars())
+
+    def changes_by_id(self, ids: List[int]) -> List[Dict]:
+        """Return the changes with the given ids that still exist, oldest first"""
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(*_COLUMNS).where(ChangeLogORM.id.in_(ids)).order_by(ChangeLogORM.id)
+            ).mappings().all()
+            return [dict(row) for row in rows]
+
+    def id_range(self) -> Tuple[int, int]:
+        """Return (oldest retained id, latest id), or (0, 0) when the log is empty"""
+        with SessionLocal() as db:
+            oldest, latest = db.execute(select(func.min(ChangeLogORM.id), func.max(ChangeLogORM.id))).one()
+            return oldest or 0, latest or 0
+
+    def prune(self, max_rows: int) -> int:
+        """Keep only the newest max_rows entries; returns the number of deleted rows"""
+        with SessionLocal() as db:
+            latest = db.execute(select(func.max(ChangeLogORM.id))).scalar()
+            if not latest or latest <= max_rows:
+                return 0
+            result = db.execute(delete(ChangeLogORM).where(ChangeLogORM.id <= latest - max_rows))
+            db.commit()
+            return result.rowcount
+
+class ChangeLogCursor:
+    """
+    Reads new change-log entries for one consumer, without skipping rows
+    committed out of id order.
+
+    Ids are assigned on insert but rows become visible on commit, so with
+    several writers a smaller id can appear after a larger one was read.
+    Every read therefore lists the ids from window ids behind the position,
+    and fetches payloads only for ids not returned before. Two writes to the
+    same row are serialized by its lock, so their entries still commit in id
+    order.
+    """
+    def __init__(self, manager: ChangeLogManager | None = None, position: int = 0,
+                 window: int = CHANGE_LOG_REREAD_WINDOW):
+        self.manager = manager if manager is not None else ChangeLogManager()
+        self.window = window
+        self.reset(position)
+
+    def reset(self, position: int):
+        """Treat every entry up to position as read"""
+        self.position = position
+        self._floor = position
+        self._seen = set()
+
+    def read(self, limit: int = 500) -> List[Dict]:
+        """Return up to limit entries not read before, oldest first; empty when there are none"""
+        after = self._floor
+        while True:
+            # Ids are cheap: one query covers the window and a page past it
+            ids = self.manager.ids_since(after, self.window + limit)
+            unseen = [change_id for change_id in ids if change_id not in self._seen][:limit]
+            if unseen or len(ids) < self.window + limit:
+                break
+            after = ids[-1]
+        changes = self.manager.changes_by_id(unseen) if unseen else []
+        if changes:
+            self._seen.update(change['id'] for change in changes)
+            self.position = max(self.position, changes[-1]['id'])
+            self._floor = max(self._floor, self.position - self.window)
+            self._seen = {change_id for change_id in self._seen if change_id > self._floor}
+        return changes
\ No newline at end of file
@@ -1,16 +1,16 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 import sys
-from dotenv import load_dotenv
+from app.config import get_database_url
 from app.infrastructure.models import Base
-
-load_dotenv()
+from app.infrastructure.slow_query_log import install_slow_query_log
 
 # SSL CA certificate path
 SSL_CA = "../../certs/ca.pem"
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_URL = get_database_url()
 if DATABASE_URL is None:
     print("Error: DATABASE_URL environment variable is not set")
     sys.exit(1)
@@ -23,7 +23,18 @@ if ".mysql.database.azure" in DATABASE_URL:
         DATABASE_URL += '&'
     DATABASE_URL += f"ssl_ca={SSL_CA}&ssl_verify_cert=true"
 
-engine = create_engine(DATABASE_URL, echo=True)
+# SQL_ECHO=true logs every statement; use the slow query log (SLOW_QUERY_MS) to find expensive ones
+engine_options = {"echo": os.getenv("SQL_ECHO", "").lower() in ("1", "true", "yes")}
+if DATABASE_URL in ("sqlite://", "sqlite:///:memory:"):
+    # One shared in-memory database, also visible to the threads async views offload DB work to
+    engine_options.update(poolclass=StaticPool, connect_args={"check_same_thread": False})
+engine = create_engine(DATABASE_URL, **engine_options)
+install_slow_query_log(engine)
 # Create all tables including the new user_stories table
 Base.metadata.create_all(engine)
+# create_all leaves existing tables alone; add the row version columns (conditional writes, fragment cache)
+for table in ("tasks", "user_stories"):
+    if "version" not in {column["name"] for column in inspect(engine).get_columns(table)}:
+        with engine.begin() as connection:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
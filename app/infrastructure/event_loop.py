@@ -0,0 +1,76 @@
+# app/infrastructure/event_loop.py
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+class BackgroundEventLoop:
+    """
+    One asyncio event loop per process, running on a daemon thread. Async
+    views are submitted to it from the request threads, so every in-flight
+    AI call shares the loop and the AsyncOpenAI connection pool bound to it,
+    instead of getting a throwaway loop per request. Blocking work (SQLAlchemy
+    sessions, log files) goes to the loop's default executor with
+    asyncio.to_thread, sized by ASYNC_BLOCKING_THREADS. A coroutine still
+    running after ASYNC_RUN_TIMEOUT seconds (default GUNICORN_TIMEOUT) is
+    cancelled, so a hung call cannot hold a request thread forever.
+    """
+    def __init__(self, blocking_threads: int | None = None, timeout: float | None = None):
+        self.blocking_threads = blocking_threads or int(os.getenv('ASYNC_BLOCKING_THREADS', '32'))
+        self.timeout = timeout or float(os.getenv('ASYNC_RUN_TIMEOUT') or os.getenv('GUNICORN_TIMEOUT', '120'))
+        self._loop = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        # Started on first use and again in a forked worker, the thread does not survive fork
+        if self._loop is None or self._pid != os.getpid():
+            with self._lock:
+                if self._loop is None or self._pid != os.getpid():
+                    self._start()
+        return self._loop
+
+    def _start(self):
+        loop = asyncio.new_event_loop()
+        loop.set_default_executor(ThreadPoolExecutor(self.blocking_threads, thread_name_prefix='async-blocking'))
+        threading.Thread(target=loop.run_forever, name='async-event-loop', daemon=True).start()
+        self._loop, self._pid = loop, os.getpid()
+
+    def run(self, coroutine, timeout: float | None = None):
+        """
+        Run coroutine on the loop and block the calling thread until it is done.
+        It runs in a copy of the caller's context, so the Flask request, the
+        request timings and the current span are visible inside it. After
+        timeout seconds (default self.timeout) the task is cancelled on the
+        loop and TimeoutError is raised.
+        """
+        loop = self.loop
+        context = contextvars.copy_context()
+        result = Future()
+        tasks = []
+
+        def start():
+            task = loop.create_task(coroutine, context=context)
+            task.add_done_callback(lambda done: _copy_outcome(done, result))
+            tasks.append(task)
+
+        loop.call_soon_threadsafe(start)
+        timeout = timeout if timeout is not None else self.timeout
+        try:
+            return result.result(timeout)
+        except TimeoutError:
+            # Callbacks run in order, so the task exists by the time this runs
+            loop.call_soon_threadsafe(lambda: tasks[0].cancel())
+            raise TimeoutError(f'Coroutine still running after {timeout:g} s, cancelled') from None
+
+def _copy_outcome(task: asyncio.Task, future: Future):
+    if task.cancelled():
+        future.cancel()
+    elif task.exception() is not None:
+        future.set_exception(task.exception())
+    else:
+        future.set_result(task.result())
+
+event_loop = BackgroundEventLoop()
\ No newline at end of file
@@ -1,5 +1,5 @@
 # app/infrastructure/models.py
-from sqlalchemy import Column, String, Float, Enum as SAEnum, DateTime, func, Integer, ForeignKey
+from sqlalchemy import Column, String, Float, Enum as SAEnum, DateTime, func, Integer, ForeignKey, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from app.domain.task import Priority, Status, Category
@@ -20,6 +20,8 @@ class UserStoryORM(Base):
     story_points = Column(Integer, nullable=False)
     effort_hours = Column(Float, nullable=False)
     created_at = Column(DateTime, nullable=False, server_default=func.now())
+    # Incremented by every update; cached page fragments are keyed by it
+    version = Column(Integer, nullable=False, default=1, server_default='1')
 
     # Relationship with tasks
     tasks = relationship("TaskORM", back_populates="user_story")
@@ -39,6 +41,27 @@ class TaskORM(Base):
     risk_analysis = Column(String(1024), nullable=True)
     risk_mitigation = Column(String(1024), nullable=True)
     created_at = Column(DateTime, nullable=False, server_default=func.now())
+    # Incremented by every update; conditional writes (If-Match) compare it in their WHERE clause
+    version = Column(Integer, nullable=False, default=1, server_default='1')
 
     # Relationship with user story
-    user_story = relationship("UserStoryORM", back_populates="tasks")
\ No newline at end of file
+    user_story = relationship("UserStoryORM", back_populates="tasks")
+
+class TableVersionORM(Base):
+    __tablename__ = "table_versions"
+
+    # One row per tracked table, bumped in the same transaction as every write to it
+    table_name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now())
+
+class ChangeLogORM(Base):
+    __tablename__ = "change_log"
+
+    # Append-only feed of entity changes, written in the same transaction as the change
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String(32), nullable=False)
+    entity_id = Column(String(36), nullable=False)
+    action = Column(String(16), nullable=False)
+    payload = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
\ No newline at end of file
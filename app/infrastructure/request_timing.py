@@ -0,0 +1,54 @@
+# app/infrastructure/request_timing.py
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict
+from sqlalchemy import event
+
+# Seconds spent per component ('db', 'ai', 'serialize', ...) in the current request
+_timings: ContextVar[Dict[str, float] | None] = ContextVar('request_timings', default=None)
+# Route being handled in the current context, used to attribute slow queries
+_route: ContextVar[str | None] = ContextVar('request_route', default=None)
+
+def start_request_timing(route: str | None = None):
+    """Start collecting component timings for the current context; returns a reset token"""
+    return _timings.set({}), _route.set(route)
+
+def stop_request_timing(token):
+    timings_token, route_token = token
+    _timings.reset(timings_token)
+    _route.reset(route_token)
+
+def current_route() -> str | None:
+    return _route.get()
+
+def current_timings() -> Dict[str, float]:
+    return _timings.get() or {}
+
+def add_timing(name: str, seconds: float):
+    timings = _timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+@contextmanager
+def timed(name: str):
+    """Add the wall-clock time of the block to the current request's timings"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_timing(name, time.perf_counter() - start)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('query_start_time')
+    if starts:
+        add_timing('db', time.perf_counter() - starts.pop())
+
+def install_db_timing(engine):
+    """Attribute the time of every SQL statement executed on engine to 'db' (idempotent)"""
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
\ No newline at end of file
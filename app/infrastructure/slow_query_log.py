@@ -0,0 +1,138 @@
+# app/infrastructure/slow_query_log.py
+import hashlib
+import logging
+import os
+import random
+import re
+import time
+from collections import OrderedDict
+from sqlalchemy import event
+from app.infrastructure.request_timing import current_route
+
+logger = logging.getLogger(__name__)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_BIND_PARAMS = re.compile(r"%\([^)]+\)s|%s|:\w+|\?")
+
+def normalize_statement(statement: str) -> str:
+    """Collapse literals, bind markers and IN lists so the same query shape always normalizes identically"""
+    normalized = _WHITESPACE.sub(' ', statement).strip()
+    normalized = _LITERALS.sub('?', normalized)
+    normalized = _BIND_PARAMS.sub('?', normalized)
+    return _IN_LISTS.sub('(?...)', normalized)
+
+def fingerprint_statement(statement: str) -> str:
+    return hashlib.blake2s(normalize_statement(statement).encode(), digest_size=8).hexdigest()
+
+def fingerprint_parameters(parameters, executemany: bool) -> str:
+    """Describe the shape of the parameters (types and row count) without logging their values"""
+    if executemany:
+        rows = list(parameters or ())
+        return f"{len(rows)} rows of {fingerprint_parameters(rows[0], False) if rows else '()'}"
+    if isinstance(parameters, dict):
+        return '{' + ', '.join(f'{key}: {type(value).__name__}' for key, value in parameters.items()) + '}'
+    return '(' + ', '.join(type(value).__name__ for value in parameters or ()) + ')'
+
+class SlowQueryLog:
+    """
+    Log SQL statements slower than threshold_ms, with a fingerprint of the
+    statement and its parameters and the route that issued them. Only a
+    sample_rate fraction of statements is timed. Statements slower than
+    explain_ms get their EXPLAIN plan captured once per fingerprint; those
+    are logged when their connection returns to the pool, because EXPLAIN
+    cannot run on a connection whose streaming cursor is still being read.
+    """
+    def __init__(self, threshold_ms: float = 200, sample_rate: float = 1.0,
+                 explain_ms: float | None = None, max_explained: int = 256):
+        self.threshold = threshold_ms / 1000
+        self.sample_rate = sample_rate
+        self.explain_threshold = explain_ms / 1000 if explain_ms is not None else None
+        self.max_explained = max_explained
+        self._explained = OrderedDict()
+
+    @classmethod
+    def from_env(cls):
+        explain_ms = os.getenv('SLOW_QUERY_EXPLAIN_MS')
+        return cls(
+            threshold_ms=float(os.getenv('SLOW_QUERY_MS', '200')),
+            sample_rate=float(os.getenv('SLOW_QUERY_SAMPLE_RATE', '0.1')),
+            explain_ms=float(explain_ms) if explain_ms else None,
+        )
+
+    def install(self, engine):
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        event.listen(engine.pool, 'checkin', self._checkin)
+
+    def remove(self, engine):
+        event.remove(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.remove(engine, 'after_cursor_execute', self._after_cursor_execute)
+        event.remove(engine.pool, 'checkin', self._checkin)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        sampled = self.sample_rate >= 1 or random.random() < self.sample_rate
+        conn.info.setdefault(self, []).append(time.perf_counter() if sampled else None)
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get(self)
+        start = starts.pop() if starts else None
+        if start is None:
+            return
+        duration = time.perf_counter() - start
+        if duration < self.threshold:
+            return
+        fingerprint = fingerprint_statement(statement)
+        record = {
+            'duration_ms': round(duration * 1000, 2),
+            'fingerprint': fingerprint,
+            'statement': normalize_statement(statement),
+            'parameters': fingerprint_parameters(parameters, executemany),
+            'route': current_route(),
+        }
+        if self._should_explain(fingerprint, duration, statement, executemany):
+            prefix = 'EXPLAIN QUERY PLAN ' if conn.dialect.name == 'sqlite' else 'EXPLAIN '
+            conn.info.setdefault((self, 'explain'), []).append((record, prefix + statement, parameters))
+            return
+        logger.warning("Slow query: %s", record, extra={'slow_query': record})
+
+    def _checkin(self, dbapi_connection, connection_record):
+        """Explain and log the queued statements once their connection is back in the pool"""
+        for record, statement, parameters in connection_record.info.pop((self, 'explain'), ()):
+            record['plan'] = self._explain(dbapi_connection, statement, parameters)
+            logger.warning("Slow query: %s", record, extra={'slow_query': record})
+
+    def _should_explain(self, fingerprint, duration, statement, executemany) -> bool:
+        if self.explain_threshold is None or duration < self.explain_threshold or executemany:
+            return False
+        if not statement.lstrip().upper().startswith('SELECT') or fingerprint in self._explained:
+            return False
+        self._explained[fingerprint] = True
+        if len(self._explained) > self.max_explained:
+            self._explained.popitem(last=False)
+        return True
+
+    def _explain(self, dbapi_connection, statement, parameters):
+        """Run the EXPLAIN statement on a raw cursor, bypassing engine events"""
+        if dbapi_connection is None:  # invalidated connection
+            return 'EXPLAIN skipped: connection invalidated'
+        try:
+            cursor = dbapi_connection.cursor()
+        except Exception as e:
+            return f'EXPLAIN failed: {e}'
+        try:
+            cursor.execute(statement, parameters)
+            return [tuple(row) for row in cursor.fetchall()]
+        except Exception as e:
+            return f'EXPLAIN failed: {e}'
+        finally:
+            cursor.close()
+
+def install_slow_query_log(engine) -> SlowQueryLog | None:
+    """Attach a slow query log configured from the environment, unless SLOW_QUERY_MS is negative"""
+    slow_query_log = SlowQueryLog.from_env()
+    if slow_query_log.threshold < 0:
+        return None
+    slow_query_log.install(engine)
+    return slow_query_log
\ No newline at end of file
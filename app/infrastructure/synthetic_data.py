@@ -0,0 +1,158 @@
+# app/infrastructure/synthetic_data.py
+import itertools
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.domain.task import Priority, Status, Category
+from app.domain.user_story import UserStoryPriority
+from app.infrastructure.change_log import record_reset
+from app.infrastructure.models import TaskORM, UserStoryORM
+from app.infrastructure.table_version import bump_table_version
+
+# Weights roughly matching a mature backlog: most work done or waiting, little blocking
+STATUS_WEIGHTS = {Status.PENDING: 35, Status.IN_PROGRESS: 20, Status.IN_REVIEW: 10, Status.COMPLETED: 35}
+PRIORITY_WEIGHTS = {Priority.LOW: 20, Priority.MEDIUM: 45, Priority.HIGH: 25, Priority.BLOCKING: 10}
+STORY_PRIORITY_WEIGHTS = {UserStoryPriority.LOW: 20, UserStoryPriority.MEDIUM: 45,
+                          UserStoryPriority.HIGH: 25, UserStoryPriority.BLOCKING: 10}
+CATEGORY_WEIGHTS = {Category.BACKEND: 35, Category.FRONTEND: 30, Category.TESTING: 15,
+                    Category.INFRA: 10, Category.MOBILE: 10}
+STORY_POINT_WEIGHTS = {1: 10, 2: 20, 3: 30, 5: 25, 8: 15}
+
+FIRST_NAMES = ['Ana', 'Luis', 'Marta', 'Javier', 'Lucia', 'Carlos', 'Elena', 'David', 'Sara', 'Pablo',
+               'Laura', 'Diego', 'Paula', 'Sergio', 'Irene', 'Raul', 'Nuria', 'Alberto', 'Clara', 'Hugo']
+LAST_NAMES = ['Garcia', 'Martinez', 'Lopez', 'Sanchez', 'Perez', 'Gomez', 'Martin', 'Jimenez', 'Ruiz', 'Diaz']
+PROJECTS = ['Checkout', 'Mobile App', 'Billing', 'Search', 'Onboarding', 'Reporting', 'Notifications',
+            'Admin Console', 'Public API', 'Data Platform']
+ROLES = ['customer', 'administrator', 'support agent', 'developer', 'product manager', 'guest user', 'auditor']
+VERBS = ['add', 'refactor', 'migrate', 'validate', 'cache', 'paginate', 'document', 'monitor', 'secure', 'test']
+NOUNS = ['endpoint', 'form', 'report', 'queue consumer', 'login flow', 'database index', 'dashboard',
+         'export job', 'webhook', 'permission check', 'search filter', 'notification template']
+WORDS = ('the service may fail under load when the upstream dependency is slow and retries pile up '
+         'data migration could lock the table during peak hours and block writes for several minutes '
+         'integration with the legacy system relies on an undocumented schema that may change without notice '
+         'mobile clients on older versions might not handle the new response format and crash on startup '
+         'estimates assume the shared component is ready but another team owns it and has not committed a date').split()
+
+def _cumulative(weights: Dict):
+    population = list(weights)
+    return population, list(itertools.accumulate(weights.values()))
+
+def _weighted(rng: random.Random, cumulative):
+    population, cum_weights = cumulative
+    return rng.choices(population, cum_weights=cum_weights)[0]
+
+_status_choices = _cumulative(STATUS_WEIGHTS)
+_priority_choices = _cumulative(PRIORITY_WEIGHTS)
+_story_priority_choices = _cumulative(STORY_PRIORITY_WEIGHTS)
+_category_choices = _cumulative(CATEGORY_WEIGHTS)
+_story_point_choices = _cumulative(STORY_POINT_WEIGHTS)
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+def _sentence(rng: random.Random, length: int) -> str:
+    """Text of about `length` characters drawn from the risk vocabulary"""
+    # Vocabulary words average ~5 characters plus a space
+    text = ' '.join(rng.choices(WORDS, k=length // 5 + 1))
+    return text[:length].rstrip().capitalize() + '.'
+
+class SyntheticDataGenerator:
+    """
+    Seedable generator of realistic user stories and tasks. Tasks per story
+    follow a log-normal distribution (median ~6), assignees a Zipf-like
+    distribution so a few people own most of the work, and risk analysis
+    length a log-normal distribution capped at the column size.
+    """
+    def __init__(self, seed: int = 0, assignees: int = 50, days: int = 365):
+        self.rng = random.Random(seed)
+        self.assignees = [f'{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]}'
+                          for i in range(assignees)]
+        self.assignee_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(assignees)))
+        self.start = datetime(2025, 1, 1)
+        self.days = days
+
+    def _created_at(self) -> datetime:
+        return self.start + timedelta(seconds=self.rng.randrange(self.days * 86400))
+
+    def user_story(self) -> Dict:
+        rng = self.rng
+        role = rng.choice(ROLES)
+        goal = f'{rng.choice(VERBS)} the {rng.choice(NOUNS)}'
+        reason = f'the {rng.choice(NOUNS)} keeps working as the product grows'
+        story_points = _weighted(rng, _story_point_choices)
+        return {
+            'id': _uuid(rng),
+            'project': rng.choice(PROJECTS),
+            'rol': role,
+            'goal': goal,
+            'reason': reason,
+            'description': f'As a {role}, I want to {goal} so that {reason}.',
+            'priority': _weighted(rng, _story_priority_choices),
+            'story_points': story_points,
+            'effort_hours': round(story_points * rng.uniform(2.0, 6.0), 1),
+            'created_at': self._created_at(),
+        }
+
+    def tasks_for(self, user_story: Dict) -> List[Dict]:
+        rng = self.rng
+        count = min(30, int(rng.lognormvariate(1.8, 0.5)))
+        tasks = []
+        for _ in range(count):
+            noun = rng.choice(NOUNS)
+            has_risk = rng.random() < 0.6
+            tasks.append({
+                'id': _uuid(rng),
+                'title': f'{rng.choice(VERBS).capitalize()} {noun} for {user_story["project"]}',
+                'description': _sentence(rng, int(min(1000, rng.lognormvariate(4.5, 0.5)))),
+                'priority': _weighted(rng, _priority_choices),
+                'effort_hours': round(min(40.0, max(0.5, rng.lognormvariate(1.3, 0.7))) * 2) / 2,
+                'status': _weighted(rng, _status_choices),
+                'assigned_to': rng.choices(self.assignees, cum_weights=self.assignee_weights)[0],
+                'category': _weighted(rng, _category_choices),
+                'user_story_id': user_story['id'],
+                'risk_analysis': _sentence(rng, int(min(1000, rng.lognormvariate(5.3, 0.6)))) if has_risk else None,
+                'risk_mitigation': _sentence(rng, int(min(1000, rng.lognormvariate(5.0, 0.6)))) if has_risk else None,
+                'created_at': user_story['created_at'] + timedelta(hours=rng.randrange(24 * 30)),
+            })
+        return tasks
+
+    def batches(self, user_stories: int, batch_size: int) -> Iterator[tuple]:
+        """Yield (user_story_rows, task_rows) with up to batch_size stories each"""
+        for start in range(0, user_stories, batch_size):
+            stories = [self.user_story() for _ in range(min(batch_size, user_stories - start))]
+            yield stories, [task for story in stories for task in self.tasks_for(story)]
+
+def load_synthetic_data(engine, user_stories: int, seed: int = 0, batch_size: int = 1000,
+                        progress=None) -> Dict[str, int]:
+    """
+    Bulk-load user_stories generated stories and their tasks, one transaction
+    per batch of stories. Each transaction bumps both table versions, so cached
+    pages and ETags are invalidated. Instead of a change-log row per seeded
+    row, one RESET entry is recorded once the load ends (or fails after some
+    batches), so the change feed, the similarity index and the category
+    classifier reload from the tables. Rows go through a single executemany
+    INSERT per table and batch, which the MySQL drivers rewrite into multi-row
+    INSERTs; compiling explicit multi-row VALUES in SQLAlchemy was ~18x slower.
+    """
+    generator = SyntheticDataGenerator(seed)
+    counts = {'user_stories': 0, 'tasks': 0}
+    try:
+        for stories, tasks in generator.batches(user_stories, batch_size):
+            with Session(engine) as db, db.begin():
+                db.execute(insert(UserStoryORM.__table__), stories)
+                if tasks:
+                    db.execute(insert(TaskORM.__table__), tasks)
+                bump_table_version(db, UserStoryORM.__tablename__)
+                bump_table_version(db, TaskORM.__tablename__)
+            counts['user_stories'] += len(stories)
+            counts['tasks'] += len(tasks)
+            if progress is not None:
+                progress(counts)
+    finally:
+        if counts['user_stories']:
+            with Session(engine) as db, db.begin():
+                record_reset(db)
+    return counts
\ No newline at end of file
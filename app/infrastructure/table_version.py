@@ -0,0 +1,64 @@
+# app/infrastructure/table_version.py
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Tuple
+from sqlalchemy import select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from app.infrastructure.db import SessionLocal
+from app.infrastructure.models import Base, TableVersionORM
+
+class VersionConflict(Exception):
+    """A conditional write found the row at a different version than it expected"""
+
+def bump_table_version(db, table_name: str):
+    """
+    Increment the version counter of a table inside the caller's session, so the
+    new version becomes visible in the same commit as the data change. A single
+    upsert statement, so concurrent first writers to a table do not collide.
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    values = {'table_name': table_name, 'version': 1, 'updated_at': now}
+    dialect = db.get_bind().dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        insert = (sqlite if dialect == 'sqlite' else postgresql).insert(TableVersionORM).values(values)
+        db.execute(insert.on_conflict_do_update(
+            index_elements=[TableVersionORM.table_name],
+            set_={'version': TableVersionORM.version + 1, 'updated_at': now}
+        ))
+    elif dialect in ('mysql', 'mariadb'):
+        db.execute(mysql.insert(TableVersionORM).values(values).on_duplicate_key_update(
+            version=TableVersionORM.version + 1, updated_at=now
+        ))
+    else:
+        increment = (update(TableVersionORM).where(TableVersionORM.table_name == table_name)
+                     .values(version=TableVersionORM.version + 1, updated_at=now))
+        if db.execute(increment).rowcount == 0:
+            try:
+                # A savepoint, so losing the race to insert the row does not abort the caller's transaction
+                with db.begin_nested():
+                    db.execute(TableVersionORM.__table__.insert().values(values))
+            except IntegrityError:
+                db.execute(increment)
+
+class TableVersionManager:
+    def get_row_version(self, table_name: str, row_id: str) -> int | None:
+        """Return the version column of one row, or None when the row does not exist"""
+        table = Base.metadata.tables[table_name]
+        with SessionLocal() as db:
+            return db.execute(select(table.c.version).where(table.c.id == row_id)).scalar()
+
+    def get_versions(self, table_names: Iterable[str]) -> Dict[str, Tuple[int, datetime | None]]:
+        """
+        Return {table_name: (version, updated_at)} for the given tables.
+        Tables that were never written report version 0 and no timestamp.
+        """
+        table_names = list(table_names)
+        versions = {table_name: (0, None) for table_name in table_names}
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(TableVersionORM.table_name, TableVersionORM.version, TableVersionORM.updated_at)
+                .where(TableVersionORM.table_name.in_(table_names))
+            )
+            for table_name, version, updated_at in rows:
+                versions[table_name] = (version, updated_at)
+        return versions
\ No newline at end of file
@@ -0,0 +1,377 @@
+# app/infrastructure/task_index.py
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+from app.infrastructure.change_log import ChangeLogManager, ChangeLogCursor, RESET
+
+logger = logging.getLogger(__name__)
+
+# Where the index is saved between restarts; empty disables persistence
+SIMILARITY_INDEX_PATH = os.getenv('SIMILARITY_INDEX_PATH', os.path.join('instance', 'task_similarity.npz'))
+# Lowest estimated Jaccard similarity returned by /tasks/<id>/similar
+SIMILARITY_THRESHOLD = float(os.getenv('SIMILARITY_THRESHOLD', '0.5'))
+# Lowest similarity at which a new task counts as a duplicate of an existing one
+SIMILARITY_DUPLICATE_THRESHOLD = float(os.getenv('SIMILARITY_DUPLICATE_THRESHOLD', '0.8'))
+# Seconds between catching up with writes made by other processes
+SIMILARITY_REFRESH_INTERVAL = float(os.getenv('SIMILARITY_REFRESH_INTERVAL', '1'))
+# Seconds between saves of an index that changed
+SIMILARITY_SAVE_INTERVAL = float(os.getenv('SIMILARITY_SAVE_INTERVAL', '60'))
+
+# Tasks signed together: bounds the (num_perm x shingles) hash matrix to a few MB
+SIGNATURE_BATCH = 128
+# Rows read from the tasks table at a time while building
+BUILD_BATCH = 2048
+# Rows added or removed since the sorted band arrays were built before they are rebuilt,
+# at least this many or an eighth of the index
+BAND_MERGE_ROWS = 1024
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+def _shingles(text: str) -> np.ndarray:
+    """crc32 hashes of the distinct words and word pairs of text"""
+    words = _WORD.findall(text.lower())
+    grams = set(words) | {f'{first} {second}' for first, second in zip(words, words[1:])}
+    return np.fromiter((zlib.crc32(gram.encode()) for gram in grams), dtype=np.uint64, count=len(grams))
+
+def _text(task) -> str:
+    if isinstance(task, dict):
+        return f"{task.get('title', '')} {task.get('description', '')}"
+    return f'{task.title} {task.description}'
+
+class TaskSimilarityIndex:
+    """
+    MinHash signatures of every task's title and description, bucketed by
+    locality-sensitive hashing: a query probes `bands` hash tables and only
+    compares signatures with the tasks it collides with, instead of every
+    task. Two tasks share a bucket with probability 1 - (1 - J^r)^b for
+    Jaccard similarity J (r = num_perm / bands), so with 128 permutations in
+    32 bands pairs above ~0.5 are almost always found.
+
+    The buckets are one sorted NumPy array of band keys, each tagged with
+    its band in the low bits, with the matching rows alongside, probed for
+    all bands with a single searchsorted. Rows added since the arrays were
+    sorted are compared directly; removed rows stay in them until the next
+    merge and are filtered out of the candidates.
+
+    The index is loaded (or built from the tasks table) on first use. From
+    then on TaskManager writes update it directly, and writes made by other
+    worker processes are applied from the change log every refresh_interval
+    seconds. It is saved to path, with the change-log position it reflects,
+    so a restarted worker only replays newer changes.
+    """
+    def __init__(self, path: str = SIMILARITY_INDEX_PATH, num_perm: int = 128, bands: int = 32,
+                 refresh_interval: float = SIMILARITY_REFRESH_INTERVAL,
+                 save_interval: float = SIMILARITY_SAVE_INTERVAL, change_log: ChangeLogManager | None = None):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.path = path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.refresh_interval = refresh_interval
+        self.save_interval = save_interval
+        self.change_log = change_log if change_log is not None else ChangeLogManager()
+        # Multiply-shift hashing with a fixed seed, so saved signatures stay comparable with new ones
+        rng = np.random.default_rng(20240501)
+        self._multipliers = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)[:, None] * 2 + 1
+        self._offsets = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)[:, None]
+        self._band_mix = rng.integers(0, 1 << 63, self.rows, dtype=np.uint64) * 2 + 1
+        self._band_tags = np.arange(bands, dtype=np.uint64)
+        self._tag_mask = np.uint64((1 << (bands - 1).bit_length()) - 1)
+        self._lock = threading.RLock()
+        # Serializes refreshes and rebuilds; taken before _lock
+        self._refresh_lock = threading.RLock()
+        self._loaded = False
+        self._reset()
+
+    def _reset(self, capacity: int = 1024):
+        # Signatures live in one matrix so candidates are compared in a single gather;
+        # rows freed by deletes are reused
+        self._matrix = np.zeros((capacity, self.num_perm), dtype=np.uint32)
+        self._keys = np.zeros((capacity, self.bands), dtype=np.uint64)
+        self._rows: Dict[str, int] = {}
+        self._ids: List[str | None] = []
+        self._free: List[int] = []
+        self._text_hashes: Dict[str, int] = {}
+        self._sorted_keys = np.zeros(0, dtype=np.uint64)
+        self._sorted_rows = np.zeros(0, dtype=np.int32)
+        self._pending: List[int] = []
+        self._stale = 0
+        self._cursor = ChangeLogCursor(self.change_log)
+        self._last_refresh = 0.0
+        self._last_save = time.monotonic()
+        self._dirty = False
+
+    def _signatures(self, shingle_sets: List[np.ndarray]) -> np.ndarray:
+        """MinHash signatures, one row per non-empty shingle array"""
+        signatures = []
+        for start in range(0, len(shingle_sets), SIGNATURE_BATCH):
+            batch = shingle_sets[start:start + SIGNATURE_BATCH]
+            offsets = np.cumsum([0] + [len(shingles) for shingles in batch[:-1]])
+            # uint64 arithmetic wraps, the high 32 bits are the hash
+            hashes = (self._multipliers * np.concatenate(batch) + self._offsets) >> np.uint64(32)
+            signatures.append(np.minimum.reduceat(hashes, offsets, axis=1).T.astype(np.uint32))
+        return np.concatenate(signatures) if signatures else np.zeros((0, self.num_perm), dtype=np.uint32)
+
+    def signature(self, text: str) -> np.ndarray | None:
+        """The MinHash signature of text, or None when it has no words"""
+        shingles = _shingles(text)
+        return self._signatures([shingles])[0] if len(shingles) else None
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """One 64-bit bucket key per band for each row of signatures"""
+        bands = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        return (bands * self._band_mix).sum(axis=2)
+
+    def _tagged(self, keys: np.ndarray) -> np.ndarray:
+        """Band keys with their band number in the low bits, so every band shares one sorted array"""
+        return (keys & ~self._tag_mask) | self._band_tags
+
+    def _merge(self):
+        """Sort the keys of every indexed row into the bucket arrays, dropping removed rows"""
+        rows = np.array(sorted(self._rows.values()), dtype=np.int32)
+        tagged = self._tagged(self._keys[rows]).ravel()
+        order = np.argsort(tagged)
+        self._sorted_keys = tagged[order]
+        self._sorted_rows = np.repeat(rows, self.bands)[order]
+        self._pending = []
+        self._stale = 0
+
+    def _merge_if_due(self):
+        if len(self._pending) + self._stale >= max(BAND_MERGE_ROWS, len(self._rows) // 8):
+            self._merge()
+
+    def _allocate(self, count: int) -> np.ndarray:
+        """Rows for count new signatures: freed rows first, then new ones, growing the matrix by doubling"""
+        reused, self._free = self._free[:count], self._free[count:]
+        first = len(self._ids)
+        self._ids.extend([None] * (count - len(reused)))
+        capacity = len(self._matrix)
+        while capacity < len(self._ids):
+            capacity *= 2
+        if capacity > len(self._matrix):
+            self._matrix = np.concatenate([self._matrix, np.zeros((capacity - len(self._matrix), self.num_perm), dtype=np.uint32)])
+            self._keys = np.concatenate([self._keys, np.zeros((capacity - len(self._keys), self.bands), dtype=np.uint64)])
+        return np.array(reused + list(range(first, len(self._ids))), dtype=np.intp)
+
+    def _sign(self, items: Iterable[Tuple[str, str]]) -> List[Tuple[str, int, np.ndarray | None]]:
+        """
+        (task id, text hash, signature) of the (task id, text) pairs whose text
+        changed, signature None for a text without words. Needs no lock.
+        """
+        texts = {}
+        for task_id, text in items:
+            text_hash = zlib.crc32(text.encode())
+            if self._text_hashes.get(task_id) != text_hash:  # e.g. a status change leaves it unchanged
+                texts[task_id] = (text, text_hash)
+        shingle_sets = {task_id: _shingles(text) for task_id, (text, _) in texts.items()}
+        task_ids = [task_id for task_id, shingles in shingle_sets.items() if len(shingles)]
+        signatures = dict(zip(task_ids, self._signatures([shingle_sets[task_id] for task_id in task_ids])))
+        return [(task_id, text_hash, signatures.get(task_id)) for task_id, (_, text_hash) in texts.items()]
+
+    def _store(self, signed: List[Tuple[str, int, np.ndarray | None]]):
+        """Index signed tasks in place of their previous signatures"""
+        # Another thread may have stored the same text since it was signed
+        signed = [entry for entry in signed if self._text_hashes.get(entry[0]) != entry[1]]
+        if not signed:
+            return
+        for task_id, _, _ in signed:
+            self._remove(task_id)
+        kept = [entry for entry in signed if entry[2] is not None]
+        if kept:
+            signatures = np.stack([signature for _, _, signature in kept])
+            rows = self._allocate(len(kept))
+            self._matrix[rows] = signatures
+            self._keys[rows] = self._band_keys(signatures)
+            for row, (task_id, text_hash, _) in zip(rows.tolist(), kept):
+                self._ids[row] = task_id
+                self._rows[task_id] = row
+                self._text_hashes[task_id] = text_hash
+            self._pending.extend(rows.tolist())
+            self._merge_if_due()
+        self._dirty = True
+
+    def _remove(self, task_id: str):
+        row = self._rows.pop(task_id, None)
+        self._text_hashes.pop(task_id, None)
+        if row is None:
+            return
+        self._ids[row] = None
+        self._free.append(row)
+        self._stale += 1
+        self._dirty = True
+        self._merge_if_due()
+
+    def index_tasks(self, tasks: Iterable):
+        """Index created or updated tasks; a no-op until the index is first used in this process"""
+        if self._loaded:
+            signed = self._sign((task['id'] if isinstance(task, dict) else task.id, _text(task)) for task in tasks)
+            with self._lock:
+                self._store(signed)
+
+    def remove_tasks(self, task_ids: Iterable[str]):
+        """Drop deleted tasks; a no-op until the index is first used in this process"""
+        if self._loaded:
+            with self._lock:
+                for task_id in task_ids:
+                    self._remove(task_id)
+
+    def similar(self, task, limit: int = 10, threshold: float = 0.5, exclude: str | None = None) -> List[Tuple[str, float]]:
+        """(task id, estimated Jaccard similarity) of indexed tasks near task, most similar first"""
+        self._ensure_current()
+        signature = self.signature(_text(task))
+        if signature is None:
+            return []
+        keys = self._band_keys(signature[None])[0]
+        with self._lock:
+            tagged = self._tagged(keys)
+            starts = np.searchsorted(self._sorted_keys, tagged, side='left')
+            counts = np.searchsorted(self._sorted_keys, tagged, side='right') - starts
+            # Every position from each start to its end, in one gather
+            positions = np.arange(counts.sum()) + np.repeat(starts - (np.cumsum(counts) - counts), counts)
+            candidates = {row for row in self._sorted_rows[positions].tolist() + self._pending
+                          if self._ids[row] is not None}
+            candidates.discard(self._rows.get(exclude))
+            rows = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+            # Drops rows added since the merge that collide with no band, rows reused since,
+            # and rows matched only through the bits the tag replaced
+            rows = rows[(self._keys[rows] == keys).any(axis=1)]
+            if not len(rows):
+                return []
+            similarities = (self._matrix[rows] == signature).mean(axis=1)
+            order = np.argsort(-similarities, kind='stable')[:limit]
+            return [(self._ids[rows[i]], round(float(similarities[i]), 3)) for i in order if similarities[i] >= threshold]
+
+    def load(self):
+        """Load or build the index unless already loaded in this process"""
+        if not self._loaded:
+            with self._refresh_lock, self._lock:
+                if not self._loaded:
+                    self._load()
+                    self._loaded = True
+
+    def _ensure_current(self):
+        if not self._loaded:
+            self.load()
+        elif (time.monotonic() - self._last_refresh >= self.refresh_interval
+              and self._refresh_lock.acquire(blocking=False)):
+            # One caller refreshes, the others keep using the current index
+            try:
+                self.refresh()
+            finally:
+                self._refresh_lock.release()
+
+    def _load(self):
+        """Restore the saved index and replay newer changes, or build it from the tasks table"""
+        if self.path and os.path.exists(self.path):
+            try:
+                with np.load(self.path) as saved:
+                    if int(saved['num_perm']) == self.num_perm and int(saved['bands']) == self.bands:
+                        ids, signatures = saved['ids'].tolist(), saved['signatures']
+                        self._reset(capacity=max(1024, len(ids)))
+                        self._matrix[:len(ids)] = signatures
+                        self._keys[:len(ids)] = self._band_keys(signatures)
+                        self._ids = list(ids)
+                        self._rows = {task_id: row for row, task_id in enumerate(ids)}
+                        self._text_hashes = dict(zip(ids, saved['text_hashes'].tolist()))
+                        self._merge()
+                        self._cursor.reset(int(saved['last_change_id']))
+                        if self.refresh():
+                            return
+            except (OSError, KeyError, ValueError):
+                logger.warning("Could not load the task similarity index from %s, rebuilding it", self.path,
+                               exc_info=True)
+        self.rebuild()
+
+    def rebuild(self):
+        """Index every task in the tasks table"""
+        # Imported here: the task manager writes to this index
+        from app.infrastructure.task_manager import TaskManager
+        with self._refresh_lock, self._lock:
+            self._reset()
+            # Changes committed while the table is read are replayed by the next refresh
+            self._cursor.reset(self.change_log.id_range()[1])
+            rows = TaskManager().iter_tasks(fields=['id', 'title', 'description'])
+            while batch := list(itertools.islice(rows, BUILD_BATCH)):
+                self._store(self._sign((row['id'], _text(row)) for row in batch))
+            self._merge()
+            self._last_refresh = time.monotonic()
+            self.save()
+
+    def refresh(self) -> bool:
+        """
+        Apply task changes from the change log since the indexed position.
+        Returns False, without changes, when the log no longer reaches back
+        to that position (pruned or reset), or holds a RESET entry from a bulk
+        load, so the index must be rebuilt.
+        Each page of the log is read and signed unlocked, then applied under
+        the index lock.
+        """
+        with self._refresh_lock:
+            oldest, latest = self.change_log.id_range()
+            position = self._cursor.position
+            if latest < position or oldest > position + 1:
+                if self._loaded:
+                    self.rebuild()
+                    return True
+                return False
+            while changes := self._cursor.read():
+                if any(change['action'] == RESET for change in changes):
+                    if self._loaded:
+                        self.rebuild()
+                        return True
+                    return False
+                # Only the last change of each task in the page counts, None for a delete
+                texts = {}
+                for change in changes:
+                    if change['entity'] == 'task':
+                        texts[change['entity_id']] = (None if change['action'] == 'deleted'
+                                                      else _text(json.loads(change['payload'])))
+                signed = self._sign((task_id, text) for task_id, text in texts.items() if text is not None)
+                with self._lock:
+                    for task_id, text in texts.items():
+                        if text is None:
+                            self._remove(task_id)
+                    self._store(signed)
+            self._last_refresh = time.monotonic()
+            if self._dirty and time.monotonic() - self._last_save >= self.save_interval:
+                self.save()
+            return True
+
+    def save(self, only_if_changed: bool = False):
+        """Write the index atomically to path (no-op without a path)"""
+        if not self.path or (only_if_changed and not self._dirty):
+            return
+        with self._lock:
+            rows = np.array([row for row, task_id in enumerate(self._ids) if task_id is not None], dtype=np.intp)
+            ids = [self._ids[row] for row in rows]
+            signatures = self._matrix[rows]
+            text_hashes = np.array([self._text_hashes[task_id] for task_id in ids], dtype=np.uint32)
+            last_change_id = self._cursor.position
+            self._dirty = False
+            self._last_save = time.monotonic()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        # Unique per process: every gunicorn worker may save the same index
+        temporary = f'{self.path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as f:
+            np.savez(f, ids=np.array(ids, dtype=str), signatures=signatures, text_hashes=text_hashes,
+                     last_change_id=last_change_id, num_perm=self.num_perm, bands=self.bands)
+        os.replace(temporary, self.path)
+
+    def clear(self):
+        """Forget the in-memory index; the next lookup loads it again"""
+        with self._refresh_lock, self._lock:
+            self._loaded = False
+            self._reset()
+
+    def stats(self) -> Dict:
+        return {'tasks': len(self._rows), 'last_change_id': self._cursor.position, 'loaded': self._loaded}
+
+task_index = TaskSimilarityIndex()
\ No newline at end of file
@@ -1,9 +1,16 @@
 # app/infrastructure/task_manager.py
 from app.infrastructure.db import SessionLocal
 from app.infrastructure.models import TaskORM
-from app.domain.task import Task
-from typing import List
+from app.infrastructure.table_version import bump_table_version, VersionConflict
+from app.infrastructure.change_log import record_changes
+from app.infrastructure.bulk import chunks, sparse_row, insert_row, inserted, update_values, versioned_update
+from app.infrastructure.task_index import task_index
+from app.infrastructure.tracing import traced_methods
+from app.domain.task import Task, Status
+from sqlalchemy import insert, update, delete, select, func
+from typing import Dict, Iterable, Iterator, List, Set
 
+@traced_methods('infrastructure')
 class TaskManager:
     def add_task(self, task: Task):
         with SessionLocal() as db:
@@ -21,45 +28,64 @@ class TaskManager:
                 risk_mitigation=task.risk_mitigation
             )
             db.add(db_task)
+            bump_table_version(db, TaskORM.__tablename__)
+            record_changes(db, 'task', 'created', [(task.id, inserted([task])[0])])
             db.commit()
+            task_index.index_tasks([task])
             db.refresh(db_task)
             task_dict = db_task.__dict__.copy()
             task_dict.pop('created_at', None)
             task_dict.pop('_sa_instance_state', None)
             return Task.model_validate(task_dict)
 
-    def update_task(self, task: Task):
+    def update_task(self, task: Task, expected_version: int | None = None):
+        """
+        Update a task and increment its version. With expected_version the
+        UPDATE matches only that version of the row, so a concurrent write in
+        between raises VersionConflict instead of being overwritten.
+        Returns None when the task does not exist.
+        """
         with SessionLocal() as db:
-            db_task = db.query(TaskORM).filter(TaskORM.id == task.id).first()
-            if db_task:
-                setattr(db_task, "title", task.title)
-                setattr(db_task, "description", task.description)
-                setattr(db_task, "priority", task.priority)
-                setattr(db_task, "effort_hours", task.effort_hours)
-                setattr(db_task, "status", task.status)
-                setattr(db_task, "assigned_to", task.assigned_to)
-                setattr(db_task, "category", task.category)
-                setattr(db_task, "user_story_id", task.user_story_id)
-                setattr(db_task, "risk_analysis", task.risk_analysis)
-                setattr(db_task, "risk_mitigation", task.risk_mitigation)
-                db.commit()
-                db.refresh(db_task)
-                task_dict = db_task.__dict__.copy()
-                task_dict.pop('created_at', None)
-                task_dict.pop('_sa_instance_state', None)
-                return Task.model_validate(task_dict)
-            return None
+            statement = update(TaskORM).where(TaskORM.id == task.id)
+            if expected_version is not None:
+                statement = statement.where(TaskORM.version == expected_version)
+            statement = statement.values(**update_values(task), version=TaskORM.version + 1)
+            if db.execute(statement.execution_options(synchronize_session=False)).rowcount == 0:
+                if expected_version is not None and db.get(TaskORM, task.id) is not None:
+                    raise VersionConflict(task.id)
+                return None
+            task_dict = db.get(TaskORM, task.id).__dict__.copy()
+            task_dict.pop('created_at', None)
+            task_dict.pop('_sa_instance_state', None)
+            updated = Task.model_validate(task_dict)
+            bump_table_version(db, TaskORM.__tablename__)
+            record_changes(db, 'task', 'updated', [(task.id, updated)])
+            db.commit()
+            task_index.index_tasks([updated])
+            return updated
 
-    def delete_task(self, task_id: str):
+    def delete_task(self, task_id: str, expected_version: int | None = None):
+        """Delete a task; with expected_version, only that version of it (VersionConflict otherwise)"""
         with SessionLocal() as db:
-            db_task = db.query(TaskORM).filter(TaskORM.id == task_id).first()
-            if db_task:
-                db.delete(db_task)
-                db.commit()
-                return True
-            return None
+            statement = delete(TaskORM).where(TaskORM.id == task_id)
+            if expected_version is not None:
+                statement = statement.where(TaskORM.version == expected_version)
+            if db.execute(statement.execution_options(synchronize_session=False)).rowcount == 0:
+                if expected_version is not None and db.get(TaskORM, task_id) is not None:
+                    raise VersionConflict(task_id)
+                return None
+            bump_table_version(db, TaskORM.__tablename__)
+            record_changes(db, 'task', 'deleted', [(task_id, None)])
+            db.commit()
+            task_index.remove_tasks([task_id])
+            return True
 
-    def list_tasks(self):
+    def list_tasks(self, fields: List[str] | None = None):
+        """List all tasks; when fields is given, select only those columns and return dicts"""
+        if fields:
+            with SessionLocal() as db:
+                rows = db.execute(select(*[TaskORM.__table__.c[field] for field in fields])).mappings()
+                return [sparse_row(row) for row in rows]
         with SessionLocal() as db:
             db_tasks = db.query(TaskORM).all()
             result = []
@@ -70,7 +96,13 @@ class TaskManager:
                 result.append(Task.model_validate(task_dict))
             return result
 
-    def get_task(self, task_id: str) -> Task | None:
+    def get_task(self, task_id: str, fields: List[str] | None = None) -> Task | Dict | None:
+        """Get a task by id; when fields is given, select only those columns and return a dict"""
+        if fields:
+            with SessionLocal() as db:
+                row = db.execute(select(*[TaskORM.__table__.c[field] for field in fields])
+                                 .where(TaskORM.id == task_id)).mappings().first()
+                return sparse_row(row) if row else None
         with SessionLocal() as db:
             db_task = db.query(TaskORM).filter(TaskORM.id == task_id).first()
             if db_task:
@@ -89,4 +121,109 @@ class TaskManager:
                 # Remove SQLAlchemy internal attributes
                 task_dict.pop('_sa_instance_state', None)
                 result.append(Task.model_validate(task_dict))
-            return result
\ No newline at end of file
+            return result
+
+    def get_tasks(self, task_ids: Iterable[str]) -> Dict[str, Task]:
+        """Fetch several tasks by id, returning a mapping of id to Task"""
+        task_ids = list(dict.fromkeys(task_ids))
+        result = {}
+        with SessionLocal() as db:
+            for chunk in chunks(task_ids):
+                db_tasks = db.query(TaskORM).filter(TaskORM.id.in_(chunk)).all()
+                for db_task in db_tasks:
+                    task_dict = db_task.__dict__.copy()
+                    task_dict.pop('created_at', None)
+                    task_dict.pop('_sa_instance_state', None)
+                    result[db_task.id] = Task.model_validate(task_dict)
+        return result
+
+    def add_tasks(self, tasks: List[Task]) -> List[Task]:
+        """Insert tasks with multi-row INSERT statements in bounded-size chunks; returns them as stored"""
+        rows = [insert_row(task) for task in tasks]
+        if not rows:
+            return tasks
+        tasks = inserted(tasks)
+        with SessionLocal() as db:
+            for chunk in chunks(rows):
+                db.execute(insert(TaskORM), chunk)
+            bump_table_version(db, TaskORM.__tablename__)
+            record_changes(db, 'task', 'created', [(task.id, task) for task in tasks])
+            db.commit()
+            task_index.index_tasks(tasks)
+        return tasks
+
+    def update_tasks(self, tasks: List[Task]) -> List[Task]:
+        """
+        Update existing tasks with bulk UPDATE-by-primary-key statements,
+        incrementing their versions. Returns the tasks the UPDATE matched, with
+        their new versions; tasks that no longer exist are left out.
+        """
+        rows = [{**update_values(task), 'row_id': task.id} for task in tasks]
+        if not rows:
+            return []
+        with SessionLocal() as db:
+            versions = {}
+            for chunk in chunks(rows):
+                db.execute(versioned_update(TaskORM.__table__), chunk)
+                # The UPDATE locked the rows it matched, so these are its versions
+                versions.update(db.execute(select(TaskORM.id, TaskORM.version)
+                                           .where(TaskORM.id.in_([row['row_id'] for row in chunk]))).all())
+            updated = [task.model_copy(update={'version': versions[task.id]}) for task in tasks if task.id in versions]
+            if updated:
+                bump_table_version(db, TaskORM.__tablename__)
+                record_changes(db, 'task', 'updated', [(task.id, task) for task in updated])
+            db.commit()
+            task_index.index_tasks(updated)
+        return updated
+
+    def delete_tasks(self, task_ids: Iterable[str]) -> Set[str]:
+        """Delete tasks by id and return the ids that actually existed"""
+        task_ids = list(dict.fromkeys(task_ids))
+        deleted = set()
+        with SessionLocal() as db:
+            for chunk in chunks(task_ids):
+                found = db.execute(select(TaskORM.id).where(TaskORM.id.in_(chunk))).scalars().all()
+                if found:
+                    db.execute(delete(TaskORM).where(TaskORM.id.in_(found)))
+                    deleted.update(found)
+            if deleted:
+                bump_table_version(db, TaskORM.__tablename__)
+                record_changes(db, 'task', 'deleted', [(task_id, None) for task_id in deleted])
+            db.commit()
+            task_index.remove_tasks(deleted)
+        return deleted
+
+    def iter_tasks(self, batch_size: int = 1000, fields: List[str] | None = None) -> Iterator[Task | Dict]:
+        """
+        Stream all tasks using a server-side cursor, fetching batch_size rows at a time.
+        Memory stays constant regardless of table size. When fields is given, only
+        those columns are selected and dicts are yielded instead of Tasks.
+        """
+        columns = [TaskORM.__table__.c[field] for field in fields] if fields else TaskORM.__table__.columns
+        with SessionLocal() as db:
+            result = db.execute(select(*columns).execution_options(yield_per=batch_size))
+            for row in result.mappings():
+                yield sparse_row(row) if fields else Task.model_validate(dict(row))
+
+    def get_task_stats_by_user_story(self, user_story_ids: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Aggregate task counts per status and total effort for several user stories
+        with a single GROUP BY query.
+        Returns {user_story_id: {'total': int, 'effort_hours': float, 'by_status': {status: count}}}.
+        """
+        user_story_ids = list(user_story_ids)
+        stats = {user_story_id: {'total': 0, 'effort_hours': 0.0, 'by_status': {}} for user_story_id in user_story_ids}
+        if not user_story_ids:
+            return stats
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(TaskORM.user_story_id, TaskORM.status, func.count(TaskORM.id), func.sum(TaskORM.effort_hours))
+                .where(TaskORM.user_story_id.in_(user_story_ids))
+                .group_by(TaskORM.user_story_id, TaskORM.status)
+            )
+            for user_story_id, status, count, effort_hours in rows:
+                story_stats = stats[user_story_id]
+                story_stats['by_status'][Status(status).value] = count
+                story_stats['total'] += count
+                story_stats['effort_hours'] = round(story_stats['effort_hours'] + (effort_hours or 0.0), 1)
+        return stats
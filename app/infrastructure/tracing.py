@@ -0,0 +1,139 @@
+# app/infrastructure/tracing.py
+import functools
+import inspect
+import os
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from sqlalchemy import event
+from app.infrastructure.slow_query_log import normalize_statement
+
+# Set by configure_tracing and cleared by reset_tracing; None means spans go to the no-op API tracer
+_provider: TracerProvider | None = None
+_tracer: trace.Tracer = trace.NoOpTracer()
+# Trace files opened by the 'file' exporter, closed by reset_tracing
+_files = []
+
+class _AppTracer:
+    """The 'app' tracer of the current provider, so spans follow configure_tracing / reset_tracing"""
+    def __getattr__(self, name):
+        return getattr(_tracer, name)
+
+tracer = _AppTracer()
+
+def configure_tracing(exporter: str | None = None, sample_rate: float | None = None):
+    """
+    Install an SDK tracer provider. exporter is 'memory', 'console', 'file'
+    (TRACING_FILE, default traces.jsonl) or 'none'; sample_rate is the ratio of
+    new traces recorded, child spans follow their parent's decision.
+    Returns (provider, span exporter), or (None, None) for 'none'. Only the
+    first call installs a provider, later calls add exporters to it; call
+    reset_tracing to shut it down.
+    """
+    global _provider, _tracer
+    exporter = exporter or os.getenv('TRACING_EXPORTER', 'none')
+    if exporter == 'none':
+        return None, None
+    if _provider is None:
+        if sample_rate is None:
+            sample_rate = float(os.getenv('TRACING_SAMPLE_RATE', '1.0'))
+        _provider = TracerProvider(
+            sampler=ParentBased(TraceIdRatioBased(sample_rate)),
+            resource=Resource.create({'service.name': os.getenv('OTEL_SERVICE_NAME', 'task-manager')}),
+        )
+        _tracer = _provider.get_tracer('app')
+        # The global provider can only be set once per process; the app's own spans go through tracer
+        if isinstance(trace.get_tracer_provider(), trace.ProxyTracerProvider):
+            trace.set_tracer_provider(_provider)
+    if exporter == 'memory':
+        span_exporter = InMemorySpanExporter()
+        _provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+        return _provider, span_exporter
+    if exporter == 'file':
+        out = open(os.getenv('TRACING_FILE', 'traces.jsonl'), 'a')
+        _files.append(out)
+        span_exporter = ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + '\n')
+    else:
+        span_exporter = ConsoleSpanExporter()
+    _provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    return _provider, span_exporter
+
+def reset_tracing():
+    """Flush and shut down the provider's exporters, close trace files and go back to the no-op tracer"""
+    global _provider, _tracer
+    if _provider is not None:
+        _provider.shutdown()
+    while _files:
+        _files.pop().close()
+    _provider = None
+    _tracer = trace.NoOpTracer()
+
+def tracing_enabled() -> bool:
+    return _provider is not None
+
+def traced_methods(layer: str):
+    """
+    Class decorator wrapping every public method in a span named
+    '<Class>.<method>' tagged with the architectural layer. Generator
+    methods (sync or async) are left alone, their work happens after the call returns.
+    """
+    def decorate(cls):
+        for name, method in list(vars(cls).items()):
+            if (name.startswith('_') or not inspect.isfunction(method) or inspect.isgeneratorfunction(method)
+                    or inspect.isasyncgenfunction(method)):
+                continue
+            setattr(cls, name, _traced(method, f'{cls.__name__}.{name}', layer))
+        return cls
+    return decorate
+
+def _traced(method, span_name, layer):
+    if inspect.iscoroutinefunction(method):
+        # Keep the span open until the awaited work is done, not just until the coroutine is created
+        @functools.wraps(method)
+        async def async_wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(span_name, attributes={'app.layer': layer}):
+                return await method(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with tracer.start_as_current_span(span_name, attributes={'app.layer': layer}):
+            return method(*args, **kwargs)
+    return wrapper
+
+def set_span_attributes(**attributes):
+    """Attach attributes to the current span, if it is being recorded"""
+    span = trace.get_current_span()
+    if span.is_recording():
+        span.set_attributes(attributes)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = tracer.start_span('db.query', attributes={
+        'app.layer': 'db',
+        'db.system': conn.dialect.name,
+        'db.statement': normalize_statement(statement),
+    })
+    conn.info.setdefault('trace_spans', []).append(span)
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get('trace_spans')
+    if spans:
+        spans.pop().end()
+
+def _handle_error(exception_context):
+    spans = exception_context.connection.info.get('trace_spans') if exception_context.connection else None
+    if spans:
+        span = spans.pop()
+        span.record_exception(exception_context.original_exception)
+        span.set_status(trace.StatusCode.ERROR)
+        span.end()
+
+def install_db_tracing(engine):
+    """Record a span per SQL statement, with the statement normalized so parameter values are not exported"""
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(engine, 'handle_error', _handle_error)
\ No newline at end of file
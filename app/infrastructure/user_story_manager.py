@@ -1,7 +1,16 @@
 from app.infrastructure.db import SessionLocal
 from app.infrastructure.models import UserStoryORM
+from app.infrastructure.table_version import bump_table_version
+from app.infrastructure.change_log import record_changes
+from app.infrastructure.tracing import traced_methods
 from app.domain.user_story import UserStory, UserStoryPriority
+from app.infrastructure.bulk import chunks, sparse_row, insert_row, inserted
+from sqlalchemy import insert, select, func
+from sqlalchemy.orm import selectinload
+from app.domain.task import Task
+from typing import Dict, Iterator, List, Tuple
 
+@traced_methods('infrastructure')
 class UserStoryManager:
     def add_user_story(self, user_story: UserStory):
         with SessionLocal() as db:
@@ -17,6 +26,8 @@ class UserStoryManager:
                 effort_hours=float(user_story.effort_hours)
             )
             db.add(db_user_story)
+            bump_table_version(db, UserStoryORM.__tablename__)
+            record_changes(db, 'user_story', 'created', [(user_story.id, inserted([user_story])[0])])
             db.commit()
             db.refresh(db_user_story)
             return UserStory.model_validate(db_user_story.__dict__)
@@ -33,6 +44,9 @@ class UserStoryManager:
                 setattr(db_user_story, "priority", UserStoryPriority(user_story.priority))
                 setattr(db_user_story, "story_points", int(user_story.story_points))
                 setattr(db_user_story, "effort_hours", float(user_story.effort_hours))
+                db_user_story.version = UserStoryORM.version + 1
+                bump_table_version(db, UserStoryORM.__tablename__)
+                record_changes(db, 'user_story', 'updated', [(user_story.id, user_story)])
                 db.commit()
                 db.refresh(db_user_story)
                 return UserStory.model_validate(db_user_story.__dict__)
@@ -43,13 +57,19 @@ class UserStoryManager:
             db_user_story = db.query(UserStoryORM).filter(UserStoryORM.id == user_story_id).first()
             if db_user_story:
                 db.delete(db_user_story)
+                bump_table_version(db, UserStoryORM.__tablename__)
+                record_changes(db, 'user_story', 'deleted', [(user_story_id, None)])
                 db.commit()
                 return True
             return None
 
-    def list_user_stories(self):
+    def list_user_stories(self, limit: int | None = None, offset: int = 0):
+        """List user stories; with a limit, return one page ordered newest first"""
         with SessionLocal() as db:
-            db_user_stories = db.query(UserStoryORM).all()
+            query = db.query(UserStoryORM)
+            if limit is not None:
+                query = query.order_by(UserStoryORM.created_at.desc(), UserStoryORM.id).offset(offset).limit(limit)
+            db_user_stories = query.all()
             return [UserStory.model_validate(db_user_story.__dict__) for db_user_story in db_user_stories]
 
     def get_user_story(self, user_story_id: str) -> UserStory | None:
@@ -57,4 +77,52 @@ class UserStoryManager:
             db_user_story = db.query(UserStoryORM).filter(UserStoryORM.id == user_story_id).first()
             if db_user_story:
                 return UserStory.model_validate(db_user_story.__dict__)
-            return None 
\ No newline at end of file
+            return None
+
+    def add_user_stories(self, user_stories: List[UserStory]) -> List[UserStory]:
+        """Insert user stories with multi-row INSERT statements in bounded-size chunks; returns them as stored"""
+        rows = [insert_row(user_story) for user_story in user_stories]
+        if not rows:
+            return user_stories
+        user_stories = inserted(user_stories)
+        with SessionLocal() as db:
+            for chunk in chunks(rows):
+                db.execute(insert(UserStoryORM), chunk)
+            bump_table_version(db, UserStoryORM.__tablename__)
+            record_changes(db, 'user_story', 'created', [(user_story.id, user_story) for user_story in user_stories])
+            db.commit()
+        return user_stories
+
+    def iter_user_stories(self, batch_size: int = 1000, fields: List[str] | None = None) -> Iterator[UserStory | Dict]:
+        """
+        Stream all user stories using a server-side cursor, fetching batch_size rows at a time.
+        Memory stays constant regardless of table size. When fields is given, only
+        those columns are selected and dicts are yielded instead of UserStories.
+        """
+        columns = [UserStoryORM.__table__.c[field] for field in fields] if fields else UserStoryORM.__table__.columns
+        with SessionLocal() as db:
+            result = db.execute(select(*columns).execution_options(yield_per=batch_size))
+            for row in result.mappings():
+                yield sparse_row(row) if fields else UserStory.model_validate(dict(row))
+
+    def count_user_stories(self) -> int:
+        with SessionLocal() as db:
+            return db.execute(select(func.count(UserStoryORM.id))).scalar_one()
+
+    def get_user_story_with_tasks(self, user_story_id: str) -> Tuple[UserStory, List[Task]] | None:
+        """Load a user story and its tasks in one session, eager-loading tasks with selectinload"""
+        with SessionLocal() as db:
+            db_user_story = db.execute(
+                select(UserStoryORM)
+                .options(selectinload(UserStoryORM.tasks))
+                .where(UserStoryORM.id == user_story_id)
+            ).scalar_one_or_none()
+            if db_user_story is None:
+                return None
+            tasks = []
+            for db_task in db_user_story.tasks:
+                task_dict = db_task.__dict__.copy()
+                task_dict.pop('_sa_instance_state', None)
+                task_dict.pop('user_story', None)
+                tasks.append(Task.model_validate(task_dict))
+            return UserStory.model_validate(db_user_story.__dict__), tasks
@@ -0,0 +1,114 @@
+"""
+Benchmark: sync managers on a thread pool vs async managers on one event loop, at matching concurrency.
+
+For each concurrency level N, the sync side runs TaskManager / UserStoryManager
+calls from N threads and the async side runs AsyncTaskManager /
+AsyncUserStoryManager calls as N concurrent tasks. Both use the same engine
+settings (pool size 5, overflow 10) against the same database.
+
+Usage:
+    python benchmarks/bench_async_db.py [--rows 10000] [--concurrency 1 8 32 64] [--duration 3]
+    DATABASE_URL=mysql+pymysql://.../scratch python benchmarks/bench_async_db.py --wipe-database   # MySQL (aiomysql)
+
+By default it runs against a temporary SQLite file. Seeding DELETES EVERY
+TABLE of the target database, so another DATABASE_URL must point at a
+dedicated scratch database and is only used with --wipe-database.
+
+SQLite serializes writers and aiosqlite runs each connection on its own
+thread, so it understates what the async path gains on a networked MySQL
+server, where the wait is on the wire rather than in-process.
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SCRATCH_DATABASE_URL = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+os.environ.setdefault("DATABASE_URL", SCRATCH_DATABASE_URL)
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://bench.openai.azure.com/")
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "bench-api-key")
+os.environ.setdefault("SLOW_QUERY_MS", "-1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.domain.task import Task
+from app.infrastructure.async_db import get_async_engine
+from app.infrastructure.async_task_manager import AsyncTaskManager
+from app.infrastructure.async_user_story_manager import AsyncUserStoryManager
+from app.infrastructure.db import engine
+from app.infrastructure.task_manager import TaskManager
+from app.infrastructure.user_story_manager import UserStoryManager
+from suite import seed, _task_data, TASKS_PER_STORY
+
+# Shared by every run so add_task never reuses an id
+_counter = itertools.count()
+
+def operations(rows):
+    stories = max(1, rows // TASKS_PER_STORY)
+    new_task = Task.model_validate(_task_data(0))
+    return {
+        'get_task': lambda manager, i: manager['tasks'].get_task(f'task-{(i * 7919) % rows:08d}'),
+        'get_user_story_with_tasks': lambda manager, i: manager['user_stories'].get_user_story_with_tasks(
+            f'story-{(i * 7919) % stories:08d}'),
+        'list_user_stories_page': lambda manager, i: manager['user_stories'].list_user_stories(
+            limit=20, offset=(i * 20) % stories),
+        'add_task': lambda manager, i: manager['tasks'].add_task(new_task.model_copy(update={'id': f'new-{i}'})),
+    }
+
+def run_sync(operation, concurrency, duration):
+    managers = {'tasks': TaskManager(), 'user_stories': UserStoryManager()}
+    deadline = time.perf_counter() + duration
+    done = [0] * concurrency
+
+    def worker(slot):
+        while time.perf_counter() < deadline:
+            operation(managers, next(_counter))
+            done[slot] += 1
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    return sum(done) / duration
+
+async def run_async(operation, concurrency, duration):
+    managers = {'tasks': AsyncTaskManager(), 'user_stories': AsyncUserStoryManager()}
+    deadline = time.perf_counter() + duration
+    done = [0] * concurrency
+
+    async def worker(slot):
+        while time.perf_counter() < deadline:
+            await operation(managers, next(_counter))
+            done[slot] += 1
+
+    await asyncio.gather(*(worker(slot) for slot in range(concurrency)))
+    return sum(done) / duration
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32, 64])
+    parser.add_argument('--duration', type=float, default=3.0, help='seconds per measurement')
+    parser.add_argument('--wipe-database', action='store_true',
+                        help='seed the exported DATABASE_URL, deleting every table in it')
+    args = parser.parse_args()
+    # engine.url, not the environment: importing suite points DATABASE_URL at its own file
+    if engine.url.render_as_string(hide_password=False) != SCRATCH_DATABASE_URL and not args.wipe_database:
+        parser.error(f"seeding deletes every table in {engine.url.render_as_string(hide_password=True)}; "
+                     f"pass --wipe-database if it is a scratch database")
+
+    seed(args.rows, allow_any_database=True)
+    loop = asyncio.new_event_loop()
+    print(f"{'operation':<28} {'concurrency':>11} {'sync ops/s':>11} {'async ops/s':>12} {'async/sync':>11}")
+    for name, operation in operations(args.rows).items():
+        for concurrency in args.concurrency:
+            sync_rate = run_sync(operation, concurrency, args.duration)
+            async_rate = loop.run_until_complete(run_async(operation, concurrency, args.duration))
+            print(f"{name:<28} {concurrency:>11} {sync_rate:>11.0f} {async_rate:>12.0f} {async_rate / sync_rate:>10.2f}x",
+                  flush=True)
+    loop.run_until_complete(get_async_engine().dispose())
+    engine.dispose()
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Benchmark: the local category classifier behind /ai/tasks/categorize.
+
+Seeds a temporary SQLite database with labelled tasks, trains the naive
+Bayes classifier from it and replays a stream of unseen tasks. A request
+the classifier is not confident about counts as an LLM call (assumed to
+return the true category). Reports, per confidence threshold, held-out
+accuracy, the threshold calibrated from it, the share of requests answered
+locally (LLM avoidance), the accuracy of those local answers, and
+prediction, training and incremental refresh times.
+
+Usage:
+    python benchmarks/bench_category_classifier.py [--tasks 5000] [--requests 2000] [--noise 0.3]
+
+Task text mixes words typical of the task's category with words from the
+other categories (--noise is the mixed-in share), like real backlogs where
+"add login form validation" could be frontend or backend work.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Not setdefault: the seeded tasks must never land in a database exported in the shell
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://bench.openai.azure.com/")
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "bench-api-key")
+os.environ.setdefault("SLOW_QUERY_MS", "-1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.category_classifier import CategoryClassifier
+from app.domain.task import Task, Category
+from app.infrastructure.db import engine
+from app.infrastructure.models import Base
+from app.infrastructure.task_manager import TaskManager
+
+VOCABULARY = {
+    Category.FRONTEND: 'button form layout css component page modal render react responsive style dropdown '
+                       'accessibility navbar tooltip theme'.split(),
+    Category.BACKEND: 'endpoint api database query service controller schema migration cache queue handler '
+                      'repository validation auth token'.split(),
+    Category.TESTING: 'test coverage unit integration regression fixture mock assertion e2e suite flaky '
+                      'scenario qa harness'.split(),
+    Category.INFRA: 'deploy pipeline docker kubernetes terraform cluster monitoring alert helm scaling '
+                    'network certificate backup ci'.split(),
+    Category.MOBILE: 'ios android app push notification offline device tablet swift kotlin gesture store '
+                     'biometric screen'.split(),
+}
+COMMON = 'add update fix improve the for and with to of new user flow support handle'.split()
+WEIGHTS = [35, 30, 15, 10, 10]
+
+def labelled_task(rng: random.Random, i: int, noise: float) -> Task:
+    category = rng.choices(list(VOCABULARY), weights=WEIGHTS)[0]
+
+    def words(count):
+        picked = []
+        for _ in range(count):
+            source = category if rng.random() >= noise else rng.choice(list(VOCABULARY))
+            picked.append(rng.choice(VOCABULARY[source] + COMMON))
+        return ' '.join(picked)
+
+    return Task(id=f'task-{i:08d}', title=words(rng.randint(3, 7)).capitalize(),
+                description=f'{words(rng.randint(8, 30)).capitalize()}.', priority='medium',
+                effort_hours=2.0, status='pending', assigned_to='Bench User', category=category)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=5000, help='labelled tasks in the table')
+    parser.add_argument('--requests', type=int, default=2000, help='unseen tasks to categorize')
+    parser.add_argument('--noise', type=float, default=0.3, help='share of words from other categories')
+    parser.add_argument('--thresholds', type=float, nargs='+', default=[0.5, 0.9, 0.99],
+                        help='CATEGORY_CONFIDENCE floors to compare')
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    rng = random.Random(0)
+    manager = TaskManager()
+    manager.add_tasks([labelled_task(rng, i, args.noise) for i in range(args.tasks)])
+    requests = [labelled_task(rng, args.tasks + i, args.noise) for i in range(args.requests)]
+
+    print(f"{'floor':>5} {'threshold':>9} {'holdout acc':>11} {'local acc':>9} {'LLM avoided':>11} {'train ms':>8} {'predict us':>10}")
+    for threshold in args.thresholds:
+        classifier = CategoryClassifier(confidence=threshold, min_training_tasks=0, refresh_interval=3600)
+        start = time.perf_counter()
+        classifier.train()
+        train_ms = (time.perf_counter() - start) * 1000
+        latencies, correct_local = [], 0
+        for task in requests:
+            data = task.model_dump()
+            start = time.perf_counter()
+            prediction = classifier.predict(data)
+            latencies.append(time.perf_counter() - start)
+            if prediction.local:
+                correct_local += prediction.category.value == task.category
+            else:
+                classifier.record_fallback(prediction, task.category)
+        stats = classifier.stats()
+        local_accuracy = correct_local / stats['local_answers'] if stats['local_answers'] else float('nan')
+        calibrated = stats['confidence_threshold']
+        print(f"{threshold:>5.2f} {calibrated if calibrated is not None else float('inf'):>9.3f} "
+              f"{stats['holdout_accuracy']:>11.3f} {local_accuracy:>9.3f} "
+              f"{stats['llm_avoidance_rate']:>11.1%} {train_ms:>8.0f} {statistics.median(latencies) * 1e6:>10.1f}")
+
+    # Incremental refresh after new writes, instead of a full retrain
+    manager.add_tasks(requests[:1000])
+    start = time.perf_counter()
+    classifier.refresh()
+    print(f"refresh after {min(1000, len(requests))} new tasks: {(time.perf_counter() - start) * 1000:.0f} ms "
+          f"({classifier.stats()['trained_tasks']} tasks in the model)")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
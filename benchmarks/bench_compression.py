@@ -0,0 +1,76 @@
+"""
+Benchmark: response size and CPU time per request with and without compression.
+
+Seeds a user story with tasks carrying long risk-analysis text, then requests
+GET /tasks and GET /user-stories/<id>/tasks with identity, gzip and br
+encodings. "cold" clears the compressed-body cache before each request;
+"cached" reuses the body compressed for the same ETag.
+
+Usage:
+    python benchmarks/bench_compression.py [--tasks 200] [--repeat 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from uuid import uuid4
+
+# Not setdefault: the seeded tasks must never land in a database exported in the shell
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://bench.openai.azure.com/")
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "bench-api-key")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.api.compression import ENCODINGS
+from app.domain.task import Task
+from app.domain.user_story import UserStory
+from app.infrastructure.db import engine
+from app.infrastructure.task_manager import TaskManager
+from app.infrastructure.user_story_manager import UserStoryManager
+
+engine.echo = False
+
+def _seed(task_count):
+    story = UserStoryManager().add_user_story(UserStory(
+        id=str(uuid4()), project="Benchmark", rol="developer", goal="measure compression",
+        reason="to size the responses", description="Benchmark user story", priority="medium",
+        story_points=5, effort_hours=20.0))
+    TaskManager().add_tasks([Task(
+        id=str(uuid4()), title=f"Task {i}", description="Implement and test the change " * 10,
+        priority="high", effort_hours=4.0, status="pending", assigned_to="Bench User", category="Backend",
+        user_story_id=story.id,
+        risk_analysis=("Dependency on the payments provider may delay delivery; schema changes need a "
+                       "migration window and rollback plan. ") * 8,
+        risk_mitigation="Stub the provider in tests and schedule the migration early. " * 12
+    ) for i in range(task_count)])
+    return story.id
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_app()
+    client = app.test_client()
+    cache = app.extensions['compression_cache']
+    story_id = _seed(args.tasks)
+
+    print(f"{'path':<32} {'encoding':>9} {'mode':>7} {'bytes':>9} {'cpu ms/req':>11}")
+    for path in ('/tasks', f'/user-stories/{story_id}/tasks'):
+        for encoding in ('identity',) + ENCODINGS:
+            for mode in (('plain',) if encoding == 'identity' else ('cold', 'cached')):
+                size = 0
+                start = time.process_time()
+                for _ in range(args.repeat):
+                    if mode == 'cold':
+                        cache.clear()
+                    size = len(client.get(path, headers={'Accept-Encoding': encoding}).data)
+                cpu = (time.process_time() - start) / args.repeat * 1000
+                label = path if len(path) < 32 else '/user-stories/<id>/tasks'
+                print(f"{label:<32} {encoding:>9} {mode:>7} {size:>9} {cpu:>11.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: the local effort estimator behind /ai/tasks/estimate.
+
+Seeds a temporary SQLite database with historical tasks, trains the ridge
+regression from it and replays a stream of unseen tasks. The database is
+always a temporary file, whatever DATABASE_URL is set to: each noise level
+deletes every task first. An estimate whose
+interval is too wide counts as an LLM call. Reports held-out error and
+interval coverage, the share of requests answered locally (LLM avoidance),
+the error of those local answers against the true effort, and training and
+prediction times.
+
+Usage:
+    python benchmarks/bench_effort_estimator.py [--tasks 10000] [--requests 2000] [--noise 0.2 0.3 0.5 0.7]
+
+Effort is a product of per-category, per-priority, per-assignee and
+per-verb factors times log-normal noise with sigma --noise. At 0.7 the
+noise matches the repo's synthetic data generator, whose effort does not
+depend on the task at all.
+"""
+import argparse
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Not setdefault: every task is deleted between noise levels, never in a database exported in the shell
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://bench.openai.azure.com/")
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "bench-api-key")
+os.environ.setdefault("SLOW_QUERY_MS", "-1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete
+from app.application.effort_estimator import EffortEstimator
+from app.domain.task import Task, Category, Priority
+from app.infrastructure.db import engine
+from app.infrastructure.models import Base, TaskORM
+from app.infrastructure.task_manager import TaskManager
+
+CATEGORY_HOURS = {Category.FRONTEND: 4.0, Category.BACKEND: 6.0, Category.TESTING: 3.0,
+                  Category.INFRA: 8.0, Category.MOBILE: 7.0}
+PRIORITY_FACTOR = {Priority.LOW: 0.8, Priority.MEDIUM: 1.0, Priority.HIGH: 1.2, Priority.BLOCKING: 1.5}
+VERB_FACTOR = {'add': 1.0, 'refactor': 1.6, 'migrate': 2.5, 'validate': 0.7, 'cache': 1.2,
+               'paginate': 0.8, 'document': 0.5, 'monitor': 0.9, 'secure': 1.8, 'test': 0.6}
+NOUNS = ['endpoint', 'form', 'report', 'queue consumer', 'login flow', 'database index', 'dashboard']
+ASSIGNEES = {f'Developer {i}': 0.7 + 0.6 * i / 19 for i in range(20)}
+
+def historical_task(rng: random.Random, i: int, noise: float) -> Task:
+    category = rng.choice(list(CATEGORY_HOURS))
+    priority = rng.choice(list(PRIORITY_FACTOR))
+    verb, noun = rng.choice(list(VERB_FACTOR)), rng.choice(NOUNS)
+    assignee = rng.choice(list(ASSIGNEES))
+    hours = (CATEGORY_HOURS[category] * PRIORITY_FACTOR[priority] * VERB_FACTOR[verb] * ASSIGNEES[assignee]
+             * math.exp(rng.gauss(0, noise)))
+    return Task(id=f'task-{i:08d}', title=f'{verb.capitalize()} {noun}', description=f'{verb} the {noun}.',
+                priority=priority, effort_hours=round(min(80.0, max(0.5, hours)), 1), status='pending',
+                assigned_to=assignee, category=category)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=10000, help='historical tasks in the table')
+    parser.add_argument('--requests', type=int, default=2000, help='unseen tasks to estimate')
+    parser.add_argument('--noise', type=float, nargs='+', default=[0.2, 0.3, 0.5, 0.7])
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    manager = TaskManager()
+    print(f"{'noise':>5} {'holdout MAE h':>13} {'coverage':>8} {'LLM avoided':>11} {'local MAE h':>11} "
+          f"{'train ms':>8} {'predict us':>10}")
+    for noise in args.noise:
+        with engine.begin() as conn:
+            conn.execute(delete(TaskORM))
+        rng = random.Random(0)
+        manager.add_tasks([historical_task(rng, i, noise) for i in range(args.tasks)])
+        requests = [historical_task(rng, args.tasks + i, noise) for i in range(args.requests)]
+
+        estimator = EffortEstimator(min_training_tasks=0, retrain_interval=3600)
+        start = time.perf_counter()
+        estimator.train()
+        train_ms = (time.perf_counter() - start) * 1000
+        latencies, local_errors = [], []
+        for task in requests:
+            data = task.model_dump()
+            start = time.perf_counter()
+            estimate = estimator.predict(data)
+            latencies.append(time.perf_counter() - start)
+            if estimate.local:
+                local_errors.append(abs(estimate.hours - task.effort_hours))
+            else:
+                estimator.record_fallback(estimate, task.effort_hours)
+        stats = estimator.stats()
+        local_mae = statistics.fmean(local_errors) if local_errors else float('nan')
+        print(f"{noise:>5.2f} {stats['holdout']['mae_hours']:>13.2f} {stats['holdout']['interval_coverage']:>8.1%} "
+              f"{stats['llm_avoidance_rate']:>11.1%} {local_mae:>11.2f} {train_ms:>8.0f} "
+              f"{statistics.median(latencies) * 1e6:>10.1f}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
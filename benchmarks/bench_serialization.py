@@ -0,0 +1,61 @@
+"""
+Benchmark: serializing a list of Task models for a JSON response.
+
+Compares the previous route code, jsonify([task.model_dump() for task in tasks])
+through Flask's stdlib JSON provider, with the PydanticJSONProvider path that
+hands the models to pydantic-core directly.
+
+Usage:
+    python benchmarks/bench_serialization.py [--count 10000] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://bench.openai.azure.com/")
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "bench-api-key")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify
+from app.api.json_provider import PydanticJSONProvider
+from app.domain.task import Task
+
+def _tasks(count):
+    return [Task(
+        id=f"{i:08d}-0000-0000-0000-000000000000",
+        title=f"Task {i}",
+        description="Implement the endpoint and cover it with unit tests " * 4,
+        priority="medium",
+        effort_hours=3.5,
+        status="in progress",
+        assigned_to="Bench User",
+        category="Backend",
+        risk_analysis="Integration with the legacy service may surface schema mismatches. " * 6,
+        risk_mitigation="Add contract tests and roll out behind a feature flag. " * 6
+    ) for i in range(count)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tasks = _tasks(args.count)
+    stdlib_app = Flask("stdlib")
+    pydantic_app = Flask("pydantic")
+    pydantic_app.json = PydanticJSONProvider(pydantic_app)
+
+    with stdlib_app.app_context():
+        stdlib = min(timeit.repeat(lambda: jsonify([task.model_dump() for task in tasks]).get_data(),
+                                   number=1, repeat=args.repeat))
+    with pydantic_app.app_context():
+        fast = min(timeit.repeat(lambda: jsonify(tasks).get_data(), number=1, repeat=args.repeat))
+
+    print(f"Serialization of {args.count} tasks (best of {args.repeat}):")
+    print(f"  model_dump + stdlib json: {stdlib * 1000:8.2f} ms")
+    print(f"  pydantic-core dump_json:  {fast * 1000:8.2f} ms  ({stdlib / fast:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: near-duplicate lookups with the MinHash/LSH task index.
+
+Seeds a temporary SQLite database with tasks, builds the index and looks up
+lightly edited copies of existing tasks. Reports
+build, save and load times, the median lookup latency against an exact
+Jaccard scan over all tasks, and the recall and precision of the index at the
+duplicate threshold compared with that scan.
+
+Usage:
+    python benchmarks/bench_similarity_index.py [--tasks 20000] [--queries 500] [--threshold 0.8]
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+directory = tempfile.mkdtemp()
+# Not setdefault: the seeded tasks must never land in a database exported in the shell
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://bench.openai.azure.com/")
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "bench-api-key")
+os.environ.setdefault("SLOW_QUERY_MS", "-1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.domain.task import Task
+from app.infrastructure.db import engine
+from app.infrastructure.models import Base
+from app.infrastructure.task_index import TaskSimilarityIndex
+from app.infrastructure.task_manager import TaskManager
+
+VOCABULARY = ('add fix refactor migrate cache validate paginate document monitor secure the a user order invoice '
+              'report dashboard endpoint form queue database index login session payment export import search '
+              'filter email notification profile settings upload image retry timeout error log metric').split()
+
+def shingles(text):
+    tokens = re.findall(r'[a-z0-9]+', text.lower())
+    return set(tokens) | {f'{a} {b}' for a, b in zip(tokens, tokens[1:])}
+
+def random_task(rng, i):
+    return Task(id=f'task-{i:08d}', title=' '.join(rng.choices(VOCABULARY, k=5)).capitalize(),
+                description=' '.join(rng.choices(VOCABULARY, k=25)).capitalize() + '.', priority='medium',
+                effort_hours=2.0, status='pending', assigned_to='Dev', category='Backend')
+
+def edited_copy(rng, task, i):
+    """The task with one description word replaced, like a regenerated AI task"""
+    description = task.description.split()
+    description[rng.randrange(len(description))] = rng.choice(VOCABULARY)
+    return task.model_copy(update={'id': f'copy-{i:08d}', 'description': ' '.join(description)})
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=20000, help='tasks in the table')
+    parser.add_argument('--queries', type=int, default=500, help='edited copies looked up')
+    parser.add_argument('--threshold', type=float, default=0.8, help='duplicate threshold')
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    rng = random.Random(0)
+    tasks = [random_task(rng, i) for i in range(args.tasks)]
+    TaskManager().add_tasks(tasks)
+    queries = [edited_copy(rng, rng.choice(tasks), i) for i in range(args.queries)]
+
+    path = os.path.join(directory, 'index.npz')
+    index = TaskSimilarityIndex(path=path, refresh_interval=3600)
+    start = time.perf_counter()
+    index.load()  # builds from the table and saves
+    build_s = time.perf_counter() - start
+    start = time.perf_counter()
+    TaskSimilarityIndex(path=path, refresh_interval=3600).load()
+    load_s = time.perf_counter() - start
+
+    # Index lookups and exact scans run in separate passes, so the scans do not evict the index from cache
+    index_latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(index.similar(query, threshold=args.threshold))
+        index_latencies.append(time.perf_counter() - start)
+
+    shingled = {task.id: shingles(f'{task.title} {task.description}') for task in tasks}
+    scan_latencies = []
+    found = expected = correct = returned = 0
+    for query, matches in zip(queries, results):
+        start = time.perf_counter()
+        query_shingles = shingles(f'{query.title} {query.description}')
+        jaccard = {task_id: len(query_shingles & other) / len(query_shingles | other)
+                   for task_id, other in shingled.items()}
+        exact = {task_id for task_id, similarity in jaccard.items() if similarity >= args.threshold}
+        scan_latencies.append(time.perf_counter() - start)
+        ids = {task_id for task_id, _ in matches}
+        found += len(ids & exact)
+        expected += len(exact)
+        returned += len(ids)
+        # Near the threshold the estimate can land on either side, so judge precision at 0.8 of it
+        correct += sum(1 for task_id in ids if jaccard[task_id] >= 0.8 * args.threshold)
+
+    print(f"tasks={args.tasks} build={build_s:.2f}s load={load_s * 1000:.0f}ms "
+          f"file={os.path.getsize(path) / 1e6:.1f}MB")
+    print(f"lookup median: index {statistics.median(index_latencies) * 1e6:.0f}us, "
+          f"exact scan {statistics.median(scan_latencies) * 1e3:.1f}ms")
+    print(f"recall {found / expected if expected else float('nan'):.1%} "
+          f"precision {correct / returned if returned else float('nan'):.1%}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
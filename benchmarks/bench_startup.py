@@ -0,0 +1,73 @@
+"""
+Benchmark: cold-start time of a worker, i.e. importing the app and running create_app().
+
+Each run is a fresh interpreter, so nothing is cached in sys.modules; the OS
+page cache is warm after the first run, as it is for a restarted container.
+With --importtime one more run is made under `python -X importtime` and the
+modules with the largest cumulative import time are listed.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10] [--importtime] [--top 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BOOT = "from app import create_app; create_app(); import sys; print('openai' in sys.modules)"
+
+def _env():
+    return dict(os.environ,
+                DATABASE_URL=os.environ.get("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"),
+                AZURE_OPENAI_ENDPOINT=os.environ.get("AZURE_OPENAI_ENDPOINT", "https://bench.openai.azure.com/"),
+                AZURE_OPENAI_API_KEY=os.environ.get("AZURE_OPENAI_API_KEY", "bench-api-key"))
+
+def boot_times(runs):
+    """Wall time of `runs` fresh interpreters booting the app, and whether the OpenAI SDK got imported"""
+    env = _env()
+    times = []
+    openai_loaded = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", BOOT], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True)
+        times.append(time.perf_counter() - start)
+        openai_loaded = result.stdout.strip().splitlines()[-1] == 'True'
+    return times, openai_loaded
+
+def import_profile(top):
+    """(cumulative_us, self_us, module) for the slowest imports, from -X importtime"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", BOOT], cwd=ROOT, env=_env(),
+                            capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), module.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--importtime", action="store_true", help="also list the slowest imports")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    times, openai_loaded = boot_times(args.runs)
+    times_ms = sorted(t * 1000 for t in times)
+    print(f"create_app() cold start over {args.runs} runs: median {statistics.median(times_ms):.0f} ms, "
+          f"min {times_ms[0]:.0f} ms, max {times_ms[-1]:.0f} ms")
+    print(f"openai imported at boot: {openai_loaded}")
+
+    if args.importtime:
+        print(f"\n{'cumulative ms':>14} {'self ms':>9}  module")
+        for cumulative_us, self_us, module in import_profile(args.top):
+            print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {module}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""
+Benchmark: POST /tasks/batch versus one request per row (POST /tasks, PUT /tasks/<id>).
+
+Usage:
+    python benchmarks/bench_task_batch.py [--sizes 1000 10000]
+
+Runs through the Flask test client, so the numbers measure application +
+database cost without network overhead. Every table is deleted between runs,
+so it always uses a temporary SQLite file, whatever DATABASE_URL is set to.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+_db_file = os.path.join(tempfile.mkdtemp(), "bench.db")
+# Not setdefault: _reset() wipes the database, never one exported in the shell
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_file}"
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://bench.openai.azure.com/")
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "bench-api-key")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.infrastructure.db import engine
+from app.infrastructure.models import Base
+
+def _task(i):
+    return {
+        "title": f"Benchmark task {i}",
+        "description": "Task created by the batch benchmark",
+        "priority": "medium",
+        "effort_hours": 2.0,
+        "status": "pending",
+        "assigned_to": "Bench User",
+        "category": "Backend"
+    }
+
+def _reset():
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+def bench_per_row(client, size):
+    _reset()
+    start = time.perf_counter()
+    ids = []
+    for i in range(size):
+        response = client.post('/tasks', data=json.dumps(_task(i)), content_type='application/json')
+        ids.append(response.get_json()['id'])
+    create_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for task_id in ids:
+        client.put(f'/tasks/{task_id}', data=json.dumps({"status": "completed"}), content_type='application/json')
+    update_time = time.perf_counter() - start
+    return create_time, update_time
+
+def bench_batch(client, size):
+    _reset()
+    start = time.perf_counter()
+    response = client.post('/tasks/batch',
+                           data=json.dumps([{"op": "create", "data": _task(i)} for i in range(size)]),
+                           content_type='application/json')
+    ids = [result['task']['id'] for result in response.get_json()]
+    create_time = time.perf_counter() - start
+    start = time.perf_counter()
+    client.post('/tasks/batch',
+                data=json.dumps([{"op": "update", "id": task_id, "data": {"status": "completed"}} for task_id in ids]),
+                content_type='application/json')
+    update_time = time.perf_counter() - start
+    return create_time, update_time
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    client = create_app().test_client()
+    print(f"{'items':>8} {'mode':>8} {'create s':>10} {'update s':>10} {'items/s':>10}")
+    for size in args.sizes:
+        for mode, bench in (("per-row", bench_per_row), ("batch", bench_batch)):
+            create_time, update_time = bench(client, size)
+            throughput = 2 * size / (create_time + update_time)
+            print(f"{size:>8} {mode:>8} {create_time:>10.3f} {update_time:>10.3f} {throughput:>10.0f}")
+
+if __name__ == "__main__":
+    main()
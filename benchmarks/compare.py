@@ -0,0 +1,55 @@
+"""
+Compare two benchmark result files written by suite.py.
+
+Usage:
+    python benchmarks/compare.py baseline.json current.json [--threshold 0.10] [--metric median_ms]
+
+Prints every benchmark present in both files with its relative change and
+exits with status 1 when any benchmark got slower than the threshold, so it
+can gate CI.
+"""
+import argparse
+import json
+import sys
+
+def compare(baseline, current, threshold, metric):
+    """Return (rows, regressions): rows are (name, before, after, change) for benchmarks in both runs"""
+    rows = []
+    regressions = []
+    for name in sorted(set(baseline) & set(current)):
+        before = baseline[name][metric]
+        after = current[name][metric]
+        change = (after - before) / before if before else 0.0
+        rows.append((name, before, after, change))
+        if change > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=0.10, help='relative slowdown reported as a regression')
+    parser.add_argument('--metric', default='median_ms', choices=['median_ms', 'p95_ms', 'mean_ms'])
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    rows, regressions = compare(baseline['results'], current['results'], args.threshold, args.metric)
+
+    print(f"{baseline['meta'].get('commit')} -> {current['meta'].get('commit')} ({args.metric}, threshold {args.threshold:.0%})")
+    width = max((len(name) for name, *_ in rows), default=10)
+    for name, before, after, change in rows:
+        flag = 'REGRESSION' if name in regressions else ('improved' if change < -args.threshold else '')
+        print(f'{name:<{width}} {before:>10.3f} {after:>10.3f} {change:>+8.1%} {flag}')
+    missing = set(baseline['results']) ^ set(current['results'])
+    if missing:
+        print(f'{len(missing)} benchmarks only present in one file were skipped')
+    if regressions:
+        print(f'{len(regressions)} regressions above {args.threshold:.0%}')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""
+Local stand-in for the OpenAI Responses API, for load tests without spending tokens.
+
+Implements POST /responses (any prefix, any query string) with the shapes
+AIService relies on: plain text output for responses.create, and JSON
+matching the requested UserStory / Tasks schema for responses.parse.
+
+Usage:
+    python benchmarks/fake_openai.py [--port 8400] [--latency lognormal:800:0.5]
+        [--error-rate 0.01] [--input-tokens 200] [--output-tokens 150]
+
+Point the app at it with AZURE_OPENAI_ENDPOINT=http://127.0.0.1:8400/openai/v1.
+
+Latency distributions (milliseconds):
+    fixed:<ms>    uniform:<low>:<high>    normal:<mean>:<stddev>    lognormal:<median>:<sigma>
+"""
+import argparse
+import json
+import math
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uuid import uuid4
+
+CATEGORIES = ['Frontend', 'Backend', 'Testing', 'Infra', 'Mobile']
+
+def parse_latency(spec: str):
+    """Return a function producing a delay in seconds from a '<kind>:<args>' spec"""
+    kind, *args = spec.split(':')
+    args = [float(arg) for arg in args]
+    samplers = {
+        'fixed': lambda: args[0],
+        'uniform': lambda: random.uniform(args[0], args[1]),
+        'normal': lambda: max(0.0, random.gauss(args[0], args[1])),
+        'lognormal': lambda: random.lognormvariate(math.log(args[0]), args[1]),
+    }
+    if kind not in samplers:
+        raise ValueError(f'Unknown latency distribution {kind!r}, expected one of {sorted(samplers)}')
+    return lambda: samplers[kind]() / 1000
+
+def _user_story():
+    return {
+        'id': str(uuid4()),
+        'project': 'Load Test Project',
+        'rol': 'load tester',
+        'goal': 'exercise the user story endpoints',
+        'reason': 'measure the application under load',
+        'description': 'As a load tester, I want to exercise the user story endpoints so that I can measure the application under load.',
+        'priority': random.choice(['low', 'medium', 'high', 'blocking']),
+        'story_points': random.choice([1, 2, 3, 5, 8]),
+        'effort_hours': round(random.uniform(1, 16), 1),
+    }
+
+def _task():
+    return {
+        'id': str(uuid4()),
+        'title': 'Generated load test task',
+        'description': 'Implement and test a slice of the feature',
+        'priority': random.choice(['low', 'medium', 'high', 'blocking']),
+        'effort_hours': round(random.uniform(1, 8), 1),
+        'status': 'pending',
+        'assigned_to': 'Load Tester',
+        'category': random.choice(CATEGORIES),
+        'user_story_id': None,
+        'risk_analysis': 'Synthetic risk analysis',
+        'risk_mitigation': 'Synthetic risk mitigation',
+    }
+
+def output_text(body: dict) -> str:
+    """Text the real model would plausibly return for this request"""
+    text_format = (body.get('text') or {}).get('format') or {}
+    if text_format.get('type') == 'json_schema':
+        properties = (text_format.get('schema') or {}).get('properties', {})
+        if 'tasks' in properties:
+            return json.dumps({'tasks': [_task() for _ in range(random.randint(3, 5))]})
+        return json.dumps(_user_story())
+    system = ' '.join(str(item.get('content', '')) for item in body.get('input', []) if item.get('role') == 'system')
+    if 'categorizer' in system:
+        return random.choice(CATEGORIES)
+    if 'effort estimator' in system:
+        return f'{random.uniform(1, 8):.1f}'
+    return 'Synthetic response generated by the local fake OpenAI server for load testing.'
+
+def response_body(body: dict, input_tokens: int, output_tokens: int) -> dict:
+    return {
+        'id': f'resp_{uuid4().hex}',
+        'object': 'response',
+        'created_at': int(time.time()),
+        'model': body.get('model', 'gpt-4o-mini'),
+        'status': 'completed',
+        'output': [{
+            'type': 'message',
+            'id': f'msg_{uuid4().hex}',
+            'status': 'completed',
+            'role': 'assistant',
+            'content': [{'type': 'output_text', 'text': output_text(body), 'annotations': []}],
+        }],
+        'parallel_tool_calls': True,
+        'tool_choice': 'auto',
+        'tools': [],
+        'usage': {
+            'input_tokens': input_tokens,
+            'input_tokens_details': {'cached_tokens': 0},
+            'output_tokens': output_tokens,
+            'output_tokens_details': {'reasoning_tokens': 0},
+            'total_tokens': input_tokens + output_tokens,
+        },
+    }
+
+def make_handler(latency, error_rate, input_tokens, output_tokens):
+    class FakeOpenAIHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _send(self, status, payload):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            if not self.path.split('?')[0].endswith('/responses'):
+                return self._send(404, {'error': {'message': f'Unknown path {self.path}', 'type': 'invalid_request_error'}})
+            time.sleep(latency())
+            if random.random() < error_rate:
+                status = random.choice([429, 500, 503])
+                return self._send(status, {'error': {'message': 'Injected failure', 'type': 'server_error', 'code': str(status)}})
+            self._send(200, response_body(body, input_tokens, output_tokens))
+
+        def log_message(self, format, *args):
+            pass
+
+    return FakeOpenAIHandler
+
+def serve(port=8400, latency='fixed:0', error_rate=0.0, input_tokens=200, output_tokens=150):
+    server = ThreadingHTTPServer(('127.0.0.1', port),
+                                 make_handler(parse_latency(latency), error_rate, input_tokens, output_tokens))
+    server.daemon_threads = True
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8400)
+    parser.add_argument('--latency', default='lognormal:800:0.5')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--input-tokens', type=int, default=200)
+    parser.add_argument('--output-tokens', type=int, default=150)
+    args = parser.parse_args()
+
+    server = serve(args.port, args.latency, args.error_rate, args.input_tokens, args.output_tokens)
+    print(f'Fake OpenAI listening on http://127.0.0.1:{args.port}', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
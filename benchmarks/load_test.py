@@ -0,0 +1,221 @@
+"""
+End-to-end load test: the app under gunicorn, with OpenAI replaced by the local fake server.
+
+Usage:
+    python benchmarks/load_test.py [--duration 30] [--concurrency 16] [--workers 1]
+        [--latency lognormal:800:0.5] [--error-rate 0.01] [--output load-results.json]
+    python benchmarks/load_test.py --target http://127.0.0.1:5000   # an already running app
+
+Starts benchmarks/fake_openai.py in-process and gunicorn with the Dockerfile's
+command (gunicorn --config gunicorn.conf.py run:app, with --bind, --workers
+and any --gunicorn-arg overriding the config) against a
+temporary SQLite database, then drives a weighted mix of /tasks, /ai/* and
+/user-stories requests from --concurrency keep-alive clients. Reports
+throughput, p50/p95/p99 latency and error rate per endpoint.
+
+The OpenAI client retries 429/5xx responses twice, so injected fake-server
+failures mostly surface as extra latency rather than as errors.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fake_openai import serve as serve_fake_openai
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TASK = {
+    'title': 'Load test task',
+    'description': 'Task created by the load test',
+    'priority': 'medium',
+    'effort_hours': 2.0,
+    'status': 'pending',
+    'assigned_to': 'Load Tester',
+    'category': 'Backend',
+}
+
+# (name, weight, method, path or callable(state) -> path, body or callable(state) -> body)
+SCENARIO = [
+    ('GET /tasks', 30, 'GET', '/tasks', None),
+    ('GET /tasks/<id>', 20, 'GET', lambda state: f"/tasks/{random.choice(state['task_ids'])}", None),
+    ('POST /tasks', 10, 'POST', '/tasks', TASK),
+    ('GET /user-stories', 15, 'GET', '/user-stories', None),
+    ('POST /ai/tasks/categorize', 5, 'POST', '/ai/tasks/categorize', TASK),
+    ('POST /ai/tasks/estimate', 5, 'POST', '/ai/tasks/estimate', TASK),
+    ('POST /ai/user-stories', 5, 'POST', '/ai/user-stories', {'prompt': 'As a user, I want to export my tasks'}),
+    ('POST /ai/user-stories/<id>/generate_tasks', 5, 'POST',
+     lambda state: f"/ai/user-stories/{random.choice(state['user_story_ids'])}/generate_tasks", None),
+]
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+class Client:
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.conn = None
+
+    def request(self, method, path, body=None):
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload is not None else {}
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=120)
+            try:
+                self.conn.request(method, path, body=payload, headers=headers)
+                response = self.conn.getresponse()
+                return response.status, response.read()
+            except (ConnectionError, http.client.HTTPException):
+                # gunicorn closed the keep-alive connection (e.g. a worker restart); reconnect once
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+
+def seed(base_url):
+    """Create the tasks and user stories the read and generate_tasks scenarios pick from"""
+    client = Client(base_url)
+    state = {'task_ids': [], 'user_story_ids': []}
+    for _ in range(20):
+        status, body = client.request('POST', '/tasks', TASK)
+        state['task_ids'].append(json.loads(body)['id'])
+    for _ in range(5):
+        status, body = client.request('POST', '/ai/user-stories', {'prompt': 'As a user, I want to seed data'})
+        if status == 201:
+            state['user_story_ids'].append(json.loads(body)['id'])
+    return state
+
+def run_load(base_url, duration, concurrency, state):
+    names = [entry[0] for entry in SCENARIO]
+    weights = [entry[1] for entry in SCENARIO]
+    by_name = {entry[0]: entry for entry in SCENARIO}
+    samples = {name: [] for name in names}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        client = Client(base_url)
+        local = {name: [] for name in names}
+        while time.perf_counter() < deadline:
+            name = random.choices(names, weights)[0]
+            _, _, method, path, body = by_name[name]
+            if callable(path):
+                if not state['user_story_ids'] and 'user-stories/' in name:
+                    continue
+                path = path(state)
+            start = time.perf_counter()
+            try:
+                status, _ = client.request(method, path, body)
+            except OSError:
+                status = 0
+            local[name].append((time.perf_counter() - start, status))
+        with lock:
+            for name, values in local.items():
+                samples[name].extend(values)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started
+
+def summarize(samples, elapsed):
+    report = {}
+    for name, values in list(samples.items()) + [('TOTAL', [value for values in samples.values() for value in values])]:
+        if not values:
+            continue
+        latencies = sorted(latency * 1000 for latency, _ in values)
+        errors = sum(1 for _, status in values if status == 0 or status >= 500)
+        report[name] = {
+            'requests': len(values),
+            'rps': round(len(values) / elapsed, 1),
+            'p50_ms': round(statistics.median(latencies), 2),
+            'p95_ms': round(percentile(latencies, 0.95), 2),
+            'p99_ms': round(percentile(latencies, 0.99), 2),
+            'error_rate': round(errors / len(values), 4),
+        }
+    return report
+
+def wait_until_up(base_url, process, timeout=30):
+    client = Client(base_url)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError('gunicorn exited during start-up')
+        try:
+            client.request('GET', '/metrics')
+            return
+        except OSError:
+            client.conn = None
+            time.sleep(0.2)
+    raise RuntimeError(f'{base_url} did not come up within {timeout}s')
+
+def start_gunicorn(port, workers, extra_args, fake_url):
+    workdir = tempfile.mkdtemp()
+    env = dict(os.environ,
+               DATABASE_URL=os.environ.get('DATABASE_URL', f"sqlite:///{os.path.join(workdir, 'load.db')}"),
+               AZURE_OPENAI_ENDPOINT=fake_url,
+               AZURE_OPENAI_API_KEY='load-test-key')
+    # Same command as the Dockerfile's CMD, bound to localhost
+    command = ['gunicorn', '--config', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}', '--workers', str(workers), *extra_args, 'run:app']
+    return subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--target', help='base URL of an already running app; skips starting gunicorn')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--gunicorn-arg', action='append', default=[], help='extra gunicorn argument, repeatable')
+    parser.add_argument('--fake-port', type=int, default=8400)
+    parser.add_argument('--latency', default='lognormal:800:0.5', help='fake OpenAI latency distribution')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fake OpenAI failure ratio')
+    parser.add_argument('--input-tokens', type=int, default=200)
+    parser.add_argument('--output-tokens', type=int, default=150)
+    parser.add_argument('--output', help='also write the report as JSON')
+    args = parser.parse_args()
+
+    fake = serve_fake_openai(args.fake_port, args.latency, args.error_rate, args.input_tokens, args.output_tokens)
+    threading.Thread(target=fake.serve_forever, daemon=True).start()
+    process = None
+    base_url = args.target
+    if base_url is None:
+        base_url = f'http://127.0.0.1:{args.port}'
+        process = start_gunicorn(args.port, args.workers, args.gunicorn_arg, f'http://127.0.0.1:{args.fake_port}/openai/v1')
+    try:
+        wait_until_up(base_url, process)
+        state = seed(base_url)
+        samples, elapsed = run_load(base_url, args.duration, args.concurrency, state)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+        fake.shutdown()
+
+    report = summarize(samples, elapsed)
+    print(f"{'endpoint':<45} {'requests':>9} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for name, row in report.items():
+        print(f"{name:<45} {row['requests']:>9} {row['rps']:>8.1f} {row['p50_ms']:>9.1f} "
+              f"{row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['error_rate']:>7.1%}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'config': vars(args), 'results': report}, f, indent=2)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,267 @@
+"""
+Micro-benchmark suite: TaskManager and UserStoryManager operations at several
+table sizes, Task/UserStory validation and dump, Flask route handling through
+the test client, and LogService.log_token_usage as the day's log grows.
+
+Usage:
+    python benchmarks/suite.py [--rows 1000 100000 1000000] [--output results.json]
+    python benchmarks/compare.py baseline.json results.json [--threshold 0.10]
+
+Results are written as JSON (per benchmark: median, p95 and mean latency in ms,
+operations per second and run count) together with the commit they were
+measured on, so two runs can be compared with compare.py.
+
+Always runs against a temporary SQLite file, whatever DATABASE_URL is set
+to: seeding deletes every table. Full-table operations (list, iterate,
+export) are skipped above --max-scan-rows to keep a 1M-row run in minutes
+and in memory; point reads and writes run at every size.
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+_db_file = os.path.join(tempfile.mkdtemp(), "bench.db")
+# Not setdefault: seed() wipes the database, never one exported in the shell
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_file}"
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://bench.openai.azure.com/")
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "bench-api-key")
+os.environ.setdefault("SLOW_QUERY_MS", "-1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from app import create_app
+from app.application.log_service import LogService
+from app.domain.task import Task
+from app.domain.user_story import UserStory
+from app.infrastructure.db import engine
+from app.infrastructure.models import Base, TaskORM, UserStoryORM
+from app.infrastructure.task_manager import TaskManager
+from app.infrastructure.user_story_manager import UserStoryManager
+
+SEED_CHUNK = 10000
+TASKS_PER_STORY = 10
+
+def measure(fn, setup=None, min_time=0.5, min_runs=3, max_runs=2000):
+    """
+    Call fn(i) until min_time has passed (at least min_runs times) and summarize
+    the latencies. setup(i), when given, runs untimed before each call.
+    """
+    latencies = []
+    deadline = time.perf_counter() + min_time
+    while len(latencies) < max_runs and (len(latencies) < min_runs or time.perf_counter() < deadline):
+        if setup is not None:
+            setup(len(latencies))
+        start = time.perf_counter()
+        fn(len(latencies))
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    mean = statistics.fmean(latencies)
+    return {
+        'median_ms': round(statistics.median(latencies) * 1000, 4),
+        'p95_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 4),
+        'mean_ms': round(mean * 1000, 4),
+        'ops_per_s': round(1 / mean, 1) if mean else None,
+        'runs': len(latencies),
+    }
+
+def _task_data(i, user_story_id=None):
+    return {
+        'id': f'task-{i:08d}',
+        'title': f'Benchmark task {i}',
+        'description': 'Implement the endpoint and cover it with unit tests',
+        'priority': 'medium',
+        'effort_hours': 2.0,
+        'status': 'pending',
+        'assigned_to': 'Bench User',
+        'category': 'Backend',
+        'user_story_id': user_story_id,
+        'risk_analysis': 'Integration with the legacy service may surface schema mismatches.',
+        'risk_mitigation': 'Add contract tests and roll out behind a feature flag.',
+    }
+
+def _user_story_data(i):
+    return {
+        'id': f'story-{i:08d}',
+        'project': f'Project {i % 50}',
+        'rol': 'Bench User',
+        'goal': 'measure the application',
+        'reason': 'to catch performance regressions',
+        'description': 'As a bench user, I want to measure the application so that I can catch regressions.',
+        'priority': 'medium',
+        'story_points': 3,
+        'effort_hours': 4.0,
+    }
+
+def seed(rows, allow_any_database=False):
+    """
+    Reset the database to `rows` tasks spread over rows / TASKS_PER_STORY user
+    stories. Every table is deleted first, so only this module's temporary
+    file is seeded unless the caller explicitly allows its own database.
+    """
+    if engine.url.database != _db_file and not allow_any_database:
+        raise SystemExit(f"Refusing to delete every table in {engine.url.render_as_string(hide_password=True)}: "
+                         f"benchmarks seed only their temporary database")
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    stories = max(1, rows // TASKS_PER_STORY)
+    with engine.begin() as conn:
+        for start in range(0, stories, SEED_CHUNK):
+            conn.execute(insert(UserStoryORM), [_user_story_data(i) for i in range(start, min(start + SEED_CHUNK, stories))])
+        for start in range(0, rows, SEED_CHUNK):
+            conn.execute(insert(TaskORM), [
+                _task_data(i, f'story-{i // TASKS_PER_STORY:08d}') for i in range(start, min(start + SEED_CHUNK, rows))
+            ])
+    return stories
+
+def bench_managers(rows, scans, results):
+    stories = seed(rows)
+    tasks = TaskManager()
+    user_stories = UserStoryManager()
+    prefix = f'[rows={rows}]'
+
+    def task_id(i):
+        return f'task-{(i * 7919) % rows:08d}'
+
+    def story_id(i):
+        return f'story-{(i * 7919) % stories:08d}'
+
+    new_task = Task.model_validate(_task_data(0))
+    new_story = UserStory.model_validate(_user_story_data(0))
+    # Reads (and full scans) run first, while the tables still hold exactly the seeded rows
+    cases = {
+        'task_manager.get_task': lambda i: tasks.get_task(task_id(i)),
+        'task_manager.get_task_fields': lambda i: tasks.get_task(task_id(i), fields=['id', 'title', 'status']),
+        'task_manager.get_tasks_100': lambda i: tasks.get_tasks([task_id(i + n) for n in range(100)]),
+        'task_manager.get_tasks_by_user_story': lambda i: tasks.get_tasks_by_user_story(story_id(i)),
+        'task_manager.get_task_stats_by_user_story_20': lambda i: tasks.get_task_stats_by_user_story(
+            [story_id(i + n) for n in range(20)]),
+        'user_story_manager.get_user_story': lambda i: user_stories.get_user_story(story_id(i)),
+        'user_story_manager.get_user_story_with_tasks': lambda i: user_stories.get_user_story_with_tasks(story_id(i)),
+        'user_story_manager.list_user_stories_page': lambda i: user_stories.list_user_stories(limit=20, offset=(i * 20) % stories),
+        'user_story_manager.count_user_stories': lambda i: user_stories.count_user_stories(),
+    }
+    if scans:
+        cases.update({
+            'task_manager.list_tasks': lambda i: tasks.list_tasks(),
+            'task_manager.list_tasks_fields': lambda i: tasks.list_tasks(fields=['id', 'title', 'status']),
+            'task_manager.iter_tasks': lambda i: sum(1 for _ in tasks.iter_tasks()),
+            'user_story_manager.list_user_stories': lambda i: user_stories.list_user_stories(),
+        })
+    cases.update({
+        'task_manager.add_task': lambda i: tasks.add_task(new_task.model_copy(update={'id': f'new-task-{i}'})),
+        'task_manager.update_task': lambda i: tasks.update_task(
+            Task.model_validate(_task_data((i * 7919) % rows, story_id(i)))),
+        'task_manager.add_tasks_1000': lambda i: tasks.add_tasks(
+            [new_task.model_copy(update={'id': f'bulk-{i}-{n}'}) for n in range(1000)]),
+        'task_manager.delete_task': lambda i: tasks.delete_task(f'delete-task-{i}'),
+        'user_story_manager.add_user_story': lambda i: user_stories.add_user_story(
+            new_story.model_copy(update={'id': f'new-story-{i}'})),
+        'user_story_manager.update_user_story': lambda i: user_stories.update_user_story(
+            UserStory.model_validate(_user_story_data((i * 7919) % stories))),
+        'user_story_manager.delete_user_story': lambda i: user_stories.delete_user_story(f'delete-story-{i}'),
+    })
+    # Each delete removes a row its own untimed setup created
+    setups = {
+        'task_manager.delete_task': lambda i: tasks.add_task(new_task.model_copy(update={'id': f'delete-task-{i}'})),
+        'user_story_manager.delete_user_story': lambda i: user_stories.add_user_story(
+            new_story.model_copy(update={'id': f'delete-story-{i}'})),
+    }
+    for name, fn in cases.items():
+        results[f'{name}{prefix}'] = measure(fn, setups.get(name))
+        print(f'{name}{prefix}: {results[f"{name}{prefix}"]["median_ms"]} ms', flush=True)
+
+def bench_models(results):
+    task_data = _task_data(1, 'story-1')
+    story_data = _user_story_data(1)
+    task = Task.model_validate(task_data)
+    story = UserStory.model_validate(story_data)
+    cases = {
+        'task.validate': lambda i: Task.model_validate(task_data),
+        'task.dump': lambda i: task.model_dump(),
+        'task.dump_json': lambda i: task.model_dump_json(),
+        'user_story.validate': lambda i: UserStory.model_validate(story_data),
+        'user_story.dump': lambda i: story.model_dump(),
+        'user_story.dump_json': lambda i: story.model_dump_json(),
+    }
+    for name, fn in cases.items():
+        results[name] = measure(fn)
+
+def bench_routes(rows, scans, results):
+    seed(rows)
+    client = create_app().test_client()
+    prefix = f'[rows={rows}]'
+    body = json.dumps({key: value for key, value in _task_data(0).items() if key != 'id'})
+    # Reads and scans first, before create_task grows the tasks table
+    cases = {
+        'route.get_task': lambda i: client.get(f'/tasks/task-{(i * 7919) % rows:08d}'),
+        'route.user_stories_page': lambda i: client.get('/user-stories'),
+        'route.user_story_tasks_page': lambda i: client.get(f'/user-stories/story-{i % max(1, rows // TASKS_PER_STORY):08d}/tasks'),
+    }
+    if scans:
+        cases['route.list_tasks'] = lambda i: client.get('/tasks')
+        cases['route.export_tasks'] = lambda i: client.get('/tasks/export').data
+    cases['route.create_task'] = lambda i: client.post('/tasks', data=body, content_type='application/json')
+    for name, fn in cases.items():
+        results[f'{name}{prefix}'] = measure(fn)
+        print(f'{name}{prefix}: {results[f"{name}{prefix}"]["median_ms"]} ms', flush=True)
+
+def bench_log_service(sizes, results):
+    for size in sizes:
+        log_service = LogService(log_dir=tempfile.mkdtemp())
+        entry = {'timestamp': datetime.now().isoformat(), 'endpoint': '/ai/user-stories', 'input_tokens_used': 100,
+                 'output_tokens_used': 50, 'total_tokens_used': 150, 'model': 'gpt-4o-mini'}
+        with open(log_service._get_daily_log_file(), 'w') as f:
+            json.dump([entry] * size, f, indent=2)
+        # Each call appends one entry, so keep the run count small relative to the prefilled size
+        results[f'log_service.log_token_usage[entries={size}]'] = measure(
+            lambda i: log_service.log_token_usage('/ai/user-stories', 100, 50, 'gpt-4o-mini'),
+            max_runs=max(3, size // 10))
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 100000, 1000000])
+    parser.add_argument('--max-scan-rows', type=int, default=100000)
+    parser.add_argument('--log-entries', type=int, nargs='+', default=[0, 1000, 10000])
+    parser.add_argument('--output', default='benchmark-results.json')
+    args = parser.parse_args()
+
+    results = {}
+    bench_models(results)
+    bench_log_service(args.log_entries, results)
+    for rows in args.rows:
+        bench_managers(rows, rows <= args.max_scan_rows, results)
+        bench_routes(rows, rows <= args.max_scan_rows, results)
+
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'rows': args.rows,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'Wrote {len(results)} results to {args.output}')
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,188 @@
+# gunicorn.conf.py
+"""
+Production gunicorn settings, read with `gunicorn --config gunicorn.conf.py run:app`.
+
+The AI endpoints spend seconds waiting on Azure OpenAI, so workers are
+threaded (gthread) by default: one process per core keeps CPU-bound work
+parallel and the threads keep many slow calls in flight. GUNICORN_WORKER_CLASS=gevent
+switches to greenlets when gevent is installed. Every default can be
+overridden with a GUNICORN_* environment variable.
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+# Resident memory of one worker after warmup, used to cap the worker count
+WORKER_MEMORY_MB = int(os.getenv('GUNICORN_WORKER_MEMORY_MB', '200'))
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def available_cpus() -> float:
+    """CPUs this container may use: the cgroup quota when set, otherwise the scheduler affinity"""
+    quota = _read('/sys/fs/cgroup/cpu.max')  # cgroup v2: "<quota> <period>" or "max <period>"
+    if quota and not quota.startswith('max'):
+        limit, period = quota.split()
+        return int(limit) / int(period)
+    limit, period = _read('/sys/fs/cgroup/cpu/cpu.cfs_quota_us'), _read('/sys/fs/cgroup/cpu/cpu.cfs_period_us')
+    if limit and period and int(limit) > 0:
+        return int(limit) / int(period)
+    return float(len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1)
+
+def available_memory_mb() -> int:
+    """Memory this container may use: the cgroup limit when set, otherwise physical memory"""
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        limit = _read(path)
+        # cgroup v1 reports "unlimited" as a huge number rather than "max"
+        if limit and limit != 'max' and int(limit) < 1 << 60:
+            return int(limit) // (1024 * 1024)
+    return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)
+
+def default_workers(cpus: float, memory_mb: int, worker_class: str) -> int:
+    """
+    One worker per CPU plus one for threaded and async workers (threads
+    cover I/O waits), 2 * CPU + 1 for sync workers, and never more than
+    fit in memory next to the master.
+    """
+    by_cpu = int(cpus) + 1 if worker_class in ('gthread', 'gevent') else 2 * int(cpus) + 1
+    by_memory = (memory_mb - WORKER_MEMORY_MB) // WORKER_MEMORY_MB
+    return max(1, min(by_cpu, by_memory))
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.getenv('GUNICORN_WORKERS') or default_workers(available_cpus(), available_memory_mb(), worker_class))
+# Threads per gthread worker: each one can wait on an AI call
+threads = int(os.getenv('GUNICORN_THREADS', '16'))
+# Concurrent greenlets per gevent worker
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '1000'))
+
+# AI calls can take tens of seconds, well over gunicorn's 30 s default
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+# Recycle workers to cap slow memory growth; the jitter keeps them from restarting together
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '2000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '200'))
+
+# Import the app once in the master so workers fork with it already loaded (copy-on-write)
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() in ('1', 'true', 'yes')
+# Heartbeat files on tmpfs: a disk-backed /tmp can stall workers into timeouts in containers
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# Workers write their Prometheus metrics to files here, so /metrics aggregates every worker.
+# Set before the app (and with it prometheus_client) is loaded; on_starting empties it
+default_metrics_dir = None
+if not os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+    default_metrics_dir = os.path.join(worker_tmp_dir or tempfile.gettempdir(), f'prometheus-{os.getpid()}')
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = default_metrics_dir
+
+accesslog = os.getenv('GUNICORN_ACCESSLOG')
+loglevel = os.getenv('GUNICORN_LOGLEVEL', 'info')
+
+def ai_prewarm_enabled() -> bool:
+    return os.getenv('AI_PREWARM', 'true').lower() in ('1', 'true', 'yes')
+
+def on_starting(server):
+    """Start with an empty Prometheus multiprocess directory, stale files would double count"""
+    directory = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+    server.log.info('workers=%s worker_class=%s threads=%s preload=%s', server.cfg.workers,
+                    server.cfg.worker_class_str, server.cfg.threads, server.cfg.preload_app)
+
+def on_exit(server):
+    """Remove the Prometheus directory this config created"""
+    if default_metrics_dir:
+        shutil.rmtree(default_metrics_dir, ignore_errors=True)
+
+def warm_models(log):
+    """
+    Train the local category and effort models from the tasks table and load
+    the task similarity index. Each step fails on its own: the others still
+    run, and the failed one trains or loads on first use instead.
+    """
+    from app.api.ai_routes import category_classifier, effort_estimator
+    from app.infrastructure.task_index import task_index
+    for name, step in (('category classifier', category_classifier.train),
+                       ('effort estimator', effort_estimator.train),
+                       ('task similarity index', task_index.load)):
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            log.exception('Warming up the %s failed', name)
+        else:
+            log.info('Warmed up the %s in %.1f s', name, time.perf_counter() - start)
+
+def when_ready(server):
+    """
+    With preload_app, warm the models once in the master before any worker
+    forks: workers inherit them (copy-on-write), and no booting worker spends
+    its timeout training. post_fork drops the DB connections this opened.
+    The OpenAI SDK is imported here too when workers will prewarm their AI
+    connections, so they only open connections instead of each importing it.
+    """
+    if server.cfg.preload_app:
+        warm_models(server.log)
+        if ai_prewarm_enabled():
+            from app.api.ai_clients import import_ai_sdk
+            start = time.perf_counter()
+            try:
+                import_ai_sdk()
+            except Exception:
+                server.log.exception('Importing the OpenAI SDK failed')
+            else:
+                server.log.info('Imported the OpenAI SDK in %.1f s', time.perf_counter() - start)
+
+def post_fork(server, worker):
+    """
+    Drop the pooled DB connections inherited from the master without closing
+    them: the sockets are shared with the parent, so each worker opens its own.
+    """
+    from app.infrastructure.db import engine
+    engine.dispose(close=False)
+
+def post_worker_init(worker):
+    """
+    Warm up before taking traffic: open the worker's first DB and Azure OpenAI
+    connections. Without preload_app the models were not warmed in the master;
+    they warm in a background thread, so the worker serves (and heartbeats)
+    meanwhile.
+    """
+    from sqlalchemy import text
+    from app.infrastructure.db import engine
+    from app.api.ai_clients import prewarm_ai_clients
+    try:
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+    except Exception:
+        worker.log.exception('Opening the first DB connection failed')
+    if ai_prewarm_enabled():
+        try:
+            worker.log.info('Prewarmed %d AI client connection(s)', prewarm_ai_clients())
+        except Exception:
+            worker.log.exception('Prewarming the AI client connections failed')
+    if not worker.cfg.preload_app:
+        threading.Thread(target=warm_models, args=(worker.log,), name='warmup', daemon=True).start()
+
+def worker_exit(server, worker):
+    """Save the task similarity index, so the next worker only replays newer changes"""
+    from app.infrastructure.task_index import task_index
+    try:
+        task_index.save(only_if_changed=True)
+    except Exception:
+        worker.log.exception('Saving the task similarity index failed')
+
+def child_exit(server, worker):
+    """Let Prometheus drop the live gauges of a worker that exited"""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
\ No newline at end of file
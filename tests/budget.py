@@ -0,0 +1,52 @@
+import tracemalloc
+from sqlalchemy import event
+from app.infrastructure.db import engine
+
+class budget:
+    """
+    Assert that the enclosed block issues at most `queries` SQL statements and
+    its allocations peak at most `memory` bytes above the starting point.
+
+        with budget(queries=1, memory=256 * 1024):
+            manager.list_tasks()
+
+    Bulk executemany calls count as one statement. Either limit may be None.
+    """
+    def __init__(self, queries: int | None = None, memory: int | None = None):
+        self.max_queries = queries
+        self.max_memory = memory
+        self.statements = []
+        self.peak_memory = 0
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(engine, 'before_cursor_execute', self._count)
+        if self.max_memory is not None:
+            self._started_tracemalloc = not tracemalloc.is_tracing()
+            if self._started_tracemalloc:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._memory_start, _ = tracemalloc.get_traced_memory()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        event.remove(engine, 'before_cursor_execute', self._count)
+        if self.max_memory is not None:
+            _, peak = tracemalloc.get_traced_memory()
+            self.peak_memory = peak - self._memory_start
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+        if exc_type is not None:
+            return False
+        if self.max_queries is not None and len(self.statements) > self.max_queries:
+            listing = '\n'.join(f'  {statement}' for statement in self.statements)
+            raise AssertionError(
+                f'Query budget exceeded: {len(self.statements)} statements, budget {self.max_queries}:\n{listing}'
+            )
+        if self.max_memory is not None and self.peak_memory > self.max_memory:
+            raise AssertionError(
+                f'Memory budget exceeded: peak {self.peak_memory} bytes allocated, budget {self.max_memory}'
+            )
+        return False
\ No newline at end of file
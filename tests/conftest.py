@@ -7,13 +7,42 @@ from unittest.mock import Mock, patch, MagicMock
 os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
 os.environ['AZURE_OPENAI_ENDPOINT'] = 'https://test.openai.azure.com/'
 os.environ['AZURE_OPENAI_API_KEY'] = 'test-api-key'
+# Tests build the similarity index from their own tasks, never from a saved file
+os.environ['SIMILARITY_INDEX_PATH'] = ''
+# Writes would otherwise prune the shared in-memory database from a background thread
+os.environ['CHANGE_LOG_PRUNE_INTERVAL'] = '0'
 
 from app import create_app
 from app.domain.task import Task, Priority, Status, Category
 from app.domain.user_story import UserStory, UserStoryPriority
 from app.infrastructure.models import Base
 from app.infrastructure.db import engine, SessionLocal
+from app.infrastructure.task_index import task_index
 from uuid import uuid4
+from tests.budget import budget
+
+# Every manager and route test runs under these budgets unless it declares its
+# own with @pytest.mark.budget(queries=..., memory=...)
+BUDGETED_MODULES = ('test_infrastructure', 'test_task_api', 'test_user_story_api')
+DEFAULT_QUERY_BUDGET = 30
+DEFAULT_MEMORY_BUDGET = 1024 * 1024
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "budget(queries=None, memory=None): SQL statement and allocated-bytes budget for the test body"
+    )
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Fail budgeted tests whose body exceeds its SQL statement or allocation budget"""
+    if item.module.__name__.rpartition('.')[2] not in BUDGETED_MODULES:
+        return (yield)
+    marker = item.get_closest_marker('budget')
+    limits = {'queries': DEFAULT_QUERY_BUDGET, 'memory': DEFAULT_MEMORY_BUDGET}
+    if marker is not None:
+        limits.update(marker.kwargs)
+    with budget(**limits):
+        return (yield)
 
 @pytest.fixture(scope="function")
 def app():
@@ -44,6 +73,7 @@ def clean_database():
     with engine.begin() as conn:
         for table in reversed(Base.metadata.sorted_tables):
             conn.execute(table.delete())
+    task_index.clear()
     
     yield
     
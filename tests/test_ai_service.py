@@ -1,7 +1,15 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import threading
 import json
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-from app.application.ai_service import AIService
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
+from app.application.ai_service import AIService, AsyncAIService
+from app.infrastructure.ai_clients import AIClientRegistry
+from app.infrastructure.event_loop import event_loop
 from app.domain.user_story import UserStory, UserStoryPriority
 from app.domain.task import Task, Priority, Status, Category
 
@@ -11,7 +19,7 @@ class TestAIService:
     @pytest.fixture
     def ai_service(self):
         """Create AI service instance for testing."""
-        with patch('app.application.ai_service.OpenAI') as mock_openai:
+        with patch('app.application.ai_service._openai_client') as mock_openai:
             mock_client = Mock()
             mock_openai.return_value = mock_client
 
@@ -283,7 +291,7 @@ class TestAIService:
 
     def test_ai_service_initialization(self):
         """Test AI service initialization with different parameters."""
-        with patch('app.application.ai_service.OpenAI') as mock_openai:
+        with patch('app.application.ai_service._openai_client') as mock_openai:
             mock_client = Mock()
             mock_openai.return_value = mock_client
             
@@ -297,7 +305,7 @@ class TestAIService:
 
     def test_ai_service_missing_parameters(self):
         """Test AI service initialization with missing parameters."""
-        with patch('app.application.ai_service.OpenAI') as mock_openai:
+        with patch('app.application.ai_service._openai_client') as mock_openai:
             mock_client = Mock()
             mock_openai.return_value = mock_client
             
@@ -404,4 +412,147 @@ class TestAIService:
                 assert isinstance(result, list)
                 assert len(result) == 2
                 assert isinstance(result[0], Task)
-                assert result[0].priority == Priority.MEDIUM 
\ No newline at end of file
+                assert result[0].priority == Priority.MEDIUM 
+
+    def test_openai_client_created_on_first_use(self):
+        """Test that the OpenAI client is only built when first needed."""
+        with patch('app.application.ai_service._openai_client') as mock_openai:
+            ai_service = AIService(
+                azure_endpoint="https://test.openai.azure.com/",
+                azure_api_key="test-api-key"
+            )
+            mock_openai.assert_not_called()
+            client = ai_service.clientOpenai
+            assert ai_service.clientOpenai is client
+            mock_openai.assert_called_once_with(
+                base_url="https://test.openai.azure.com/",
+                api_key="test-api-key",
+                default_query={"api-version": "preview"}
+            )
+
+    def test_create_app_does_not_import_openai(self):
+        """Test that booting the app leaves the OpenAI SDK unimported."""
+        result = subprocess.run(
+            [sys.executable, '-c', "from app import create_app; create_app(); import sys; print('openai' in sys.modules)"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            env=dict(os.environ), capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip().splitlines()[-1] == 'False'
+
+class TestAsyncAIService:
+    """Test suite for the AsyncOpenAI-backed AI service and the async AI routes."""
+
+    @pytest.fixture
+    def async_ai_service(self):
+        with patch('app.application.ai_service._async_openai_client') as mock_async_openai:
+            mock_async_openai.return_value = Mock(responses=Mock(create=AsyncMock(), parse=AsyncMock()))
+            service = AsyncAIService(
+                azure_endpoint="https://test.openai.azure.com/",
+                azure_api_key="test-api-key",
+                log_service=Mock()
+            )
+            yield service
+
+    def test_hung_call_is_cancelled_after_timeout(self):
+        """Test that event_loop.run raises TimeoutError and cancels the task left on the loop."""
+        cancelled = threading.Event()
+
+        async def hang():
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(TimeoutError):
+            event_loop.run(hang(), timeout=0.05)
+        assert cancelled.wait(1)
+        assert event_loop.run(asyncio.sleep(0, 'still running')) == 'still running'
+
+    def test_calls_run_concurrently(self, async_ai_service):
+        """Test that awaited AI calls overlap on one event loop and parse like the sync service."""
+        async def slow_create(**kwargs):
+            await asyncio.sleep(0.2)
+            return Mock(output_text=" Frontend ", usage=Mock(input_tokens=10, output_tokens=1))
+        async_ai_service.clientOpenai.responses.create.side_effect = slow_create
+        task_data = {'title': 'Build login form', 'description': 'Form with validation', 'priority': 'high',
+                     'effort_hours': 3.0, 'status': 'pending', 'assigned_to': 'Dev'}
+
+        async def categorize_many():
+            return await asyncio.gather(*(async_ai_service.generate_task_category(task_data) for _ in range(20)))
+
+        start = time.perf_counter()
+        categories = event_loop.run(categorize_many())
+
+        assert categories == [Category.FRONTEND.value] * 20
+        assert time.perf_counter() - start < 2.0
+        assert async_ai_service.log_service.log_token_usage.call_count == 20
+
+    def test_async_route_creates_task(self, client, sample_task_data):
+        """Test that an async AI route awaits the service and stores the task."""
+        from app.api.ai_routes import ai_service
+        response_mock = Mock(output_text="7.5", usage=Mock(input_tokens=10, output_tokens=2))
+        with patch.object(ai_service.clientOpenai.responses, 'create', return_value=response_mock), \
+                patch.object(ai_service.log_service, 'log_token_usage'):
+            response = client.post('/ai/tasks/estimate', data=json.dumps(sample_task_data),
+                                   content_type='application/json')
+
+        assert response.status_code == 201
+        task = json.loads(response.data)
+        assert task['effort_hours'] == 7.5
+        assert client.get(f"/tasks/{task['id']}").status_code == 200
+
+class TestAIClientRegistry:
+    """Test suite for the shared OpenAI client registry."""
+
+    def test_blueprints_share_one_client(self, app):
+        """Test that the AI services of both blueprints use the app's shared client."""
+        from app.api import ai_routes, user_story_routes
+        from app.infrastructure.ai_clients import ai_clients
+
+        assert app.extensions['ai_clients'] is ai_clients
+        assert ai_routes.ai_service.clientOpenai is user_story_routes.ai_service.clientOpenai
+
+    def test_clients_use_configured_pool(self):
+        """Test that clients are built once per endpoint with the configured pool limits."""
+        import openai
+        registry = AIClientRegistry()
+        registry.configure(max_connections=7, max_keepalive_connections=3, keepalive_expiry=30.0)
+        kwargs = dict(base_url="https://test.openai.azure.com/", api_key="test-api-key")
+        with patch('openai.DefaultHttpxClient', wraps=openai.DefaultHttpxClient) as http_client:
+            client = registry.openai(**kwargs)
+            assert registry.openai(**kwargs) is client
+
+        http_client.assert_called_once()
+        limits = http_client.call_args.kwargs['limits']
+        assert (limits.max_connections, limits.max_keepalive_connections, limits.keepalive_expiry) == (7, 3, 30.0)
+        assert registry.async_openai(**kwargs) is not client
+
+    def test_prewarm_opens_a_connection_per_client(self):
+        """Test that prewarm reaches every client's endpoint and only logs unreachable ones."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        import threading
+        requests = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_HEAD(self):
+                requests.append(self.path)
+                self.send_response(404)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            registry = AIClientRegistry()
+            registry.openai(base_url=f"http://127.0.0.1:{server.server_port}/openai/", api_key="key")
+            registry.async_openai(base_url=f"http://127.0.0.1:{server.server_port}/openai/", api_key="key")
+            assert registry.prewarm() == 2
+            assert requests == ['/openai/', '/openai/']
+
+            registry.openai(base_url="http://127.0.0.1:9/", api_key="key")
+            assert registry.prewarm(timeout=1.0) == 2
+        finally:
+            server.shutdown()
\ No newline at end of file
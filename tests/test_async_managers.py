@@ -0,0 +1,85 @@
+import pytest
+from uuid import uuid4
+from app.domain.task import Task, Status
+from app.domain.user_story import UserStory
+from app.infrastructure.async_db import async_database_url, get_async_engine
+from app.infrastructure.async_task_manager import AsyncTaskManager
+from app.infrastructure.async_user_story_manager import AsyncUserStoryManager
+from app.infrastructure.event_loop import event_loop
+from app.infrastructure.models import Base
+from app.infrastructure.table_version import VersionConflict
+
+@pytest.fixture
+def run():
+    """Create the schema on the async engine's database, run coroutines on the shared loop, then empty it."""
+    async def reset(create):
+        async with get_async_engine().begin() as conn:
+            if create:
+                await conn.run_sync(Base.metadata.create_all)
+            for table in reversed(Base.metadata.sorted_tables):
+                await conn.execute(table.delete())
+
+    event_loop.run(reset(True))
+    yield event_loop.run
+    event_loop.run(reset(False))
+
+class TestAsyncManagers:
+    """Test suite for the AsyncSession managers."""
+
+    def test_async_database_url(self):
+        """Test that sync URLs map to their async drivers."""
+        url, connect_args = async_database_url('mysql+pymysql://user:pw@db.mysql.database.azure.com/app')
+        assert url.drivername == 'mysql+aiomysql'
+        assert connect_args == {}
+        url, _ = async_database_url('sqlite:///:memory:')
+        assert url.drivername == 'sqlite+aiosqlite'
+        with pytest.raises(ValueError):
+            async_database_url('postgresql://localhost/app')
+
+    def test_task_crud_and_batches(self, run, sample_task):
+        """Test single and batch task operations through AsyncTaskManager."""
+        manager = AsyncTaskManager()
+        created = run(manager.add_task(sample_task))
+        assert created.id == sample_task.id
+
+        updated = run(manager.update_task(sample_task.model_copy(update={'status': Status.COMPLETED})))
+        assert updated.status == Status.COMPLETED
+        # Conditional writes only apply over the expected row version
+        with pytest.raises(VersionConflict):
+            run(manager.update_task(sample_task, expected_version=updated.version - 1))
+        with pytest.raises(VersionConflict):
+            run(manager.delete_task(sample_task.id, expected_version=updated.version - 1))
+        assert run(manager.get_task(sample_task.id, fields=['id', 'status'])) == {'id': sample_task.id, 'status': 'completed'}
+
+        more = [sample_task.model_copy(update={'id': str(uuid4())}) for _ in range(3)]
+        assert [task.version for task in run(manager.add_tasks(more))] == [1, 1, 1]
+        assert set(run(manager.get_tasks([task.id for task in more]))) == {task.id for task in more}
+        # Only rows the UPDATE matched are returned, with their new versions
+        renamed = run(manager.update_tasks([more[0].model_copy(update={'title': 'Renamed'}),
+                                            more[0].model_copy(update={'id': 'missing'})]))
+        assert [(task.id, task.version) for task in renamed] == [(more[0].id, 2)]
+        assert len(run(manager.list_tasks())) == 4
+
+        async def collect():
+            return [task async for task in manager.iter_tasks(batch_size=2)]
+        assert len(run(collect())) == 4
+
+        assert run(manager.delete_tasks([more[0].id, 'missing'])) == {more[0].id}
+        assert run(manager.delete_task(sample_task.id)) is True
+        assert run(manager.get_task(sample_task.id)) is None
+
+    def test_user_stories_pages_and_tasks(self, run, sample_user_story, sample_task):
+        """Test paginated listing, counting and eager-loaded tasks through AsyncUserStoryManager."""
+        manager = AsyncUserStoryManager()
+        stories = [sample_user_story.model_copy(update={'id': str(uuid4())}) for _ in range(5)]
+        run(manager.add_user_story(stories[0]))
+        run(manager.add_user_stories(stories[1:]))
+        run(AsyncTaskManager().add_task(sample_task.model_copy(update={'user_story_id': stories[0].id})))
+
+        assert run(manager.count_user_stories()) == 5
+        assert len(run(manager.list_user_stories(limit=2, offset=4))) == 1
+        user_story, tasks = run(manager.get_user_story_with_tasks(stories[0].id))
+        assert user_story.id == stories[0].id
+        assert [task.user_story_id for task in tasks] == [stories[0].id]
+        stats = run(AsyncTaskManager().get_task_stats_by_user_story([stories[0].id]))
+        assert stats[stories[0].id]['total'] == 1
\ No newline at end of file
@@ -0,0 +1,134 @@
+import json
+import random
+import threading
+import pytest
+from unittest.mock import Mock, patch
+from app.application.ai_service import AIService
+from app.application.category_classifier import CategoryClassifier
+from app.domain.task import Task, Category
+from app.infrastructure.task_manager import TaskManager
+
+WORDS = {
+    Category.FRONTEND: 'button form layout css component page modal render responsive style'.split(),
+    Category.BACKEND: 'endpoint api database query service schema migration cache queue handler'.split(),
+}
+
+def labelled_tasks(count, seed=0, informative=True):
+    """Frontend and backend tasks whose text gives away the category (or, if not informative, does not)"""
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(count):
+        category = rng.choice(list(WORDS))
+        source = category if informative else rng.choice(list(WORDS))
+        tasks.append(Task(
+            id=f'{seed}-{i}', title=' '.join(rng.choices(WORDS[source], k=4)).capitalize(),
+            description=' '.join(rng.choices(WORDS[source], k=12)).capitalize() + '.',
+            priority='medium', effort_hours=2.0, status='pending', assigned_to='Dev', category=category,
+        ))
+    return tasks
+
+@pytest.fixture
+def classifier(app):
+    return CategoryClassifier(confidence=0.5, min_accuracy=0.9, min_training_tasks=50, refresh_interval=3600)
+
+class TestCategoryClassifier:
+    """Test suite for the local category classifier."""
+
+    def test_answers_locally_when_confident(self, classifier):
+        """Test that a model trained on informative tasks answers unseen ones without the LLM."""
+        TaskManager().add_tasks(labelled_tasks(300))
+        classifier.train()
+
+        prediction = classifier.predict({'title': 'Responsive modal', 'description': 'Style the page layout with css.'})
+        assert prediction.local
+        assert prediction.category == Category.FRONTEND
+        stats = classifier.stats()
+        assert stats['trained_tasks'] == 300
+        assert stats['holdout_accuracy'] >= 0.9
+        assert stats['local_answers'] == 1
+
+    def test_defers_when_text_is_not_informative(self, classifier):
+        """Test that calibration sends everything to the LLM when text does not predict the category."""
+        TaskManager().add_tasks(labelled_tasks(300, informative=False))
+        classifier.train()
+
+        assert classifier.stats()['confidence_threshold'] is None
+        assert not classifier.predict({'title': 'Cache endpoint', 'description': 'Add a database query cache.'}).local
+
+    def test_predict_does_not_wait_for_a_running_refresh(self, classifier):
+        """Test that while one caller refreshes from the change log, others answer with the current model."""
+        TaskManager().add_tasks(labelled_tasks(300))
+        classifier.train()
+        classifier.refresh_interval = 0
+        query = {'title': 'Responsive modal', 'description': 'Style the page layout with css.'}
+        reading, release = threading.Event(), threading.Event()
+        ids_since = classifier.change_log.ids_since
+
+        def slow_ids_since(*args, **kwargs):
+            reading.set()
+            release.wait(5)
+            return ids_since(*args, **kwargs)
+
+        with patch.object(classifier.change_log, 'ids_since', slow_ids_since):
+            refresher = threading.Thread(target=classifier.predict, args=(query,))
+            refresher.start()
+            assert reading.wait(5)
+            answered = []
+            reader = threading.Thread(target=lambda: answered.append(classifier.predict(query)))
+            reader.start()
+            reader.join(2)
+            # Answered while the refresh is still blocked reading the change log
+            assert answered
+            release.set()
+            refresher.join(5)
+
+        assert answered[0].local and answered[0].category == Category.FRONTEND
+        assert not refresher.is_alive()
+
+    def test_refresh_applies_task_changes(self, classifier):
+        """Test that refresh learns created tasks and forgets deleted ones from the change log."""
+        manager = TaskManager()
+        manager.add_tasks(labelled_tasks(100))
+        classifier.train()
+        manager.add_tasks(labelled_tasks(20, seed=1))
+        manager.delete_tasks(['0-0', '0-1'])
+
+        classifier.refresh()
+
+        assert classifier.stats()['trained_tasks'] == 118
+
+    def test_service_falls_back_to_llm_and_records_agreement(self, classifier):
+        """Test that unsure predictions go to the LLM and its answer is compared with the local guess."""
+        TaskManager().add_tasks(labelled_tasks(300))
+        classifier.train()
+        with patch('app.application.ai_service._openai_client') as mock_openai:
+            mock_openai.return_value.responses.create.return_value = Mock(output_text='Backend')
+            service = AIService("https://test.openai.azure.com/", "test-api-key", log_service=Mock(),
+                                category_classifier=classifier)
+            ambiguous = {'title': 'Button endpoint', 'description': 'Form api.', 'priority': 'medium',
+                         'effort_hours': 1.0, 'status': 'pending', 'assigned_to': 'Dev'}
+            with patch.object(classifier, 'threshold', 1.1):
+                assert service.generate_task_category(ambiguous) == 'Backend'
+
+        stats = classifier.stats()
+        assert (stats['local_answers'], stats['llm_answers']) == (0, 1)
+        assert stats['llm_agreement_rate'] in (0.0, 1.0)
+
+    def test_categorize_route_skips_llm(self, client, classifier, sample_task_data):
+        """Test that /ai/tasks/categorize answers confident requests locally and reports it."""
+        from app.api import ai_routes
+        TaskManager().add_tasks(labelled_tasks(300))
+        classifier.train()
+        sample_task_data.update(title='Render responsive page', description='Modal component with css style.')
+        with patch.object(ai_routes, 'category_classifier', classifier), \
+                patch.object(ai_routes.ai_service, 'category_classifier', classifier), \
+                patch.object(ai_routes.ai_service.clientOpenai.responses, 'create') as create:
+            response = client.post('/ai/tasks/categorize', data=json.dumps(sample_task_data),
+                                   content_type='application/json')
+            stats = client.get('/ai/tasks/categorize/stats').get_json()
+
+        assert response.status_code == 201
+        assert json.loads(response.data)['category'] == Category.FRONTEND.value
+        create.assert_not_called()
+        assert stats['local_answers'] == 1
+        assert stats['llm_avoidance_rate'] == 1.0
\ No newline at end of file
@@ -0,0 +1,104 @@
+import json
+import math
+import random
+import threading
+import pytest
+from unittest.mock import Mock, patch
+from app.application.ai_service import AIService
+from app.application.effort_estimator import EffortEstimator
+from app.domain.task import Task
+from app.infrastructure.task_manager import TaskManager
+
+CATEGORY_HOURS = {'Frontend': 3.0, 'Backend': 6.0, 'Infra': 10.0}
+PRIORITY_FACTOR = {'low': 0.8, 'medium': 1.0, 'high': 1.5}
+
+def historical_tasks(count, noise, seed=0):
+    """Tasks whose effort follows category and priority, times log-normal noise"""
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(count):
+        category, priority = rng.choice(list(CATEGORY_HOURS)), rng.choice(list(PRIORITY_FACTOR))
+        hours = CATEGORY_HOURS[category] * PRIORITY_FACTOR[priority] * math.exp(rng.gauss(0, noise))
+        tasks.append(Task(
+            id=f'{seed}-{i}', title=f'{category} work', description='Implement the change.', priority=priority,
+            effort_hours=round(hours, 1), status='completed', assigned_to='Dev', category=category,
+        ))
+    return tasks
+
+def request_data(category='Backend', priority='high'):
+    return {'title': f'{category} work', 'description': 'Implement the change.', 'priority': priority,
+            'status': 'pending', 'assigned_to': 'Dev', 'category': category}
+
+@pytest.fixture
+def estimator(app):
+    return EffortEstimator(min_training_tasks=50, retrain_interval=3600)
+
+class TestEffortEstimator:
+    """Test suite for the local effort estimator."""
+
+    def test_answers_locally_with_interval(self, estimator):
+        """Test that consistent history gives a narrow interval around the expected effort."""
+        TaskManager().add_tasks(historical_tasks(400, noise=0.1))
+        estimator.train()
+
+        estimate = estimator.predict(request_data())
+        assert estimate.local
+        assert estimate.low < 9.0 < estimate.high
+        assert estimate.hours == pytest.approx(9.0, rel=0.1)
+        stats = estimator.stats()
+        assert stats['trained_tasks'] == 400
+        assert stats['holdout']['interval_coverage'] > 0.6
+        assert stats['local_answers'] == 1
+
+    def test_defers_when_interval_is_wide(self, estimator):
+        """Test that noisy history sends the estimate to the LLM and records the comparison."""
+        TaskManager().add_tasks(historical_tasks(400, noise=0.8))
+        estimator.train()
+        with patch('app.application.ai_service._openai_client') as mock_openai:
+            mock_openai.return_value.responses.create.return_value = Mock(output_text='about a day')
+            service = AIService("https://test.openai.azure.com/", "test-api-key", log_service=Mock(),
+                                effort_estimator=estimator)
+            hours = service.estimate_effort_hours({**request_data(), 'effort_hours': 0})
+
+        estimate = estimator.predict(request_data())
+        assert not estimate.local
+        # An unparseable LLM answer falls back to the local estimate rather than a fixed 4.0
+        assert hours == estimate.hours
+        assert estimator.stats()['llm_answers'] == 1
+
+    def test_untrained_estimator_defers(self, estimator):
+        """Test that too little history never answers locally."""
+        TaskManager().add_tasks(historical_tasks(20, noise=0.1))
+        assert estimator.predict(request_data()) == (None, None, None, False)
+
+    def test_retrains_in_background(self, estimator):
+        """Test that a stale model is replaced from the tasks table by a background thread."""
+        manager = TaskManager()
+        manager.add_tasks(historical_tasks(100, noise=0.1))
+        estimator.train()
+        manager.add_tasks(historical_tasks(100, noise=0.1, seed=1))
+        estimator.retrain_interval = 0
+
+        estimator.predict(request_data())
+        for thread in threading.enumerate():
+            if thread.name == 'effort-estimator-training':
+                thread.join()
+
+        assert estimator.stats()['trained_tasks'] == 200
+
+    def test_estimate_route_skips_llm(self, client, estimator):
+        """Test that /ai/tasks/estimate answers confident requests locally and reports it."""
+        from app.api import ai_routes
+        TaskManager().add_tasks(historical_tasks(400, noise=0.1))
+        estimator.train()
+        with patch.object(ai_routes, 'effort_estimator', estimator), \
+                patch.object(ai_routes.ai_service, 'effort_estimator', estimator), \
+                patch.object(ai_routes.ai_service.clientOpenai.responses, 'create') as create:
+            response = client.post('/ai/tasks/estimate', data=json.dumps({**request_data(), 'effort_hours': 0}),
+                                   content_type='application/json')
+            stats = client.get('/ai/tasks/estimate/stats').get_json()
+
+        assert response.status_code == 201
+        assert json.loads(response.data)['effort_hours'] == pytest.approx(9.0, rel=0.1)
+        create.assert_not_called()
+        assert stats['llm_avoidance_rate'] == 1.0
\ No newline at end of file
@@ -0,0 +1,193 @@
+import json
+import pytest
+from unittest.mock import patch
+from app.application.change_feed import ChangeFeed
+from app.infrastructure.change_log import ChangeLogManager
+
+def _parse_events(chunks):
+    events = []
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode()
+        fields = dict(line.split(': ', 1) for line in chunk.strip().split('\n') if line and not line.startswith(':'))
+        if 'event' in fields:
+            events.append(fields)
+    return events
+
+class TestChangeFeed:
+    """Test suite for the change log and the SSE change feed."""
+
+    def test_manager_writes_are_recorded(self, client, sample_task_data):
+        """Test that task creates, updates and deletes append change-log rows."""
+        response = client.post('/tasks', data=json.dumps(sample_task_data), content_type='application/json')
+        task_id = json.loads(response.data)['id']
+        client.put(f'/tasks/{task_id}', data=json.dumps({"title": "Updated"}), content_type='application/json')
+        client.delete(f'/tasks/{task_id}')
+
+        changes = ChangeLogManager().changes_since(0)
+
+        assert [(change['entity'], change['action']) for change in changes] == [
+            ('task', 'created'), ('task', 'updated'), ('task', 'deleted')
+        ]
+        assert json.loads(changes[1]['payload'])['title'] == "Updated"
+        assert changes[2]['payload'] is None
+
+    def test_writes_prune_the_log_without_subscribers(self, sample_task, monkeypatch):
+        """Test that a write starts a prune once per interval, whether or not anyone listens to /events."""
+        from app.infrastructure import change_log
+        from app.infrastructure.task_manager import TaskManager
+        monkeypatch.setattr(change_log, 'CHANGE_LOG_PRUNE_INTERVAL', 60.0)
+        monkeypatch.setattr(change_log, 'CHANGE_LOG_MAX_ROWS', 1)
+        monkeypatch.setattr(change_log, '_last_prune', 0.0)
+        manager = TaskManager()
+        with patch('app.infrastructure.change_log.threading.Thread') as thread:
+            manager.add_task(sample_task)
+            manager.delete_task(sample_task.id)
+
+        thread.assert_called_once_with(target=change_log._prune, name='change-log-prune', daemon=True)
+        change_log._prune()
+        assert [change['action'] for change in ChangeLogManager().changes_since(0)] == ['deleted']
+
+    def test_poll_fans_out_to_all_subscribers(self, sample_task):
+        """Test that one poll delivers new changes to every subscriber."""
+        from app.infrastructure.task_manager import TaskManager
+        feed = ChangeFeed()
+        with patch('app.application.change_feed.threading.Thread'):
+            first, second = feed.subscribe(), feed.subscribe()
+        feed.poll()
+
+        TaskManager().add_task(sample_task)
+        changes = feed.poll()
+
+        assert len(changes) == 1
+        assert first.queue.get_nowait()['entity_id'] == sample_task.id
+        assert second.queue.get_nowait()['entity_id'] == sample_task.id
+
+    def test_bulk_load_reset_is_sent_as_a_reset_event(self):
+        """Test that the single reset entry of a bulk load reaches subscribers as a 'reset' event."""
+        from app.application.change_feed import format_event
+        from app.infrastructure.db import SessionLocal
+        from app.infrastructure.change_log import record_reset
+        feed = ChangeFeed()
+        with patch('app.application.change_feed.threading.Thread'):
+            subscription = feed.subscribe()
+        feed.poll()
+        with SessionLocal() as db, db.begin():
+            record_reset(db)
+
+        feed.poll()
+
+        change = subscription.queue.get_nowait()
+        assert _parse_events([format_event(change)]) == [{'id': str(change['id']), 'event': 'reset', 'data': '{}'}]
+
+    def test_poll_delivers_rows_committed_out_of_id_order(self):
+        """Test that a change whose id is below one already read is still delivered, once."""
+        from app.infrastructure.db import SessionLocal
+        from app.infrastructure.models import ChangeLogORM
+
+        def commit(change_id):
+            with SessionLocal() as db:
+                db.add(ChangeLogORM(id=change_id, entity='task', entity_id=f'task-{change_id}', action='created'))
+                db.commit()
+
+        feed = ChangeFeed()
+        feed.poll()
+        commit(2)
+        assert [change['id'] for change in feed.poll()] == [2]
+        # The writer that got id 1 commits last
+        commit(1)
+        commit(3)
+
+        assert [change['id'] for change in feed.poll()] == [1, 3]
+        assert feed.poll() == []
+
+    def test_idle_cursor_reads_fetch_no_payloads(self, sample_task):
+        """Test that a caught-up cursor lists ids in its re-read window but fetches no change rows."""
+        from app.infrastructure.change_log import ChangeLogCursor
+        from app.infrastructure.task_manager import TaskManager
+        manager = ChangeLogManager()
+        TaskManager().add_task(sample_task)
+        cursor = ChangeLogCursor(manager)
+        assert [change['entity_id'] for change in cursor.read()] == [sample_task.id]
+
+        with patch.object(manager, 'changes_by_id', wraps=manager.changes_by_id) as changes_by_id, \
+                patch.object(manager, 'ids_since', wraps=manager.ids_since) as ids_since:
+            assert [cursor.read() for _ in range(3)] == [[], [], []]
+
+        changes_by_id.assert_not_called()
+        assert ids_since.call_count == 3
+
+    def test_poller_restart_skips_changes_written_without_subscribers(self, sample_task):
+        """Test that a client connecting after the poller stopped only gets changes written after it connected."""
+        from app.infrastructure.task_manager import TaskManager
+        feed = ChangeFeed(heartbeat_interval=0.01)
+        with patch('app.application.change_feed.threading.Thread'):
+            feed.unsubscribe(feed.subscribe())
+            feed.poll()
+            feed._run()  # no subscribers left: the poller stops
+            TaskManager().add_task(sample_task)
+
+            events = feed.events()
+            next(events)
+            feed.poll()
+            chunks = [next(events)]
+            events.close()
+
+        assert chunks == [": keep-alive\n\n"]
+
+    def test_events_skip_older_changes_but_deliver_late_commits(self):
+        """Test that polled changes visible when the client connected are dropped and late commits below its start are sent."""
+        from app.infrastructure.db import SessionLocal
+        from app.infrastructure.models import ChangeLogORM
+        with SessionLocal() as db:
+            db.add_all([ChangeLogORM(id=change_id, entity='task', entity_id=f'task-{change_id}', action='created')
+                        for change_id in (5, 7)])
+            db.commit()
+        feed = ChangeFeed()
+        with patch('app.application.change_feed.threading.Thread'):
+            events = feed.events()
+            next(events)
+            subscription, = feed._subscribers
+            # A lagging poll of id 5, and id 6 committed after the client connected
+            for change_id in (5, 6):
+                subscription.push({'id': change_id, 'entity': 'task', 'entity_id': f'task-{change_id}',
+                                   'action': 'created', 'payload': None})
+            chunks = [next(events)]
+            events.close()
+
+        assert chunks[0].startswith('id: 6\n')
+
+    def test_events_resume_from_last_event_id(self, client, sample_task_data):
+        """Test replaying missed changes after Last-Event-ID."""
+        for title in ("First", "Second"):
+            client.post('/tasks', data=json.dumps(dict(sample_task_data, title=title)), content_type='application/json')
+        first_id = ChangeLogManager().changes_since(0)[0]['id']
+
+        with patch('app.application.change_feed.threading.Thread'):
+            response = client.get('/events', headers={'Last-Event-ID': str(first_id)})
+            stream = response.response
+            chunks = [next(stream), next(stream)]
+            response.close()
+
+        assert response.mimetype == 'text/event-stream'
+        events = _parse_events(chunks)
+        assert len(events) == 1
+        assert events[0]['event'] == 'task.created'
+        assert json.loads(events[0]['data'])['data']['title'] == "Second"
+
+    def test_events_reset_when_history_was_pruned(self, client, sample_task_data):
+        """Test that a client too far behind is told to reload."""
+        for _ in range(3):
+            client.post('/tasks', data=json.dumps(sample_task_data), content_type='application/json')
+        manager = ChangeLogManager()
+        manager.prune(max_rows=1)
+
+        feed = ChangeFeed(manager=manager)
+        with patch('app.application.change_feed.threading.Thread'):
+            events = feed.events(last_event_id=0)
+            chunks = [next(events), next(events), next(events)]
+            events.close()
+
+        parsed = _parse_events(chunks)
+        assert parsed[0]['event'] == 'reset'
+        assert parsed[1]['event'] == 'task.created'
@@ -3,6 +3,7 @@ from app.infrastructure.task_manager import TaskManager
 from app.infrastructure.user_story_manager import UserStoryManager
 from app.domain.task import Task, Priority, Status, Category
 from app.domain.user_story import UserStory, UserStoryPriority
+from tests.budget import budget
 
 class TestTaskManager:
     """Test suite for TaskManager."""
@@ -184,7 +185,8 @@ class TestTaskManager:
         manager.add_task(task_without_user_story)
         
         # Get tasks for user story
-        result = manager.get_tasks_by_user_story("user-story-1")
+        with budget(queries=1):
+            result = manager.get_tasks_by_user_story("user-story-1")
         
         assert isinstance(result, list)
         assert len(result) == 1
@@ -200,6 +202,50 @@ class TestTaskManager:
         assert isinstance(result, list)
         assert len(result) == 0
 
+    def test_bulk_add_update_delete_tasks(self, sample_task):
+        """Test bulk insert, update and delete of tasks."""
+        manager = TaskManager()
+        tasks = [sample_task.model_copy(update={'id': f"bulk-{i}", 'title': f"Bulk {i}"}) for i in range(3)]
+
+        assert [task.version for task in manager.add_tasks(tasks)] == [1, 1, 1]
+        fetched = manager.get_tasks([task.id for task in tasks])
+        assert set(fetched) == {"bulk-0", "bulk-1", "bulk-2"}
+
+        updated = manager.update_tasks([tasks[0].model_copy(update={'title': "Renamed"}),
+                                        tasks[1].model_copy(update={'id': "nonexistent-id"})])
+        assert [(task.id, task.version) for task in updated] == [("bulk-0", 2)]
+        assert manager.get_task("bulk-0").title == "Renamed"
+
+        deleted = manager.delete_tasks(["bulk-1", "nonexistent-id"])
+        assert deleted == {"bulk-1"}
+        assert len(manager.list_tasks()) == 2
+
+    def test_list_tasks_with_fields(self, sample_task):
+        """Test that a column subset is selected and returned as dicts."""
+        manager = TaskManager()
+        manager.add_task(sample_task)
+
+        with budget(queries=1):
+            result = manager.list_tasks(fields=['id', 'priority'])
+
+        assert result == [{'id': sample_task.id, 'priority': 'high'}]
+
+    def test_get_task_stats_by_user_story(self, sample_task, sample_user_story):
+        """Test per-story task aggregates computed with one GROUP BY."""
+        UserStoryManager().add_user_story(sample_user_story)
+        manager = TaskManager()
+        manager.add_tasks([
+            sample_task.model_copy(update={'id': 'stats-1', 'user_story_id': sample_user_story.id, 'effort_hours': 2.0}),
+            sample_task.model_copy(update={'id': 'stats-2', 'user_story_id': sample_user_story.id, 'effort_hours': 3.5}),
+            sample_task.model_copy(update={'id': 'stats-3', 'user_story_id': sample_user_story.id, 'status': Status.COMPLETED}),
+        ])
+
+        with budget(queries=1):
+            result = manager.get_task_stats_by_user_story([sample_user_story.id, 'empty-story'])
+
+        assert result[sample_user_story.id] == {'total': 3, 'effort_hours': 8.5, 'by_status': {'pending': 2, 'completed': 1}}
+        assert result['empty-story'] == {'total': 0, 'effort_hours': 0.0, 'by_status': {}}
+
 class TestUserStoryManager:
     """Test suite for UserStoryManager."""
     
@@ -326,4 +372,78 @@ class TestUserStoryManager:
         
         result = manager.delete_user_story("nonexistent-id")
         
-        assert result is None 
\ No newline at end of file
+        assert result is None
+
+    def test_get_user_story_with_tasks(self, sample_user_story, sample_task):
+        """Test loading a user story together with its tasks."""
+        manager = UserStoryManager()
+        manager.add_user_story(sample_user_story)
+        TaskManager().add_task(sample_task.model_copy(update={'user_story_id': sample_user_story.id}))
+
+        # The story and a selectin load of its tasks
+        with budget(queries=2):
+            user_story, tasks = manager.get_user_story_with_tasks(sample_user_story.id)
+
+        assert user_story.id == sample_user_story.id
+        assert [task.id for task in tasks] == [sample_task.id]
+        assert manager.get_user_story_with_tasks("nonexistent-id") is None
+
+    @pytest.mark.budget(memory=4 * 1024 * 1024)
+    def test_list_tasks_memory_scales_with_rows(self, sample_task):
+        """Test that listing 500 tasks stays within one query and a per-row allocation budget."""
+        manager = TaskManager()
+        manager.add_tasks([sample_task.model_copy(update={'id': f"mem-{i}"}) for i in range(500)])
+
+        with budget(queries=1, memory=500 * 4 * 1024):
+            tasks = manager.list_tasks()
+
+        assert len(tasks) == 500
+
+    def test_list_user_stories_paginated(self, sample_user_story):
+        """Test listing one page of user stories and counting them."""
+        manager = UserStoryManager()
+        for i in range(3):
+            manager.add_user_story(sample_user_story.model_copy(update={'id': f"story-{i}"}))
+
+        first_page = manager.list_user_stories(limit=2, offset=0)
+        second_page = manager.list_user_stories(limit=2, offset=2)
+
+        assert manager.count_user_stories() == 3
+        assert len(first_page) == 2
+        assert len(second_page) == 1
+        assert {story.id for story in first_page + second_page} == {"story-0", "story-1", "story-2"}
+
+
+class TestSyntheticData:
+    """Test suite for the synthetic data generator."""
+
+    @pytest.mark.budget(memory=4 * 1024 * 1024)
+    def test_generator_is_reproducible(self):
+        """Test that the same seed generates the same rows and different seeds do not."""
+        from app.infrastructure.synthetic_data import SyntheticDataGenerator
+
+        first = list(SyntheticDataGenerator(seed=42).batches(50, 20))
+        second = list(SyntheticDataGenerator(seed=42).batches(50, 20))
+        other = list(SyntheticDataGenerator(seed=43).batches(50, 20))
+
+        assert first == second
+        assert first != other
+        tasks = [task for _, batch in first for task in batch]
+        assert all(len(task['risk_analysis']) <= 1000 for task in tasks if task['risk_analysis'])
+        assert len({task['status'] for task in tasks}) > 1
+
+    def test_seed_data_command_loads_rows(self, runner):
+        """Test that the seed-data command bulk-loads stories and tasks readable by the managers."""
+        result = runner.invoke(args=['seed-data', '--user-stories', '30', '--seed', '7', '--batch-size', '10'])
+
+        assert result.exit_code == 0, result.output
+        user_story_manager = UserStoryManager()
+        assert user_story_manager.count_user_stories() == 30
+        story = user_story_manager.list_user_stories(limit=1)[0]
+        tasks = TaskManager().get_tasks_by_user_story(story.id)
+        assert all(task.user_story_id == story.id for task in tasks)
+        assert f"Loaded 30 user stories and {len(TaskManager().list_tasks())} tasks" in result.output
+        # One reset entry for the whole load, not one per seeded row
+        from app.infrastructure.change_log import ChangeLogManager
+        changes = ChangeLogManager().changes_since(0, limit=10000)
+        assert [change['action'] for change in changes] == ['reset']
\ No newline at end of file
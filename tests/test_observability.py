@@ -0,0 +1,271 @@
+import json
+import pytest
+from unittest.mock import patch, Mock
+from uuid import uuid4
+
+class TestRequestMetrics:
+    """Test suite for request timing, Server-Timing and /metrics."""
+
+    def test_server_timing_header(self, client, sample_task_data):
+        """Test that responses carry a Server-Timing breakdown."""
+        client.post('/tasks', data=json.dumps(sample_task_data), content_type='application/json')
+
+        response = client.get('/tasks')
+
+        entries = dict(entry.split(';dur=') for entry in response.headers['Server-Timing'].split(', '))
+        assert {'db', 'serialize', 'total'} <= set(entries)
+        assert float(entries['total']) >= float(entries['db'])
+
+    def test_server_timing_includes_render(self, client):
+        """Test that template rendering time is reported."""
+        response = client.get('/user-stories')
+
+        assert 'render;dur=' in response.headers['Server-Timing']
+
+    def test_server_timing_includes_ai(self, client, sample_user_story):
+        """Test that time spent in the OpenAI client is attributed to 'ai'."""
+        from app.api.user_story_routes import ai_service
+        parsed = Mock(output_parsed=sample_user_story, usage=Mock(input_tokens=10, output_tokens=5))
+        with patch.object(ai_service.clientOpenai.responses, 'parse', return_value=parsed), \
+                patch.object(ai_service.log_service, 'log_token_usage'):
+            response = client.post('/ai/user-stories',
+                                   data=json.dumps({"prompt": "As a user, I want metrics"}),
+                                   content_type='application/json')
+
+        assert response.status_code == 201
+        assert 'ai;dur=' in response.headers['Server-Timing']
+
+    def test_metrics_endpoint(self, client):
+        """Test the Prometheus text exposition."""
+        client.get('/tasks')
+
+        response = client.get('/metrics')
+
+        assert response.status_code == 200
+        body = response.data.decode()
+        assert 'http_request_duration_seconds_count{endpoint="/tasks",method="GET",status="200"}' in body
+        assert 'http_request_component_duration_seconds_count{component="db",endpoint="/tasks"}' in body
+
+
+class TestSlowQueryLog:
+    """Test suite for the sampled slow query log."""
+
+    @pytest.fixture
+    def slow_query_log(self):
+        from app.infrastructure.db import engine
+        from app.infrastructure.slow_query_log import SlowQueryLog
+        slow_query_log = SlowQueryLog(threshold_ms=0, sample_rate=1.0, explain_ms=0)
+        slow_query_log.install(engine)
+        yield slow_query_log
+        slow_query_log.remove(engine)
+
+    def test_fingerprint_ignores_literals_and_parameters(self):
+        """Test that queries differing only in values share a fingerprint."""
+        from app.infrastructure.slow_query_log import fingerprint_statement, fingerprint_parameters
+
+        first = fingerprint_statement("SELECT * FROM tasks WHERE id IN (?, ?) AND effort_hours > 2")
+        second = fingerprint_statement("SELECT *  FROM tasks\nWHERE id IN (?, ?, ?) AND effort_hours > 10")
+
+        assert first == second
+        assert fingerprint_parameters(('secret', 3), False) == '(str, int)'
+        assert fingerprint_parameters([('a',), ('b',)], True) == '2 rows of (str)'
+
+    def test_logs_slow_queries_with_route_and_plan(self, client, caplog, slow_query_log, sample_task_data):
+        """Test that slow statements are logged with their route and EXPLAIN plan, without parameter values."""
+        client.post('/tasks', data=json.dumps(sample_task_data), content_type='application/json')
+        caplog.clear()
+
+        with caplog.at_level('WARNING', logger='app.infrastructure.slow_query_log'):
+            client.get('/tasks')
+
+        records = [record.slow_query for record in caplog.records if hasattr(record, 'slow_query')]
+        selects = [record for record in records if record['statement'].startswith('SELECT')]
+        assert selects
+        assert all(record['route'] == 'GET /tasks' for record in records)
+        assert any('plan' in record for record in selects)
+        assert 'Test Task' not in caplog.text
+
+    def test_plan_waits_for_streamed_results(self, caplog, slow_query_log):
+        """Test that EXPLAIN runs only after a streaming cursor's connection is returned to the pool."""
+        from sqlalchemy import text
+        from app.infrastructure.db import engine
+
+        with caplog.at_level('WARNING', logger='app.infrastructure.slow_query_log'):
+            with engine.connect() as conn:
+                result = conn.execution_options(stream_results=True).execute(text('SELECT 1 UNION ALL SELECT 2'))
+                assert result.fetchone() == (1,)
+                assert not any(hasattr(record, 'slow_query') for record in caplog.records)
+                assert result.fetchall() == [(2,)]
+
+        records = [record.slow_query for record in caplog.records if hasattr(record, 'slow_query')]
+        assert [record['statement'] for record in records] == ['SELECT ? UNION ALL SELECT ?']
+        assert isinstance(records[0]['plan'], list)
+
+    def test_sampling_skips_unsampled_statements(self, caplog):
+        """Test that a zero sample rate never times or logs statements."""
+        from sqlalchemy import text
+        from app.infrastructure.db import engine
+        from app.infrastructure.slow_query_log import SlowQueryLog
+        slow_query_log = SlowQueryLog(threshold_ms=0, sample_rate=0.0)
+        slow_query_log.install(engine)
+        try:
+            with caplog.at_level('WARNING', logger='app.infrastructure.slow_query_log'):
+                with engine.connect() as conn:
+                    conn.execute(text('SELECT 1'))
+        finally:
+            slow_query_log.remove(engine)
+
+        assert not any(hasattr(record, 'slow_query') for record in caplog.records)
+
+class TestTracing:
+    """Test suite for request tracing across layers."""
+
+    @pytest.fixture
+    def span_exporter(self):
+        from app.infrastructure.tracing import configure_tracing, reset_tracing
+        _, span_exporter = configure_tracing('memory')
+        yield span_exporter
+        reset_tracing()
+
+    def test_generate_tasks_trace(self, span_exporter, client, sample_user_story_data, sample_task):
+        """Test that one trace covers the route, services, managers, DB and the OpenAI call."""
+        from app.api.user_story_routes import ai_service
+        from app.application.user_story_service import UserStoryService
+        user_story = UserStoryService().create_user_story({'id': str(uuid4()), **sample_user_story_data})
+        parsed = Mock(output_parsed=Mock(tasks=[sample_task, sample_task]),
+                      usage=Mock(input_tokens=120, output_tokens=80))
+        span_exporter.clear()
+
+        with patch.object(ai_service.clientOpenai.responses, 'parse', return_value=parsed), \
+                patch.object(ai_service.log_service, '_get_daily_log_file', return_value='/dev/null'):
+            response = client.post(f'/ai/user-stories/{user_story.id}/generate_tasks',
+                                   headers={'traceparent': '00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01'})
+
+        assert response.status_code == 201
+        spans = span_exporter.get_finished_spans()
+        by_name = {}
+        for span in spans:
+            by_name.setdefault(span.name, []).append(span)
+        root = by_name['POST /ai/user-stories/<user_story_id>/generate_tasks'][0]
+        assert format(root.context.trace_id, '032x') == '0af7651916cd43dd8448eb211c80319c'
+        assert all(span.context.trace_id == root.context.trace_id for span in spans)
+        assert len(by_name['TaskService.create_task']) == 2
+        assert {'UserStoryService.get_user_story', 'UserStoryManager.get_user_story', 'TaskManager.add_task'} <= set(by_name)
+        assert {span.attributes['app.layer'] for span in spans} == {'api', 'application', 'infrastructure', 'db'}
+        ai_span = by_name['AsyncAIService.generate_tasks_from_user_story'][0]
+        assert ai_span.attributes['ai.input_tokens'] == 120
+        assert ai_span.attributes['ai.output_tokens'] == 80
+        assert all('Sample Task' not in span.attributes.get('db.statement', '') for span in spans)
+
+    def test_reset_flushes_and_closes_file_exporter(self, monkeypatch, tmp_path):
+        """Test that reset_tracing flushes the file exporter, closes its file and disables tracing."""
+        from app.infrastructure.tracing import configure_tracing, reset_tracing, tracing_enabled, tracer
+        monkeypatch.setenv('TRACING_FILE', str(tmp_path / 'traces.jsonl'))
+        provider, span_exporter = configure_tracing('file')
+        with tracer.start_as_current_span('exported'):
+            pass
+
+        reset_tracing()
+
+        assert not tracing_enabled()
+        assert span_exporter.out.closed
+        assert json.loads((tmp_path / 'traces.jsonl').read_text())['name'] == 'exported'
+        assert not tracer.start_span('after reset').is_recording()
+
+class TestProfiling:
+    """Test suite for on-demand request profiling."""
+
+    @pytest.fixture
+    def profiling_client(self, monkeypatch, tmp_path):
+        from app import create_app
+        monkeypatch.setenv('PROFILING_SECRET', 'profiling-secret')
+        monkeypatch.setenv('PROFILE_DIR', str(tmp_path))
+        app = create_app()
+        app.config['TESTING'] = True
+        return app.test_client()
+
+    def test_signed_header_profiles_request(self, profiling_client, sample_task_data):
+        """Test that a signed X-Profile header produces a downloadable pstats file and allocation peak."""
+        import pstats, time
+        from app.api.profiling import sign_profile_request
+        profiling_client.post('/tasks', data=json.dumps(sample_task_data), content_type='application/json')
+        header = sign_profile_request('profiling-secret', '/tasks', int(time.time()) + 60)
+
+        response = profiling_client.get('/tasks', headers={'X-Profile': header})
+
+        profile_id = response.headers['X-Profile-Id']
+        admin = {'Authorization': 'Bearer profiling-secret'}
+        download = profiling_client.get(f'/admin/profiles/{profile_id}', headers=admin)
+        assert download.status_code == 200
+        profiles = profiling_client.get('/admin/profiles', headers=admin).get_json()
+        assert profiles[0]['id'] == profile_id
+        assert profiles[0]['tracemalloc_peak_bytes'] > 0
+        assert profiles[0]['top_allocations']
+        text = profiling_client.get(f'/admin/profiles/{profile_id}?format=text', headers=admin)
+        assert 'list_tasks' in text.data.decode()
+
+    def test_invalid_or_expired_signature_is_ignored(self, profiling_client):
+        """Test that requests with a forged or expired header are not profiled."""
+        import time
+        from app.api.profiling import sign_profile_request
+        expired = sign_profile_request('profiling-secret', '/tasks', int(time.time()) - 1)
+        forged = sign_profile_request('wrong-secret', '/tasks', int(time.time()) + 60)
+        other_path = sign_profile_request('profiling-secret', '/user-stories', int(time.time()) + 60)
+
+        for header in (expired, forged, other_path):
+            response = profiling_client.get('/tasks', headers={'X-Profile': header})
+            assert 'X-Profile-Id' not in response.headers
+
+    def test_admin_toggle(self, profiling_client):
+        """Test that an armed path is profiled for the requested number of requests only."""
+        response = profiling_client.post('/admin/profiling', data=json.dumps({'path': '/tasks', 'count': 1}),
+                                         content_type='application/json')
+        assert response.status_code == 403
+
+        profiling_client.post('/admin/profiling', data=json.dumps({'path': '/tasks', 'count': 1}),
+                              content_type='application/json', headers={'Authorization': 'Bearer profiling-secret'})
+
+        assert 'X-Profile-Id' in profiling_client.get('/tasks').headers
+        assert 'X-Profile-Id' not in profiling_client.get('/tasks').headers
+
+    def test_armed_count_is_kept_while_another_profile_runs(self, profiling_client):
+        """Test that a request skipped because a profile is running does not use up the armed count."""
+        admin = {'Authorization': 'Bearer profiling-secret'}
+        profiling_client.post('/admin/profiling', data=json.dumps({'path': '/tasks', 'count': 1}),
+                              content_type='application/json', headers=admin)
+        running = profiling_client.application.extensions['profiling']['running']
+
+        with running:
+            assert 'X-Profile-Id' not in profiling_client.get('/tasks').headers
+
+        assert 'X-Profile-Id' in profiling_client.get('/tasks').headers
+
+    def test_async_view_profile_includes_the_coroutine(self, profiling_client, sample_task_data):
+        """Test that profiling an async view records the coroutine run on the event loop, not just the wait."""
+        from app.api.ai_routes import ai_service
+        admin = {'Authorization': 'Bearer profiling-secret'}
+        profiling_client.post('/admin/profiling', data=json.dumps({'path': '/ai/tasks/estimate'}),
+                              content_type='application/json', headers=admin)
+        response_mock = Mock(output_text="7.5", usage=Mock(input_tokens=10, output_tokens=2))
+        with patch.object(ai_service.clientOpenai.responses, 'create', return_value=response_mock), \
+                patch.object(ai_service.log_service, 'log_token_usage'):
+            response = profiling_client.post('/ai/tasks/estimate', data=json.dumps(sample_task_data),
+                                             content_type='application/json')
+
+        assert response.status_code == 201
+        profile_id = response.headers['X-Profile-Id']
+        text = profiling_client.get(f'/admin/profiles/{profile_id}?format=text', headers=admin).data.decode()
+        assert 'estimate_task' in text
+
+    def test_only_the_newest_profiles_are_kept(self, tmp_path, profiling_client):
+        """Test that profiles beyond PROFILE_MAX_FILES are deleted, oldest first."""
+        profiling_client.application.extensions['profiling']['max_files'] = 2
+        admin = {'Authorization': 'Bearer profiling-secret'}
+        profiling_client.post('/admin/profiling', data=json.dumps({'path': '/tasks', 'count': 3}),
+                              content_type='application/json', headers=admin)
+
+        profile_ids = [profiling_client.get('/tasks').headers['X-Profile-Id'] for _ in range(3)]
+
+        listed = [profile['id'] for profile in profiling_client.get('/admin/profiles', headers=admin).get_json()]
+        assert sorted(listed) == sorted(profile_ids[1:])
+        assert len(list(tmp_path.iterdir())) == 4
\ No newline at end of file
@@ -0,0 +1,96 @@
+import os
+import runpy
+import pytest
+from unittest.mock import Mock, patch
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'gunicorn.conf.py')
+
+class TestGunicornConfig:
+    """Test suite for the production gunicorn config module."""
+
+    @pytest.fixture
+    def config(self):
+        # The config sets a default PROMETHEUS_MULTIPROC_DIR, which must not leak into other tests
+        with patch.dict(os.environ):
+            yield runpy.run_path(CONFIG_PATH)
+
+    def test_defaults(self, config):
+        """Test that the defaults suit an I/O-bound app."""
+        assert config['worker_class'] == 'gthread'
+        assert config['threads'] > 1
+        assert config['preload_app'] is True
+        assert config['max_requests'] > 0 and config['max_requests_jitter'] > 0
+        assert config['workers'] >= 1
+
+    def test_default_workers(self, config):
+        """Test that the worker count follows CPUs and is capped by memory."""
+        default_workers = config['default_workers']
+        assert default_workers(4, 8192, 'gthread') == 5
+        assert default_workers(4, 8192, 'sync') == 9
+        assert default_workers(8, 600, 'gthread') == 2
+        assert default_workers(0.5, 256, 'gthread') == 1
+
+    def test_post_fork_disposes_inherited_connections(self, config):
+        """Test that a forked worker drops the master's pooled connections without closing them."""
+        with patch('app.infrastructure.db.engine') as engine:
+            config['post_fork'](Mock(), Mock())
+        engine.dispose.assert_called_once_with(close=False)
+
+    def test_metrics_are_shared_by_default(self):
+        """Test that without PROMETHEUS_MULTIPROC_DIR the config sets a fresh directory, emptied on start and removed on exit."""
+        environ = {key: value for key, value in os.environ.items() if key != 'PROMETHEUS_MULTIPROC_DIR'}
+        with patch.dict(os.environ, environ, clear=True):
+            config = runpy.run_path(CONFIG_PATH)
+            directory = os.environ['PROMETHEUS_MULTIPROC_DIR']
+            os.makedirs(directory, exist_ok=True)
+            open(os.path.join(directory, 'counter_1.db'), 'w').close()
+            config['on_starting'](Mock())
+            assert os.listdir(directory) == []
+            config['on_exit'](Mock())
+
+        assert directory == config['default_metrics_dir']
+        assert not os.path.exists(directory)
+
+    def test_child_exit_marks_prometheus_process_dead(self, config, tmp_path):
+        """Test that an exited worker's live Prometheus files are cleaned up."""
+        with patch.dict(os.environ, {'PROMETHEUS_MULTIPROC_DIR': str(tmp_path)}), \
+             patch('prometheus_client.multiprocess.mark_process_dead') as mark_process_dead:
+            config['child_exit'](Mock(), Mock(pid=1234))
+        mark_process_dead.assert_called_once_with(1234)
+
+    def test_warm_models_runs_every_step(self, config):
+        """Test that one failing warmup step is logged and the others still run."""
+        log = Mock()
+        with patch('app.api.ai_routes.category_classifier.train', side_effect=RuntimeError('db down')), \
+             patch('app.api.ai_routes.effort_estimator.train') as effort_train, \
+             patch('app.infrastructure.task_index.task_index.load') as index_load:
+            config['warm_models'](log)
+
+        effort_train.assert_called_once_with()
+        index_load.assert_called_once_with()
+        log.exception.assert_called_once()
+        assert log.info.call_count == 2
+
+    @pytest.mark.parametrize('preload', [True, False])
+    def test_models_warm_in_master_or_in_background(self, config, preload):
+        """Test that models warm once in the master with preload_app, otherwise off the worker's boot path."""
+        cfg, warm_models = Mock(preload_app=preload), Mock()
+        with patch.dict(config['warm_models'].__globals__, warm_models=warm_models), \
+             patch('app.api.ai_clients.prewarm_ai_clients', return_value=0), \
+             patch.dict(os.environ, {'AI_PREWARM': 'false'}), \
+             patch('threading.Thread') as thread:
+            config['when_ready'](Mock(cfg=cfg))
+            config['post_worker_init'](Mock(cfg=cfg))
+
+        assert warm_models.call_count == int(preload)
+        assert thread.return_value.start.call_count == int(not preload)
+
+    @pytest.mark.parametrize('prewarm', ['true', 'false'])
+    def test_master_imports_the_ai_sdk_only_for_prewarming_workers(self, config, prewarm):
+        """Test that with preload_app the OpenAI SDK is imported once in the master when workers prewarm AI connections."""
+        with patch.dict(config['warm_models'].__globals__, warm_models=Mock()), \
+             patch('app.api.ai_clients.import_ai_sdk') as import_ai_sdk, \
+             patch.dict(os.environ, {'AI_PREWARM': prewarm}):
+            config['when_ready'](Mock(cfg=Mock(preload_app=True)))
+
+        assert import_ai_sdk.call_count == int(prewarm == 'true')
\ No newline at end of file
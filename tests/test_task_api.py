@@ -3,7 +3,7 @@ import os
 import sys
 import pytest
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 # Add the project root directory to Python path
 project_root = str(Path(__file__).parent.parent)
@@ -11,6 +11,7 @@ sys.path.insert(0, project_root)
 
 from app.domain.task import Priority, Status, Category
 from app.domain.user_story import UserStory, UserStoryPriority
+from app.infrastructure.task_manager import TaskManager
 
 @pytest.fixture
 def sample_task_data():
@@ -51,7 +52,7 @@ class TestTaskAPI:
 
     def test_create_task_with_user_story_id(self, client):
         """Test creating a task with a user story ID."""
-        with patch('app.api.user_story_routes.ai_service') as mock_ai_service:
+        with patch('app.api.user_story_routes.ai_service', new_callable=AsyncMock) as mock_ai_service:
             # Mock the AI service to return a user story
             mock_user_story = UserStory(
                 id="test-user-story-id",
@@ -339,6 +340,8 @@ class TestTaskAPI:
         data = json.loads(response.data)
         assert 'error' in data
 
+    # 80 creates, each one task insert plus its table version bump and change log entry
+    @pytest.mark.budget(queries=1 + 80 * 4)
     def test_task_validation_enum_values(self, client):
         """Test that all enum values are accepted."""
         valid_priorities = ['low', 'medium', 'high', 'blocking']
@@ -362,4 +365,273 @@ class TestTaskAPI:
                                           data=json.dumps(task_data),
                                           content_type='application/json')
                     
-                    assert response.status_code == 201, f"Failed for priority={priority}, status={status}, category={category}" 
\ No newline at end of file
+                    assert response.status_code == 201, f"Failed for priority={priority}, status={status}, category={category}"
+
+    def test_batch_tasks_mixed_operations(self, client, sample_task_data):
+        """Test a batch with create, update, delete and invalid operations."""
+        create_response = client.post('/tasks',
+                                    data=json.dumps(sample_task_data),
+                                    content_type='application/json')
+        task_id = json.loads(create_response.data)['id']
+        invalid_task = dict(sample_task_data, priority='invalid_priority')
+
+        operations = [
+            {"op": "create", "data": sample_task_data},
+            {"op": "update", "id": task_id, "data": {"title": "Batch Updated"}},
+            {"op": "create", "data": invalid_task},
+            {"op": "update", "id": "nonexistent-id", "data": {"title": "Missing"}},
+            {"op": "delete", "id": "nonexistent-id"},
+            {"op": "unknown"}
+        ]
+        response = client.post('/tasks/batch',
+                              data=json.dumps(operations),
+                              content_type='application/json')
+
+        assert response.status_code == 200
+        results = json.loads(response.data)
+        assert [result['status'] for result in results] == [201, 200, 400, 404, 404, 400]
+        assert results[0]['task']['title'] == sample_task_data['title']
+        assert results[1]['task']['title'] == "Batch Updated"
+        assert results[2]['error'][0]['field'] == 'priority'
+
+        # Verify the valid operations were persisted
+        data = json.loads(client.get('/tasks').data)
+        assert len(data) == 2
+        stored = json.loads(client.get(f'/tasks/{task_id}').data)
+        assert stored['title'] == "Batch Updated"
+        # Results and change-log payloads carry the versions actually stored
+        assert results[0]['task']['version'] == 1
+        assert results[1]['task']['version'] == stored['version'] == 2
+        from app.infrastructure.change_log import ChangeLogManager
+        assert [json.loads(change['payload'])['version'] for change in ChangeLogManager().changes_since(0)] == [1, 1, 2]
+
+    def test_batch_update_of_a_task_deleted_meanwhile_is_not_found(self, client, sample_task_data):
+        """Test that an update whose row is deleted after it was read reports 404 and records no change."""
+        task_id = json.loads(client.post('/tasks', data=json.dumps(sample_task_data),
+                                         content_type='application/json').data)['id']
+        get_tasks = TaskManager.get_tasks
+
+        def read_then_delete(manager, task_ids):
+            existing = get_tasks(manager, task_ids)
+            TaskManager().delete_task(task_id)
+            return existing
+
+        with patch.object(TaskManager, 'get_tasks', read_then_delete):
+            response = client.post('/tasks/batch', data=json.dumps([{"op": "update", "id": task_id, "data": {"title": "Late"}}]),
+                                   content_type='application/json')
+
+        assert json.loads(response.data)[0]['status'] == 404
+        from app.infrastructure.change_log import ChangeLogManager
+        assert [change['action'] for change in ChangeLogManager().changes_since(0)] == ['created', 'deleted']
+
+    def test_batch_tasks_delete(self, client, sample_task_data):
+        """Test deleting tasks through the batch endpoint."""
+        create_response = client.post('/tasks',
+                                    data=json.dumps(sample_task_data),
+                                    content_type='application/json')
+        task_id = json.loads(create_response.data)['id']
+
+        response = client.post('/tasks/batch',
+                              data=json.dumps([{"op": "delete", "id": task_id}]),
+                              content_type='application/json')
+
+        assert response.status_code == 200
+        assert json.loads(response.data)[0]['status'] == 204
+        assert client.get(f'/tasks/{task_id}').status_code == 404
+
+    def test_batch_tasks_rejects_non_string_ids(self, client):
+        """Test that list or object ids get a per-item 400 instead of failing the batch."""
+        response = client.post('/tasks/batch',
+                              data=json.dumps([{"op": "delete", "id": ["a", "b"]},
+                                               {"op": "update", "id": {"a": 1}, "data": {}},
+                                               {"op": "delete", "id": "missing"}]),
+                              content_type='application/json')
+
+        assert response.status_code == 200
+        assert [result['status'] for result in json.loads(response.data)] == [400, 400, 404]
+
+    def test_batch_tasks_invalid_body(self, client):
+        """Test that the batch endpoint requires a list of operations."""
+        response = client.post('/tasks/batch',
+                              data=json.dumps({"op": "create"}),
+                              content_type='application/json')
+
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert 'error' in data
+
+    @pytest.mark.budget(queries=31)
+    def test_export_and_import_tasks_ndjson(self, client, sample_task_data):
+        """Test exporting tasks as NDJSON and importing them back."""
+        for i in range(3):
+            client.post('/tasks',
+                        data=json.dumps(dict(sample_task_data, title=f"Task {i}")),
+                        content_type='application/json')
+
+        export_response = client.get('/tasks/export')
+        assert export_response.status_code == 200
+        assert export_response.mimetype == 'application/x-ndjson'
+        lines = export_response.data.decode().splitlines()
+        assert len(lines) == 3
+        assert {json.loads(line)['title'] for line in lines} == {"Task 0", "Task 1", "Task 2"}
+
+        # Clear the table and restore it from the export, plus one invalid line
+        for line in lines:
+            client.delete(f"/tasks/{json.loads(line)['id']}")
+        body = '\n'.join(lines) + '\n{"title": "Incomplete"}\nnot json\n'
+        import_response = client.post('/tasks/import', data=body, content_type='application/x-ndjson')
+
+        assert import_response.status_code == 200
+        data = json.loads(import_response.data)
+        assert data['imported'] == 3
+        assert [error['line'] for error in data['errors']] == [4, 5]
+        assert len(json.loads(client.get('/tasks').data)) == 3
+
+    def test_json_provider_serializes_models(self, app, sample_task):
+        """Test that jsonify accepts models and lists of models directly."""
+        from flask import jsonify
+
+        with app.app_context():
+            single = json.loads(jsonify(sample_task).get_data())
+            many = json.loads(jsonify([sample_task, sample_task]).get_data())
+            nested = json.loads(jsonify({'task': sample_task}).get_data())
+
+        assert single == json.loads(sample_task.model_dump_json())
+        assert many == [single, single]
+        assert nested == {'task': single}
+
+    def test_get_tasks_sparse_fields(self, client, sample_task_data):
+        """Test restricting task reads to a subset of fields."""
+        create_response = client.post('/tasks',
+                                    data=json.dumps(sample_task_data),
+                                    content_type='application/json')
+        task_id = json.loads(create_response.data)['id']
+
+        list_response = client.get('/tasks?fields=id,title,status')
+        assert list_response.status_code == 200
+        assert json.loads(list_response.data) == [{'id': task_id, 'title': sample_task_data['title'], 'status': 'pending'}]
+
+        get_response = client.get(f'/tasks/{task_id}?fields=title,priority')
+        assert json.loads(get_response.data) == {'title': sample_task_data['title'], 'priority': 'high'}
+
+        export_response = client.get('/tasks/export?fields=id')
+        assert json.loads(export_response.data) == {'id': task_id}
+
+    def test_get_tasks_sparse_fields_invalid(self, client):
+        """Test that unknown fields are rejected."""
+        response = client.get('/tasks?fields=id,unknown_field')
+
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert 'unknown_field' in data['error']
+
+    def test_conditional_get_returns_not_modified(self, client, sample_task_data):
+        """Test ETag/If-None-Match handling on task reads."""
+        client.post('/tasks', data=json.dumps(sample_task_data), content_type='application/json')
+
+        response = client.get('/tasks')
+        etag = response.headers['ETag']
+        assert response.status_code == 200
+        assert response.headers['Last-Modified']
+
+        cached = client.get('/tasks', headers={'If-None-Match': etag})
+        assert cached.status_code == 304
+        assert cached.data == b''
+
+        # A different representation of the same data gets a different ETag
+        assert client.get('/tasks?fields=id').headers['ETag'] != etag
+
+        # Any write to the table invalidates the ETag
+        client.post('/tasks', data=json.dumps(sample_task_data), content_type='application/json')
+        assert client.get('/tasks', headers={'If-None-Match': etag}).status_code == 200
+
+    def test_if_match_on_update_and_delete(self, client, sample_task_data):
+        """Test optimistic concurrency with If-Match on PUT and DELETE."""
+        create_response = client.post('/tasks',
+                                    data=json.dumps(sample_task_data),
+                                    content_type='application/json')
+        task_id = json.loads(create_response.data)['id']
+        etag = client.get(f'/tasks/{task_id}').headers['ETag']
+
+        response = client.put(f'/tasks/{task_id}',
+                             data=json.dumps({"title": "First writer"}),
+                             content_type='application/json',
+                             headers={'If-Match': etag})
+        assert response.status_code == 200
+        new_etag = response.headers['ETag']
+        assert new_etag != etag
+
+        # A second client still holding the old ETag is rejected
+        stale = client.put(f'/tasks/{task_id}',
+                          data=json.dumps({"title": "Second writer"}),
+                          content_type='application/json',
+                          headers={'If-Match': etag})
+        assert stale.status_code == 412
+        assert client.delete(f'/tasks/{task_id}', headers={'If-Match': etag}).status_code == 412
+
+        assert client.delete(f'/tasks/{task_id}', headers={'If-Match': new_etag}).status_code == 204
+
+    def test_if_match_write_is_conditional(self, client, sample_task_data):
+        """Test that a write committed between the If-Match check and the update is not overwritten."""
+        create_response = client.post('/tasks',
+                                    data=json.dumps(sample_task_data),
+                                    content_type='application/json')
+        task_id = json.loads(create_response.data)['id']
+        etag = client.get(f'/tasks/{task_id}').headers['ETag']
+        get_task = TaskManager.get_task
+
+        def get_task_then_race(self, *args, **kwargs):
+            # Another writer commits after the precondition was checked
+            task = get_task(self, *args, **kwargs)
+            TaskManager().update_task(task.model_copy(update={'title': 'Concurrent writer'}))
+            return task
+
+        with patch.object(TaskManager, 'get_task', get_task_then_race):
+            response = client.put(f'/tasks/{task_id}',
+                                 data=json.dumps({"title": "Lost update"}),
+                                 content_type='application/json',
+                                 headers={'If-Match': etag})
+
+        assert response.status_code == 412
+        assert json.loads(client.get(f'/tasks/{task_id}').data)['title'] == 'Concurrent writer'
+
+    @pytest.mark.budget(queries=52)
+    def test_large_responses_are_compressed(self, client, sample_task_data):
+        """Test gzip negotiation, the size threshold and ETag handling with compression."""
+        import gzip
+        assert client.get('/tasks', headers={'Accept-Encoding': 'gzip'}).headers.get('Content-Encoding') is None
+
+        for i in range(10):
+            client.post('/tasks',
+                        data=json.dumps(dict(sample_task_data, risk_analysis='Risk ' * 100)),
+                        content_type='application/json')
+
+        plain = client.get('/tasks')
+        compressed = client.get('/tasks', headers={'Accept-Encoding': 'gzip'})
+
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in compressed.headers['Vary']
+        assert len(compressed.data) < len(plain.data)
+        assert json.loads(gzip.decompress(compressed.data)) == json.loads(plain.data)
+        assert compressed.headers['ETag'] == plain.headers['ETag'][:-1] + '-gzip"'
+
+        # The encoding-specific ETag still validates the cached copy
+        revalidated = client.get('/tasks', headers={'Accept-Encoding': 'gzip',
+                                                    'If-None-Match': compressed.headers['ETag']})
+        assert revalidated.status_code == 304
+        assert revalidated.headers['ETag'] == compressed.headers['ETag']
+        by_date = client.get('/tasks', headers={'Accept-Encoding': 'gzip',
+                                                'If-Modified-Since': compressed.headers['Last-Modified']})
+        assert by_date.status_code == 304
+        assert by_date.headers['ETag'] == compressed.headers['ETag']
+        assert client.get('/tasks', headers={'If-None-Match': plain.headers['ETag']}).headers['ETag'] == plain.headers['ETag']
+
+    def test_streamed_export_is_compressed(self, client, sample_task_data):
+        """Test on-the-fly gzip compression of the NDJSON export."""
+        import gzip
+        client.post('/tasks', data=json.dumps(sample_task_data), content_type='application/json')
+
+        response = client.get('/tasks/export', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(response.data))['title'] == sample_task_data['title']
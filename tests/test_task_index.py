@@ -0,0 +1,148 @@
+import json
+import threading
+from unittest.mock import patch
+import pytest
+from app.domain.task import Task
+from app.infrastructure.task_index import TaskSimilarityIndex, task_index
+from app.infrastructure.task_manager import TaskManager
+
+def make_task(task_id, title, description):
+    return Task(id=task_id, title=title, description=description, priority='medium', effort_hours=2.0,
+                status='pending', assigned_to='Dev', category='Backend')
+
+def seed_tasks():
+    return [
+        make_task('login', 'Add login endpoint', 'Create a REST endpoint that authenticates users with a password.'),
+        make_task('login-copy', 'Add login endpoint', 'Create a REST endpoint that authenticates the users with a password.'),
+        make_task('report', 'Export monthly report', 'Generate the monthly sales report as a PDF download.'),
+        make_task('css', 'Fix button styles', 'Align the dashboard buttons and update their hover colours.'),
+    ]
+
+@pytest.fixture
+def index(app):
+    return TaskSimilarityIndex(path='', refresh_interval=0)
+
+class TestTaskSimilarityIndex:
+    """Test suite for the MinHash/LSH task similarity index."""
+
+    def test_finds_near_duplicates_only(self, index):
+        """Test that a near copy is found with a high estimate and unrelated tasks are not returned."""
+        TaskManager().add_tasks(seed_tasks())
+
+        similar = index.similar(seed_tasks()[0], exclude='login')
+
+        assert [task_id for task_id, _ in similar] == ['login-copy']
+        assert similar[0][1] > 0.7
+
+    def test_follows_task_manager_writes(self, index):
+        """Test that creates, updates and deletes reach the index, directly or through the change log."""
+        manager = TaskManager()
+        manager.add_tasks(seed_tasks())
+        index.load()
+        query = make_task('query', 'Export monthly report', 'Generate the monthly sales report as a PDF download.')
+        assert [task_id for task_id, _ in index.similar(query)] == ['report']
+
+        manager.update_task(make_task('report', 'Archive old invoices', 'Move invoices older than a year to storage.'))
+        manager.delete_task('login-copy')
+
+        assert index.similar(query) == []
+        assert [task_id for task_id, _ in index.similar(seed_tasks()[1])] == ['login']
+
+    def test_rebuilds_after_a_bulk_load(self, index):
+        """Test that the reset entry of a synthetic data load makes a loaded index pick up the seeded tasks."""
+        from app.infrastructure.db import engine
+        from app.infrastructure.synthetic_data import load_synthetic_data
+        TaskManager().add_tasks(seed_tasks())
+        index.load()
+
+        counts = load_synthetic_data(engine, 5, seed=1)
+        index.refresh()
+
+        assert index.stats()['tasks'] == len(seed_tasks()) + counts['tasks']
+
+    def test_follows_writes_across_bucket_merges(self, index, monkeypatch):
+        """Test that lookups stay exact while rows are added, removed and reused between merges of the buckets."""
+        monkeypatch.setattr('app.infrastructure.task_index.BAND_MERGE_ROWS', 3)
+        manager = TaskManager()
+        manager.add_tasks(seed_tasks())
+        index.load()
+
+        manager.delete_task('login-copy')
+        manager.update_task(make_task('css', 'Add login endpoint', 'Create a REST endpoint that authenticates users with a password.'))
+        manager.add_tasks([make_task('login-again', 'Add login endpoint', 'Create a REST endpoint that authenticates users with a password.')])
+
+        assert [task_id for task_id, _ in index.similar(seed_tasks()[0], exclude='login')] == ['css', 'login-again']
+        assert index.similar(seed_tasks()[3]) == []
+        assert index.stats()['tasks'] == 4
+
+    def test_similar_does_not_wait_for_a_running_refresh(self, index):
+        """Test that while one caller reads the change log, others look up tasks in the current index."""
+        TaskManager().add_tasks(seed_tasks())
+        index.load()
+        reading, release = threading.Event(), threading.Event()
+        ids_since = index.change_log.ids_since
+
+        def slow_ids_since(*args, **kwargs):
+            reading.set()
+            release.wait(5)
+            return ids_since(*args, **kwargs)
+
+        with patch.object(index.change_log, 'ids_since', slow_ids_since):
+            refresher = threading.Thread(target=index.refresh)
+            refresher.start()
+            assert reading.wait(5)
+            answered = []
+            reader = threading.Thread(target=lambda: answered.append(index.similar(seed_tasks()[0], exclude='login')))
+            reader.start()
+            reader.join(2)
+            # Answered while the refresh is still blocked reading the change log
+            assert answered
+            release.set()
+            refresher.join(5)
+
+        assert [task_id for task_id, _ in answered[0]] == ['login-copy']
+        assert not refresher.is_alive()
+
+    def test_persists_and_replays_newer_changes(self, app, tmp_path):
+        """Test that a saved index is reloaded and only changes after it was saved are applied."""
+        path = str(tmp_path / 'index.npz')
+        manager = TaskManager()
+        manager.add_tasks(seed_tasks())
+        TaskSimilarityIndex(path=path).load()
+        manager.delete_tasks(['login-copy'])
+
+        reloaded = TaskSimilarityIndex(path=path)
+        reloaded.load()
+
+        assert reloaded.stats()['tasks'] == 3
+        assert reloaded.similar(seed_tasks()[0], exclude='login') == []
+
+    def test_similar_route(self, client):
+        """Test that /tasks/<id>/similar returns the matching tasks with their similarity."""
+        TaskManager().add_tasks(seed_tasks())
+
+        response = client.get('/tasks/login/similar')
+        missing = client.get('/tasks/unknown/similar')
+
+        assert response.status_code == 200
+        body = json.loads(response.data)
+        assert [match['task']['id'] for match in body] == ['login-copy']
+        assert 0.7 < body[0]['similarity'] <= 1.0
+        assert missing.status_code == 404
+
+    def test_create_with_dedupe_rejects_duplicates(self, client, sample_task_data):
+        """Test that POST /tasks?dedupe=true answers 409 for a near-duplicate and creates anything else."""
+        TaskManager().add_tasks(seed_tasks())
+        duplicate = {**sample_task_data, 'title': 'Add login endpoint',
+                     'description': 'Create a REST endpoint that authenticates users with a password.'}
+
+        rejected = client.post('/tasks?dedupe=true', data=json.dumps(duplicate), content_type='application/json')
+        created = client.post('/tasks?dedupe=true', data=json.dumps(sample_task_data), content_type='application/json')
+        again = client.post('/tasks?dedupe=true', data=json.dumps(sample_task_data), content_type='application/json')
+
+        assert rejected.status_code == 409
+        assert {match['task']['id'] for match in json.loads(rejected.data)['duplicates']} == {'login', 'login-copy'}
+        assert created.status_code == 201
+        # The task created a moment ago is already indexed
+        assert again.status_code == 409
+        assert task_index.stats()['loaded']
\ No newline at end of file
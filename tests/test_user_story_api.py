@@ -1,9 +1,10 @@
 import json
 import pytest
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 from app.domain.user_story import UserStoryPriority, UserStory
 from unittest.mock import Mock
 from app.domain.task import Task, Priority, Status, Category
+from tests.budget import budget
 
 class TestUserStoryAPI:
     """Test suite for User Story API endpoints."""
@@ -15,9 +16,102 @@ class TestUserStoryAPI:
         assert response.status_code == 200
         assert b'user-stories.html' in response.data or b'User Stories' in response.data
 
+    def test_get_user_stories_dashboard_aggregates_and_pagination(self, client, sample_user_story_data, sample_task_data):
+        """Test task aggregates and pagination on the user stories page."""
+        body = '\n'.join(json.dumps(dict(sample_user_story_data, id=f"story-{i}", project=f"Project {i}")) for i in range(3))
+        client.post('/user-stories/import', data=body, content_type='application/x-ndjson')
+        for status in ('pending', 'completed'):
+            client.post('/tasks',
+                        data=json.dumps(dict(sample_task_data, user_story_id="story-0", status=status, effort_hours=3.0)),
+                        content_type='application/json')
+
+        response = client.get('/user-stories?per_page=2')
+        assert response.status_code == 200
+        assert b'Page 1 of 2' in response.data
+        assert response.data.count(b'class="user-story"') == 2
+
+        last_page = client.get('/user-stories?per_page=2&page=2')
+        assert last_page.data.count(b'class="user-story"') == 1
+
+        full = client.get('/user-stories').data.decode()
+        assert 'completed: 1' in full
+        assert 'pending: 1' in full
+        assert '6.0h</span>' in full
+
+    @pytest.mark.budget(queries=60)
+    def test_get_user_stories_dashboard_query_count_is_constant(self, client, sample_user_story_data, sample_task_data):
+        """Test that the dashboard issues the same number of queries for 1 and 10 user stories (no N+1)."""
+        def dashboard_statements():
+            with budget(queries=5) as dashboard:
+                assert client.get('/user-stories').status_code == 200
+            return len(dashboard.statements)
+
+        client.post('/user-stories/import', data=json.dumps(dict(sample_user_story_data, id="story-0")),
+                    content_type='application/x-ndjson')
+        single = dashboard_statements()
+        body = '\n'.join(json.dumps(dict(sample_user_story_data, id=f"story-{i}")) for i in range(1, 10))
+        client.post('/user-stories/import', data=body, content_type='application/x-ndjson')
+        for i in range(10):
+            client.post('/tasks', data=json.dumps(dict(sample_task_data, user_story_id=f"story-{i}")),
+                        content_type='application/json')
+
+        assert dashboard_statements() == single
+
+    @pytest.mark.budget(queries=48)
+    def test_rendered_fragments_are_cached_and_invalidated(self, app, client, sample_user_story_data, sample_task_data):
+        """Test that fragments are reused until a write changes their own row (or a story's task stats)."""
+        client.post('/user-stories/import',
+                    data=json.dumps(dict(sample_user_story_data, id="story-0")),
+                    content_type='application/x-ndjson')
+        task_ids = [json.loads(client.post('/tasks',
+                                           data=json.dumps(dict(sample_task_data, user_story_id="story-0")),
+                                           content_type='application/json').data)['id'] for _ in range(2)]
+        fragments = app.extensions['fragment_cache']
+
+        first = client.get('/user-stories/story-0/tasks')
+        cached_entries = len(fragments)
+        second = client.get('/user-stories/story-0/tasks')
+        assert cached_entries == 2
+        assert len(fragments) == cached_entries
+        assert first.data == second.data
+
+        # Only the updated task renders again
+        client.put(f'/tasks/{task_ids[0]}', data=json.dumps({"title": "Renamed Task"}), content_type='application/json')
+        assert b'Renamed Task' in client.get('/user-stories/story-0/tasks').data
+        assert len(fragments) == cached_entries + 1
+
+        # The story card shows task stats, so a new task renders it again
+        assert b'<strong>Tasks:</strong> 2' in client.get('/user-stories').data
+        client.post('/tasks', data=json.dumps(dict(sample_task_data, user_story_id="story-0")),
+                    content_type='application/json')
+        assert b'<strong>Tasks:</strong> 3' in client.get('/user-stories').data
+
+    def test_reimported_task_does_not_reuse_the_deleted_fragment(self, client, sample_user_story_data, sample_task_data):
+        """Test that a task deleted and imported again under its id (back at version 1) renders its new content."""
+        client.post('/user-stories/import',
+                    data=json.dumps(dict(sample_user_story_data, id="story-0")),
+                    content_type='application/x-ndjson')
+        task = dict(sample_task_data, id="task-0", user_story_id="story-0")
+        client.post('/tasks/import', data=json.dumps(task), content_type='application/x-ndjson')
+        assert b'Original Title' not in client.get('/user-stories/story-0/tasks').data
+
+        client.delete('/tasks/task-0')
+        client.post('/tasks/import', data=json.dumps(dict(task, title="Original Title")),
+                    content_type='application/x-ndjson')
+
+        assert b'Original Title' in client.get('/user-stories/story-0/tasks').data
+
+    def test_get_user_stories_web_interface_not_modified(self, client):
+        """Test that the user stories page answers 304 to a matching If-None-Match."""
+        etag = client.get('/user-stories').headers['ETag']
+
+        response = client.get('/user-stories', headers={'If-None-Match': etag})
+
+        assert response.status_code == 304
+
     def test_get_user_story_tasks_web_interface(self, client):
         """Test getting tasks for a user story via web interface."""
-        with patch('app.api.user_story_routes.ai_service') as mock_ai_service:
+        with patch('app.api.user_story_routes.ai_service', new_callable=AsyncMock) as mock_ai_service:
             # Mock the AI service to return a user story
             mock_user_story = UserStory(
                 id="test-user-story-id",
@@ -96,7 +190,7 @@ class TestUserStoryAPI:
 
     def test_generate_user_story_empty_prompt(self, client):
         """Test user story generation with empty prompt."""
-        with patch('app.api.user_story_routes.ai_service') as mock_ai_service:
+        with patch('app.api.user_story_routes.ai_service', new_callable=AsyncMock) as mock_ai_service:
             # Mock the AI service to return a user story
             mock_user_story = UserStory(
                 id="test-user-story-id",
@@ -158,7 +252,7 @@ class TestUserStoryAPI:
     @patch('app.api.user_story_routes.ai_service.generate_tasks_from_user_story')
     def test_generate_tasks_from_user_story_success(self, mock_generate, client):
         """Test successful task generation from user story."""
-        with patch('app.api.user_story_routes.ai_service') as mock_ai_service:
+        with patch('app.api.user_story_routes.ai_service', new_callable=AsyncMock) as mock_ai_service:
             # Mock the AI service to return a user story and tasks
             mock_user_story = UserStory(
                 id="test-user-story-id",
@@ -218,7 +312,7 @@ class TestUserStoryAPI:
     @patch('app.api.user_story_routes.ai_service.generate_tasks_from_user_story')
     def test_generate_tasks_ai_failure(self, mock_generate, client):
         """Test task generation when AI service fails."""
-        with patch('app.api.user_story_routes.ai_service') as mock_ai_service:
+        with patch('app.api.user_story_routes.ai_service', new_callable=AsyncMock) as mock_ai_service:
             # Mock the AI service to return a user story but fail on task generation
             mock_user_story = UserStory(
                 id="test-user-story-id",
@@ -251,9 +345,10 @@ class TestUserStoryAPI:
             assert isinstance(data, list)
             assert len(data) == 0
 
+    @pytest.mark.budget(queries=1 + 20 * 4)
     def test_user_story_validation_enum_values(self, client):
         """Test that all user story enum values are accepted."""
-        with patch('app.api.user_story_routes.ai_service') as mock_ai_service:
+        with patch('app.api.user_story_routes.ai_service', new_callable=AsyncMock) as mock_ai_service:
             # Mock the AI service to return a consistent user story
             mock_user_story = UserStory(
                 id="test-user-story-id",
@@ -351,4 +446,32 @@ class TestUserStoryAPI:
             
             from app.domain.user_story import UserStory
             with pytest.raises(Exception):
-                UserStory(**invalid_data) 
\ No newline at end of file
+                UserStory(**invalid_data)
+
+    def test_export_and_import_user_stories_ndjson(self, client, sample_user_story_data):
+        """Test importing user stories from NDJSON and exporting them back."""
+        body = '\n'.join(json.dumps(dict(sample_user_story_data, project=f"Project {i}")) for i in range(2))
+        body += '\n' + json.dumps(dict(sample_user_story_data, story_points=20))
+
+        import_response = client.post('/user-stories/import', data=body, content_type='application/x-ndjson')
+
+        assert import_response.status_code == 200
+        data = json.loads(import_response.data)
+        assert data['imported'] == 2
+        assert data['errors'][0]['line'] == 3
+
+        export_response = client.get('/user-stories/export')
+        assert export_response.status_code == 200
+        lines = export_response.data.decode().splitlines()
+        assert {json.loads(line)['project'] for line in lines} == {"Project 0", "Project 1"}
+
+    def test_import_user_stories_reports_errors_in_line_order(self, client, sample_user_story_data):
+        """Test that validation and JSON errors come back sorted by line, with field details."""
+        body = '\n'.join([json.dumps(dict(sample_user_story_data, story_points=20)), '{not json',
+                          json.dumps(sample_user_story_data), '[1, 2]'])
+
+        data = json.loads(client.post('/user-stories/import', data=body, content_type='application/x-ndjson').data)
+
+        assert data['imported'] == 1
+        assert [error['line'] for error in data['errors']] == [1, 2, 4]
+        assert data['errors'][0]['error'][0]['field'] == 'story_points'